@@ -7,4 +7,7 @@ class AuditConfig(AppConfig):
     verbose_name = 'Audit Trail'
 
     def ready(self):
-        import apps.audit.signals  # noqa
\ No newline at end of file
+        from apps.audit.registry import registry
+        from apps.audit.signals import connect_tracked_models
+        registry.populate()
+        connect_tracked_models()
\ No newline at end of file
@@ -0,0 +1,597 @@
+"""
+Tiered storage for Audit app - monthly archives of aged audit log rows.
+
+``manage.py archive_audit_logs`` moves whole months older than the retention
+window out of the ``AuditLog`` table into compressed JSON-lines files under
+``settings.AUDIT_ARCHIVE_DIR``:
+
+    2024/audit-2024-03.jsonl.gz      one row per line, oldest first
+    2024/audit-2024-03.index.json    row count, time span, checksum and
+                                     counts by action, model and user
+    2024/audit-2024-03.keys          sorted lookup file: where each row id
+                                     is, and which object ids the month holds
+
+The table itself then holds only recent months, which is what monthly range
+partitioning would give us. MySQL cannot partition it directly (partitioned
+InnoDB tables do not support foreign keys, and the partition column must be
+part of the UUID primary key).
+
+Rows are ordered by (created_at, id), the order the audit API pages in.
+The writer stamps ``created_at`` in ``seq`` order, so only rows of one flush
+(sharing a created_at) can be out of hash chain order. The data file is a
+series of gzip members of ``BLOCK_ROWS`` rows each. The keys file is sorted
+fixed-width text lines: one per row id with the byte offset of its block,
+and one per object id (hashed) in the month. ``find`` bisects it with a few
+seeks and decompresses a single block; with the index counts it lets
+``ArchiveFilter.months`` skip months that cannot hold a filtered user,
+action, model or object.
+
+``AuditTimeline`` and the helpers below let the audit API read archived months
+alongside the table: rows are streamed and rebuilt as unsaved ``AuditLog``
+instances, so serializers see no difference and no month is held in memory.
+Months are bucketed in the project time zone.
+"""
+
+import base64
+import bisect
+import gzip
+import hashlib
+import heapq
+import io
+import json
+import os
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from functools import partial
+from itertools import groupby, islice
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import payloads
+from .models import AuditLog
+
+# Columns written to the archive (foreign keys by their *_id name). The
+# encoded payload is written decoded, so archives do not depend on AuditField.
+COLUMNS = [field.attname for field in AuditLog._meta.concrete_fields if field.name != 'payload']
+ARCHIVE_FIELDS = COLUMNS + list(payloads.PARTS)
+
+# Rows per gzip member of a data file; ``find`` decompresses one block
+BLOCK_ROWS = 1000
+
+# Keys file lines: kind ('i' row id, 'o' object id), 32 hex digits of key,
+# a space and 12 hex digits of data file offset (0 for objects)
+KEY_LENGTH = 33
+RECORD_LENGTH = KEY_LENGTH + 14
+
+# ArchiveFilter.exact names answered by the month index counts
+INDEX_COUNTS = {'user_id': 'users', 'action': 'actions', 'model_name': 'models'}
+
+
+def archive_dir():
+    return Path(getattr(settings, 'AUDIT_ARCHIVE_DIR', settings.BASE_DIR / 'audit_archive'))
+
+
+def month_paths(month):
+    """(data file, index file) for a (year, month) pair."""
+    year, number = month
+    folder = archive_dir() / f'{year:04d}'
+    stem = f'audit-{year:04d}-{number:02d}'
+    return folder / f'{stem}.jsonl.gz', folder / f'{stem}.index.json'
+
+
+def keys_path(month):
+    """Keys file (row id lookup) for a (year, month) pair."""
+    year, number = month
+    return archive_dir() / f'{year:04d}' / f'audit-{year:04d}-{number:02d}.keys'
+
+
+def month_start(month):
+    year, number = month
+    return timezone.make_aware(datetime(year, number, 1))
+
+
+def next_month(month):
+    year, number = month
+    return (year + 1, 1) if number == 12 else (year, number + 1)
+
+
+def month_of(value):
+    """(year, month) of a datetime or date in the project time zone."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value)
+    return value.year, value.month
+
+
+def archived_months():
+    """Archived (year, month) pairs, oldest first."""
+    months = []
+    for index_path in archive_dir().glob('*/audit-*.index.json'):
+        year, number = index_path.name[len('audit-'):-len('.index.json')].split('-')
+        months.append((int(year), int(number)))
+    return sorted(months)
+
+
+def load_index(month):
+    with open(month_paths(month)[1]) as index_file:
+        return json.load(index_file)
+
+
+def read_rows(month):
+    """Yield the raw rows of an archived month, in file order."""
+    data_path = month_paths(month)[0]
+    if not data_path.exists():
+        return
+    with gzip.open(data_path, 'rt', encoding='utf-8') as data_file:
+        for line in data_file:
+            yield json.loads(line)
+
+
+def sort_key(row):
+    """File order of an archive row (raw or decoded, table or file)."""
+    created_at = row['created_at']
+    if isinstance(created_at, str):
+        created_at = parse_datetime(created_at)
+    return created_at, str(row['id'])
+
+
+def iter_month(month):
+    """Decoded rows of an archived month, oldest first by (created_at, id), streamed."""
+    for row in read_rows(month):
+        row['created_at'] = parse_datetime(row['created_at'])
+        yield row
+
+
+def row_key(pk):
+    return f'i{uuid.UUID(str(pk)).hex}'
+
+
+def object_key(object_id):
+    # Hashed to a fixed width; object ids are free-form strings
+    return f'o{hashlib.blake2b(str(object_id).encode("utf-8"), digest_size=16).hexdigest()}'
+
+
+class MonthKeys:
+    """A month's keys file, read as a sorted sequence of keys for ``bisect``."""
+
+    def __init__(self, month):
+        self.path = keys_path(month)
+        self.file = None
+
+    def exists(self):
+        return self.path.exists()
+
+    def __len__(self):
+        return self.path.stat().st_size // RECORD_LENGTH
+
+    def record(self, position):
+        self.file.seek(position * RECORD_LENGTH)
+        return self.file.read(RECORD_LENGTH).decode('ascii')
+
+    def __getitem__(self, position):
+        return self.record(position)[:KEY_LENGTH]
+
+    def lookup(self, key):
+        """The line of ``key`` as (key, offset), or None."""
+        with open(self.path, 'rb') as self.file:
+            position = bisect.bisect_left(self, key)
+            if position < len(self) and self[position] == key:
+                return int(self.record(position)[KEY_LENGTH + 1:KEY_LENGTH + 13], 16)
+        return None
+
+    def block_offset(self, pk):
+        """Data file offset of the block holding row ``pk``, or None."""
+        return self.lookup(row_key(pk))
+
+    def has_object(self, object_id):
+        return self.lookup(object_key(object_id)) is not None
+
+
+def write_keys(month, records):
+    """Write the keys file of a month from unsorted (key, offset) pairs."""
+    path = keys_path(month)
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'w', encoding='ascii', newline='\n') as keys_file:
+        for key, offset in sorted(records):
+            keys_file.write(f'{key} {offset:012x}\n')
+        keys_file.flush()
+        os.fsync(keys_file.fileno())
+    os.replace(temporary, path)
+
+
+def write_month(month, rows):
+    """
+    Write ``rows`` (dicts of ARCHIVE_FIELDS, in ``sort_key`` order) as the
+    archive for ``month``, merging with an existing archive of that month,
+    and return the index. Files are written to temporary names and renamed
+    into place; the keys file goes last, as it points into the data file.
+    """
+    data_path, index_path = month_paths(month)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = data_path.with_suffix('.tmp')
+
+    count = 0
+    stats = {'actions': Counter(), 'models': Counter(), 'users': Counter()}
+    first = last = None
+    digest = hashlib.sha256()
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    records = []
+    objects = set()
+    block = io.StringIO()
+    block_rows = 0
+    previous = None
+
+    with open(temporary, 'wb') as data_file:
+        def write_block():
+            data_file.write(gzip.compress(block.getvalue().encode('utf-8')))
+            block.seek(0)
+            block.truncate()
+
+        for row in heapq.merge(read_rows(month), rows, key=sort_key):
+            key = sort_key(row)
+            if key == previous:
+                # Left over from a run that stopped before deleting its rows
+                continue
+            previous = key
+            record = {name: row[name] for name in ARCHIVE_FIELDS}
+            if not isinstance(record['created_at'], str):
+                # Full precision; DjangoJSONEncoder would cut microseconds
+                record['created_at'] = record['created_at'].isoformat()
+            line = encoder.encode(record) + '\n'
+            block.write(line)
+            digest.update(line.encode('utf-8'))
+            # The block starts at the current end of the file
+            records.append((row_key(row['id']), data_file.tell()))
+            objects.add(object_key(row['object_id'] or ''))
+            block_rows += 1
+            count += 1
+            if block_rows == BLOCK_ROWS:
+                write_block()
+                block_rows = 0
+            created_at = record['created_at']
+            first = created_at if first is None else min(first, created_at)
+            last = created_at if last is None else max(last, created_at)
+            stats['actions'][row['action']] += 1
+            stats['models'][row['model_name'] or ''] += 1
+            stats['users'][str(row['user_id'] or '')] += 1
+        if block_rows:
+            write_block()
+        data_file.flush()
+        os.fsync(data_file.fileno())
+    os.replace(temporary, data_path)
+    write_keys(month, records + [(key, 0) for key in objects])
+
+    index = {
+        'month': f'{month[0]:04d}-{month[1]:02d}',
+        'rows': count,
+        'first_created_at': first,
+        'last_created_at': last,
+        'sha256': digest.hexdigest(),
+        'archived_at': timezone.now().isoformat(),
+        'actions': dict(stats['actions']),
+        'models': dict(stats['models']),
+        'users': dict(stats['users']),
+    }
+    temporary = index_path.with_suffix('.tmp')
+    with open(temporary, 'w') as index_file:
+        json.dump(index, index_file, indent=1, sort_keys=True)
+    os.replace(temporary, index_path)
+    return index
+
+
+def table_rows(queryset, batch_size):
+    """Rows of ``queryset`` as archive dicts, payloads decoded."""
+    for row in queryset.values(*COLUMNS, 'payload').iterator(chunk_size=batch_size):
+        for name, value in payloads.decode(row.pop('payload')).items():
+            row[name] = payloads.display(name, value)
+        yield row
+
+
+def archive_month(month, batch_size=5000):
+    """Move one month of AuditLog rows into its archive; return rows moved."""
+    rows = AuditLog.objects.filter(
+        created_at__gte=month_start(month), created_at__lt=month_start(next_month(month))
+    )
+    moved = {'rows': 0, 'last': None}
+
+    def pages():
+        # Keyset pages in sort_key order, so no page is held past its rows
+        while True:
+            page = rows.order_by('created_at', 'id')
+            if moved['last'] is not None:
+                created_at, pk = moved['last']
+                page = page.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            batch = list(table_rows(page[:batch_size], batch_size))
+            if not batch:
+                return
+            yield from batch
+            moved['rows'] += len(batch)
+            moved['last'] = batch[-1]['created_at'], batch[-1]['id']
+
+    if not rows.exists():
+        return 0
+    write_month(month, pages())
+    if moved['last'] is None:
+        return 0
+    # Only the rows written above, even if more arrived for this month since
+    created_at, pk = moved['last']
+    written = rows.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=pk))
+    while True:
+        ids = list(written.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return moved['rows']
+        AuditLog.objects.filter(pk__in=ids).delete()
+
+
+def months_to_archive(keep_months, now=None):
+    """Months with rows in the table that are older than the retention window."""
+    cutoff = month_of(now or timezone.now())
+    for _ in range(keep_months):
+        year, number = cutoff
+        cutoff = (year - 1, 12) if number == 1 else (year, number - 1)
+    oldest = AuditLog.objects.filter(created_at__lt=month_start(cutoff)).order_by('created_at').first()
+    if oldest is None:
+        return []
+    months, month = [], month_of(oldest.created_at)
+    while month < cutoff:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def build_logs(rows):
+    """Unsaved AuditLog instances for archived rows, with users attached."""
+    user_ids = {row['user_id'] for row in rows if row['user_id'] is not None}
+    users = get_user_model().objects.in_bulk(user_ids) if user_ids else {}
+    logs = []
+    for row in rows:
+        log = AuditLog(**row)
+        # Deleted users read as NULL, as on_delete=SET_NULL does in the table
+        log.user = users.get(row['user_id'])
+        log._state.adding = False
+        logs.append(log)
+    return logs
+
+
+class ArchiveFilter:
+    """The audit list filters, applied to archived rows in Python."""
+
+    SEARCH_FIELDS = ('user_email', 'object_repr', 'notes')
+
+    def __init__(self, start_date=None, end_date=None, search_terms=(), **exact):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.search_terms = [term.lower() for term in search_terms]
+        self.exact = {name: str(value) for name, value in exact.items() if value not in (None, '')}
+
+    @property
+    def narrows(self):
+        """Whether rows are filtered beyond the date range."""
+        return bool(self.search_terms or self.exact)
+
+    def months(self, months):
+        """The archived months that can hold matching rows."""
+        return [
+            month for month in months
+            if (self.start_date is None or next_month(month) > month_of(self.start_date))
+            and (self.end_date is None or month <= month_of(self.end_date))
+            and self.may_match(month)
+        ]
+
+    def may_match(self, month):
+        """False if the month's index or keys rule out the exact filters."""
+        if not self.exact:
+            return True
+        counts = load_index(month)
+        for name, key in INDEX_COUNTS.items():
+            if name in self.exact and self.exact[name] not in counts.get(key, {}):
+                return False
+        if 'object_id' in self.exact:
+            keys = MonthKeys(month)
+            if keys.exists() and not keys.has_object(self.exact['object_id']):
+                return False
+        return True
+
+    def whole_month(self, month):
+        return (
+            (self.start_date is None or month_of(self.start_date) < month)
+            and (self.end_date is None or month < month_of(self.end_date))
+        )
+
+    def matches(self, row):
+        if self.start_date or self.end_date:
+            day = timezone.localtime(row['created_at']).date()
+            if self.start_date and day < self.start_date:
+                return False
+            if self.end_date and day > self.end_date:
+                return False
+        for name, value in self.exact.items():
+            if str(row[name] if row[name] is not None else '') != value:
+                return False
+        for term in self.search_terms:
+            if not any(term in (row[field] or '').lower() for field in self.SEARCH_FIELDS):
+                return False
+        return True
+
+    def rows(self, month):
+        """Matching rows of an archived month, oldest first, streamed."""
+        return (row for row in iter_month(month) if self.matches(row))
+
+    def count(self, month):
+        if not self.narrows and self.whole_month(month):
+            return load_index(month)['rows']
+        return sum(1 for _ in self.rows(month))
+
+
+class AuditTimeline:
+    """
+    A table queryset followed (or preceded, oldest first) by archived months,
+    sliceable and countable like a queryset so DRF pagination can page
+    through both. Archived months are always older than the table's rows.
+    """
+
+    ordered = True
+
+    def __init__(self, queryset, months, row_filter, descending=True):
+        self.queryset = queryset
+        self.filter = row_filter
+        self.months = sorted(row_filter.months(months), reverse=descending)
+        self.descending = descending
+        self._counts = {}
+        self._db_count = None
+
+    def db_count(self):
+        if self._db_count is None:
+            self._db_count = self.queryset.count()
+        return self._db_count
+
+    def month_count(self, month):
+        if month not in self._counts:
+            self._counts[month] = self.filter.count(month)
+        return self._counts[month]
+
+    def count(self):
+        return self.db_count() + sum(self.month_count(month) for month in self.months)
+
+    def __len__(self):
+        return self.count()
+
+    def segments(self):
+        """(length, fetch(start, stop)) pairs in timeline order, counted lazily."""
+        # None stands for the table
+        order = [None] + self.months if self.descending else self.months + [None]
+        for month in order:
+            if month is None:
+                yield self.db_count(), self.table
+            else:
+                yield self.month_count(month), partial(self.archived, month)
+
+    def table(self, start, stop):
+        return list(self.queryset[start:stop])
+
+    def archived(self, month, start, stop):
+        if not self.descending:
+            return build_logs(list(islice(self.filter.rows(month), start, stop)))
+        # Newest first: the same rows counted from the end of the month
+        length = self.month_count(month)
+        first = 0 if stop is None else max(length - stop, 0)
+        rows = list(islice(self.filter.rows(month), first, length - start))
+        return build_logs(rows[::-1])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        result = []
+        offset = 0
+        for length, fetch in self.segments():
+            if start < offset + length:
+                result.extend(fetch(max(start - offset, 0), None if stop is None else stop - offset))
+            offset += length
+            if stop is not None and offset >= stop:
+                break
+        return result
+
+    def __iter__(self):
+        return iter(self[0:None])
+
+
+def encode_cursor(log):
+    """Opaque token for the position after ``log``."""
+    position = f'{log.created_at.isoformat()}|{log.pk}'
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(token):
+    """(created_at, id) from a cursor token, or None; ValueError if malformed."""
+    if not token:
+        return None
+    try:
+        created_at, pk = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        pk = uuid.UUID(pk)
+    except (ValueError, UnicodeError, TypeError) as exc:
+        raise ValueError('Invalid cursor.') from exc
+    if created_at is None or timezone.is_naive(created_at):
+        raise ValueError('Invalid cursor.')
+    return created_at, pk
+
+
+def keyset_page(queryset, row_filter, cursor=None, size=100):
+    """
+    Up to ``size`` logs newest first, continuing from the table into archived
+    months, and whether more follow. ``cursor`` is the (created_at, id) of
+    the last log already returned.
+    """
+    if cursor is not None:
+        created_at, pk = cursor
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    logs = list(queryset.order_by('-created_at', '-id')[:size + 1])
+
+    for month in reversed(row_filter.months(archived_months())):
+        if len(logs) > size:
+            break
+        if cursor is not None and month > month_of(cursor[0]):
+            continue
+        # The last rows before the cursor, holding no more than the page needs
+        newest = deque(maxlen=size + 1 - len(logs))
+        for row in row_filter.rows(month):
+            if cursor is not None and (row['created_at'], uuid.UUID(str(row['id']))) >= cursor:
+                break
+            newest.append(row)
+        logs += build_logs(list(reversed(newest)))
+    return logs[:size], len(logs) > size
+
+
+def find(pk):
+    """An archived AuditLog by primary key, or None."""
+    try:
+        pk = uuid.UUID(str(pk))
+    except ValueError:
+        return None
+    for month in reversed(archived_months()):
+        keys = MonthKeys(month)
+        if not keys.exists():
+            # Archived before keys files existed: scan the month
+            for row in read_rows(month):
+                if row['id'] == str(pk):
+                    row['created_at'] = parse_datetime(row['created_at'])
+                    return build_logs([row])[0]
+            continue
+        offset = keys.block_offset(pk)
+        if offset is None:
+            continue
+        with open(month_paths(month)[0], 'rb') as data_file:
+            data_file.seek(offset)
+            lines = io.TextIOWrapper(gzip.GzipFile(fileobj=data_file), encoding='utf-8')
+            for line in islice(lines, BLOCK_ROWS):
+                row = json.loads(line)
+                if row['id'] == str(pk):
+                    row['created_at'] = parse_datetime(row['created_at'])
+                    return build_logs([row])[0]
+    return None
+
+
+def statistics(since):
+    """Counts by action, model and user id for archived rows at or after ``since``."""
+    totals = {'actions': Counter(), 'models': Counter(), 'users': Counter()}
+    for month in archived_months():
+        if month_start(next_month(month)) <= since:
+            continue
+        if month_start(month) >= since:
+            index = load_index(month)
+            for key in totals:
+                totals[key].update(index[key])
+            continue
+        for row in iter_month(month):
+            if row['created_at'] >= since:
+                totals['actions'][row['action']] += 1
+                totals['models'][row['model_name'] or ''] += 1
+                totals['users'][str(row['user_id'] or '')] += 1
+    return totals
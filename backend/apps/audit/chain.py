@@ -0,0 +1,231 @@
+"""
+Tamper-evident hash chain for Audit app.
+
+Every audit log written through ``apps.audit.writer`` gets the next ``seq``
+and a ``row_hash``:
+
+    row_hash = sha256(previous row_hash + "\\n" + canonical(row))
+
+``canonical`` is a JSON list of the row's columns, with the payload in its
+decoded form. The same row therefore hashes the same whether it is read from
+the table or from an archive file. Changing a row breaks its own hash, and
+changing or deleting a row breaks the link to the next one. The chain head
+(``AuditChainHead``) holds the last link, so rows cut off the end are noticed
+too.
+
+``verify`` checks the whole chain in bounded memory. It cuts the chain into
+segments: each archived month, and runs of ``segment_size`` seqs in the
+table. Worker processes check the segments in parallel, streaming rows in
+batches. Each segment links its own rows and reports its first row. The
+coordinator then checks the joins between segments in seq order and reports
+the first break.
+
+Rows written before the chain existed have no seq; they are counted as
+unchained. An unchained row created after the chain's first row did not come
+through the writer, so it is reported as a break.
+"""
+
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timezone as dt_timezone
+from itertools import groupby
+
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.dateparse import parse_datetime
+
+from . import archive
+from .models import AuditChainHead, AuditLog
+
+# Columns in the canonical form, in order (payload parts as decoded)
+CANONICAL_FIELDS = [name for name in archive.ARCHIVE_FIELDS if name != 'row_hash']
+
+IP_FIELD = AuditLog._meta.get_field('ip_address')
+
+
+def canonical(row):
+    """Canonical bytes of a row dict (archive form: ARCHIVE_FIELDS)."""
+    values = []
+    for name in CANONICAL_FIELDS:
+        value = row[name]
+        if name == 'created_at':
+            if isinstance(value, str):
+                value = parse_datetime(value)
+            value = value.astimezone(dt_timezone.utc).isoformat()
+        elif name == 'ip_address':
+            value = IP_FIELD.get_prep_value(value)
+        elif name in ('id', 'user_id', 'content_type_id') and value is not None:
+            value = str(value)
+        values.append(value)
+    return json.dumps(values, separators=(',', ':'), ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+
+def chain_hash(previous_hash, canonical_bytes):
+    digest = hashlib.sha256(previous_hash.encode('ascii'))
+    digest.update(b'\n')
+    digest.update(canonical_bytes)
+    return digest.hexdigest()
+
+
+def link(previous_hash, row):
+    """The row_hash of ``row`` following ``previous_hash``."""
+    return chain_hash(previous_hash, canonical(row))
+
+
+def row_of(log):
+    """Archive-form dict of an AuditLog instance."""
+    row = {name: getattr(log, name) for name in archive.COLUMNS}
+    for name in archive.payloads.PARTS:
+        row[name] = getattr(log, name)
+    return row
+
+
+# -- verification ----------------------------------------------------------
+
+def table_segments(segment_size):
+    bounds = AuditLog.objects.aggregate(low=Min('seq'), high=Max('seq'))
+    if bounds['low'] is None:
+        return []
+    return [
+        ('table', (start, min(start + segment_size - 1, bounds['high'])))
+        for start in range(bounds['low'], bounds['high'] + 1, segment_size)
+    ]
+
+
+def segment_rows(kind, spec, batch_size):
+    """Yield a segment's rows in seq order; unchained rows have seq None."""
+    if kind == 'archive':
+        # Archive files are in (created_at, id) order and the writer keeps
+        # created_at in step with seq, so only rows of one flush need sorting
+        for _created_at, group in groupby(archive.read_rows(tuple(spec)), key=lambda row: row['created_at']):
+            yield from sorted(group, key=lambda row: -1 if row['seq'] is None else row['seq'])
+        return
+    low, high = spec
+    last = low - 1
+    while True:
+        queryset = AuditLog.objects.filter(seq__gt=last, seq__lte=high).order_by('seq')[:batch_size]
+        rows = list(archive.table_rows(queryset, batch_size))
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1]['seq']
+
+
+def created_of(row):
+    value = row['created_at']
+    return parse_datetime(value) if isinstance(value, str) else value
+
+
+def unchained_break(results):
+    """(None, id, reason) for an unchained row created after the chain began, or None."""
+    starts = [result for result in results if result['first_seq'] is not None]
+    if not starts:
+        return None
+    began = min(starts, key=lambda result: result['first_seq'])['first_created_at']
+    reason = 'row has no seq but was created after the chain began'
+    for result in results:
+        latest = result['latest_unchained']
+        if latest is not None and latest[0] >= began:
+            return None, latest[1], reason
+    pk = AuditLog.objects.filter(seq__isnull=True, created_at__gte=began).values_list('id', flat=True).first()
+    return (None, str(pk), reason) if pk is not None else None
+
+
+def verify_segment(kind, spec, batch_size):
+    """
+    Check the links inside one segment. The first row's link needs the
+    previous segment, so its canonical form is returned for the coordinator.
+    """
+    result = {
+        'segment': f'{kind} {spec}', 'rows': 0, 'unchained': 0,
+        'first_seq': None, 'first_id': None, 'first_canonical': None, 'first_hash': None,
+        'first_created_at': None, 'last_seq': None, 'last_hash': None, 'break': None,
+        'latest_unchained': None,
+    }
+    previous = None
+    for row in segment_rows(kind, spec, batch_size):
+        if row['seq'] is None:
+            result['unchained'] += 1
+            created_at = created_of(row)
+            if result['latest_unchained'] is None or created_at > result['latest_unchained'][0]:
+                result['latest_unchained'] = (created_at, str(row['id']))
+            continue
+        result['rows'] += 1
+        if previous is None:
+            result['first_seq'] = row['seq']
+            result['first_id'] = str(row['id'])
+            result['first_canonical'] = canonical(row).decode('utf-8')
+            result['first_hash'] = row['row_hash']
+            result['first_created_at'] = created_of(row)
+        elif result['break'] is None:
+            if row['seq'] != previous['seq'] + 1:
+                result['break'] = (previous['seq'] + 1, None, f"rows {previous['seq'] + 1}..{row['seq'] - 1} are missing")
+            elif link(previous['row_hash'], row) != row['row_hash']:
+                result['break'] = (row['seq'], str(row['id']), 'row does not match its hash')
+        previous = row
+    if previous is not None:
+        result['last_seq'] = previous['seq']
+        result['last_hash'] = previous['row_hash']
+    return result
+
+
+def _verify_segment(args):
+    # Worker process entry point; connections are reopened on first use
+    return verify_segment(*args)
+
+
+def verify(workers=1, batch_size=5000, segment_size=1_000_000, include_archive=True):
+    """
+    Verify the chain; return {'rows', 'unchained', 'segments', 'head', 'break'}
+    where ``break`` is (seq, id, reason) of the first problem or None. An
+    unchained row added after the chain began is reported first, with seq None.
+    """
+    tasks = table_segments(segment_size)
+    if include_archive:
+        tasks = [('archive', list(month)) for month in archive.archived_months()] + tasks
+    tasks = [(kind, spec, batch_size) for kind, spec in tasks]
+
+    if workers > 1 and len(tasks) > 1:
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(_verify_segment, tasks))
+    else:
+        results = [verify_segment(*task) for task in tasks]
+
+    head = AuditChainHead.objects.filter(pk=1).first()
+    report = {
+        'rows': sum(result['rows'] for result in results),
+        'unchained': (
+            sum(result['unchained'] for result in results)
+            + AuditLog.objects.filter(seq__isnull=True).count()
+        ),
+        'segments': len(results),
+        'head': (head.last_seq, head.last_hash) if head else (0, ''),
+        'break': None,
+    }
+
+    breaks = []
+    previous_seq, previous_hash = 0, ''
+    for result in sorted((r for r in results if r['first_seq'] is not None), key=lambda r: r['first_seq']):
+        if result['first_seq'] != previous_seq + 1:
+            breaks.append((previous_seq + 1, None, f"rows {previous_seq + 1}..{result['first_seq'] - 1} are missing"))
+        else:
+            if chain_hash(previous_hash, result['first_canonical'].encode('utf-8')) != result['first_hash']:
+                breaks.append((result['first_seq'], result['first_id'], 'row does not match its hash'))
+        if result['break'] is not None:
+            breaks.append(result['break'])
+        previous_seq, previous_hash = result['last_seq'], result['last_hash']
+
+    head_seq, head_hash = report['head']
+    if (previous_seq, previous_hash) != (head_seq, head_hash):
+        breaks.append((min(previous_seq, head_seq) + 1, None, f'chain ends at {previous_seq}, head is at {head_seq}'))
+    late = unchained_break(results)
+    if late is not None:
+        breaks.append(late)
+    if breaks:
+        report['break'] = min(breaks, key=lambda item: item[0] or 0)
+    return report
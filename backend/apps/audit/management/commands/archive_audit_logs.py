@@ -0,0 +1,52 @@
+"""
+Move aged audit log rows into monthly archive files (apps.audit.archive).
+
+Whole months older than the retention window are written to compressed
+JSON-lines files with an index, then deleted from the table. The audit API
+keeps serving them from the archive. Run it monthly from cron; re-running a
+month merges into its existing archive.
+
+Examples:
+    python manage.py archive_audit_logs
+    python manage.py archive_audit_logs --keep-months 12 --dry-run
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.audit import archive
+from apps.audit.models import AuditLog
+
+
+class Command(BaseCommand):
+    help = 'Archive audit logs older than the retention window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months', type=int, default=None,
+            help='Months to keep in the table besides the current one (default AUDIT_RETENTION_MONTHS)'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per read and delete batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        keep_months = options['keep_months']
+        if keep_months is None:
+            keep_months = getattr(settings, 'AUDIT_RETENTION_MONTHS', 6)
+
+        total = 0
+        for month in archive.months_to_archive(keep_months):
+            label = f'{month[0]:04d}-{month[1]:02d}'
+            if options['dry_run']:
+                rows = AuditLog.objects.filter(
+                    created_at__gte=archive.month_start(month),
+                    created_at__lt=archive.month_start(archive.next_month(month)),
+                ).count()
+                self.stdout.write(f'{label}: {rows} rows would be archived')
+            else:
+                rows = archive.archive_month(month, options['batch_size'])
+                self.stdout.write(f'{label}: archived {rows} rows to {archive.month_paths(month)[0]}')
+            total += rows
+
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {total} audit log rows.'))
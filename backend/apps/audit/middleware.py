@@ -2,35 +2,30 @@
 Middleware for Audit app - Track request context.
 """
 
-import threading
+from apps.core.context import RequestContext, bind, get_context
 
-_thread_locals = threading.local()
+from . import writer
 
 
 def get_current_user():
-    """Get the current user from thread local storage."""
-    return getattr(_thread_locals, 'user', None)
+    """Get the current authenticated user from the request context."""
+    context = get_context()
+    return context.user if context is not None else None
 
 
 def get_current_request():
-    """Get the current request from thread local storage."""
-    return getattr(_thread_locals, 'request', None)
+    """Get the current request from the request context."""
+    context = get_context()
+    return context.request if context is not None else None
 
 
 class AuditMiddleware:
-    """Middleware to store request context for audit logging."""
+    """Middleware to bind the request context and audit batch for a request."""
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        _thread_locals.request = request
-        _thread_locals.user = request.user if hasattr(request, 'user') and request.user.is_authenticated else None
-        
-        response = self.get_response(request)
-        
-        # Clean up
-        _thread_locals.request = None
-        _thread_locals.user = None
-        
-        return response
\ No newline at end of file
+        # Audit entries of the request are written together once it is done
+        with bind(RequestContext.from_request(request)), writer.batch():
+            return self.get_response(request)
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:02
+
+import apps.audit.payloads
+from django.db import migrations, models
+
+from apps.audit import payloads
+
+BATCH_SIZE = 2000
+
+
+def rows_in_batches(queryset, fields):
+    batch = []
+    for row in queryset.only('id', *fields).iterator(chunk_size=BATCH_SIZE):
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def pack_payloads(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    AuditField = apps.get_model('audit', 'AuditField')
+    ids = payloads.FieldIds(AuditField.objects.using(alias))
+    parts = ['old_values', 'new_values', 'changes']
+    for batch in rows_in_batches(AuditLog.objects.using(alias), parts):
+        for row in batch:
+            row.payload = payloads.encode(**{name: getattr(row, name) for name in parts}, ids=ids)
+        AuditLog.objects.using(alias).bulk_update(batch, ['payload'])
+
+
+def unpack_payloads(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    AuditLog = apps.get_model('audit', 'AuditLog')
+    AuditField = apps.get_model('audit', 'AuditField')
+    ids = payloads.FieldIds(AuditField.objects.using(alias))
+    parts = ['old_values', 'new_values', 'changes']
+    for batch in rows_in_batches(AuditLog.objects.using(alias).exclude(payload=None), ['payload']):
+        for row in batch:
+            for name, value in payloads.decode(row.payload, ids=ids).items():
+                setattr(row, name, payloads.display(name, value))
+        AuditLog.objects.using(alias).bulk_update(batch, parts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditField',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Audit Field',
+                'verbose_name_plural': 'Audit Fields',
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='payload',
+            field=apps.audit.payloads.PayloadField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_payloads, unpack_payloads),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='changes',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='new_values',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='old_values',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_compact_payload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['content_type', 'object_id', 'created_at'], name='audit_audit_content_a80faa_idx'),
+        ),
+    ]
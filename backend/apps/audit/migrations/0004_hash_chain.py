@@ -0,0 +1,48 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:09
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def create_chain_head(apps, schema_editor):
+    AuditChainHead = apps.get_model('audit', 'AuditChainHead')
+    AuditChainHead.objects.using(schema_editor.connection.alias).get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_object_trail_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_seq', models.BigIntegerField(default=0)),
+                ('last_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Audit Chain Head',
+                'verbose_name_plural': 'Audit Chain Head',
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='seq',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(create_chain_head, migrations.RunPython.noop),
+    ]
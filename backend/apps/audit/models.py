@@ -5,9 +5,11 @@ Models for Audit app - Activity tracking and audit trail.
 import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from .payloads import PayloadField, payload_property
 
 
 class AuditLog(models.Model):
@@ -54,18 +56,20 @@ class AuditLog(models.Model):
     model_name = models.CharField(max_length=100, blank=True, null=True)
     object_repr = models.CharField(max_length=255, blank=True, null=True)
     
-    # Changes
-    old_values = models.JSONField(blank=True, null=True)
-    new_values = models.JSONField(blank=True, null=True)
-    changes = models.JSONField(blank=True, null=True)
+    # Changes: old_values, new_values and changes, encoded (see payloads.py)
+    payload = PayloadField(blank=True, null=True)
     
     # Additional info
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     
-    # Timestamp
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Timestamp (set by the writer when it flushes, so it is covered by the hash)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    # Hash chain (see chain.py): position and SHA-256 over the previous hash and this row
+    seq = models.BigIntegerField(unique=True, blank=True, null=True, editable=False)
+    row_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
 
     class Meta:
         verbose_name = _('Audit Log')
@@ -75,17 +79,50 @@ class AuditLog(models.Model):
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['model_name', 'created_at']),
             models.Index(fields=['action', 'created_at']),
+            models.Index(fields=['content_type', 'object_id', 'created_at']),
         ]
 
+    old_values = payload_property('old_values')
+    new_values = payload_property('new_values')
+    changes = payload_property('changes')
+
     def __str__(self):
         return f"{self.user_email or 'System'} - {self.action} - {self.model_name} - {self.created_at}"
 
     def save(self, *args, **kwargs):
-        if self.user and not self.user_email:
+        if self.user_id and not self.user_email:
             self.user_email = self.user.email
         super().save(*args, **kwargs)
 
 
+class AuditField(models.Model):
+    """Id of a field name in encoded audit payloads."""
+
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name = _('Audit Field')
+        verbose_name_plural = _('Audit Fields')
+
+    def __str__(self):
+        return self.name
+
+
+class AuditChainHead(models.Model):
+    """The last link of the audit hash chain; locked by each writer flush."""
+
+    last_seq = models.BigIntegerField(default=0)
+    last_hash = models.CharField(max_length=64, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Audit Chain Head')
+        verbose_name_plural = _('Audit Chain Head')
+
+    def __str__(self):
+        return f"#{self.last_seq} {self.last_hash[:12]}"
+
+
 class UserActivity(models.Model):
     """Track user activity and sessions."""
 
@@ -0,0 +1,230 @@
+"""
+Compact storage for Audit app change payloads.
+
+``AuditLog.old_values``, ``new_values`` and ``changes`` are stored together
+in one binary ``payload`` column instead of three JSON columns:
+
+    {"c": [[3, "draft", "approved"], [17, 12.5, 14]],     changes
+     "o": [3, "draft"], "n": [3, "approved"]}             old/new values
+
+Field names are replaced by ids from the ``AuditField`` table, which are
+allocated on first use and cached per process. Values keep their type:
+JSON scalars are stored as they are, and decimals, dates, times and UUIDs
+are stored as short tagged lists. Payloads longer than
+``AUDIT_PAYLOAD_COMPRESS_BYTES`` are zlib-compressed; the first byte says
+which form follows.
+
+Decoding gives back what the JSON columns held. ``changes`` values read as
+strings, as ``get_model_changes`` used to store them. Old and new values read
+as JSON, with tagged values in their DjangoJSONEncoder form.
+"""
+
+import datetime
+import decimal
+import json
+import threading
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+
+RAW = b'J'
+COMPRESSED = b'Z'
+
+# Keys of the three payload parts in the stored document
+PARTS = {'old_values': 'o', 'new_values': 'n', 'changes': 'c'}
+
+TAGS = {
+    decimal.Decimal: 'd',
+    datetime.datetime: 'T',
+    datetime.date: 'D',
+    datetime.time: 't',
+    uuid.UUID: 'u',
+}
+PARSERS = {
+    'd': decimal.Decimal,
+    'T': datetime.datetime.fromisoformat,
+    'D': datetime.date.fromisoformat,
+    't': datetime.time.fromisoformat,
+    'u': uuid.UUID,
+    'j': lambda value: value,
+}
+
+
+class FieldIds:
+    """Two-way name <-> id mapping backed by the AuditField table."""
+
+    def __init__(self, manager=None):
+        self._manager = manager
+        self.ids = {}
+        self.names = {}
+        self.lock = threading.Lock()
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            from .models import AuditField
+            # The primary always has every id, a replica may lag behind
+            return AuditField.objects.using('default')
+        return self._manager
+
+    def remember(self, pairs):
+        with self.lock:
+            for field_id, name in pairs:
+                self.ids[name] = field_id
+                self.names[field_id] = name
+
+    def id_for(self, name):
+        if name not in self.ids:
+            row = self.manager.filter(name=name).values_list('id', 'name').first()
+            if row is None:
+                try:
+                    with transaction.atomic(using=self.manager.db):
+                        row = (self.manager.create(name=name).pk, name)
+                except IntegrityError:
+                    # Allocated by a concurrent writer
+                    row = self.manager.filter(name=name).values_list('id', 'name').get()
+            self.remember([row])
+        return self.ids[name]
+
+    def name_for(self, field_id):
+        if field_id not in self.names:
+            self.remember(self.manager.values_list('id', 'name'))
+        return self.names.get(field_id, f'#{field_id}')
+
+
+field_ids = FieldIds()
+
+
+def pack_value(value):
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        return ['j', value]
+    for kind, tag in TAGS.items():
+        if isinstance(value, kind):
+            return [tag, value.isoformat() if hasattr(value, 'isoformat') else str(value)]
+    return str(value)
+
+
+def unpack_value(value):
+    if isinstance(value, list):
+        return PARSERS[value[0]](value[1])
+    return value
+
+
+def encode(old_values=None, new_values=None, changes=None, ids=None):
+    """Pack the three payload parts into bytes, or None when all are empty."""
+    ids = ids or field_ids
+    document = {}
+    for name, values in (('old_values', old_values), ('new_values', new_values)):
+        if values is not None:
+            flat = []
+            for field, value in values.items():
+                flat += [ids.id_for(field), pack_value(value)]
+            document[PARTS[name]] = flat
+    if changes is not None:
+        document['c'] = [
+            [ids.id_for(field), pack_value(change.get('old')), pack_value(change.get('new'))]
+            for field, change in changes.items()
+        ]
+    if not document:
+        return None
+
+    data = json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if len(data) > getattr(settings, 'AUDIT_PAYLOAD_COMPRESS_BYTES', 512):
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return COMPRESSED + compressed
+    return RAW + data
+
+
+def read(data):
+    """The stored document of a payload, with field ids and tagged values."""
+    data = bytes(data)
+    body = zlib.decompress(data[1:]) if data[:1] == COMPRESSED else data[1:]
+    return json.loads(body)
+
+
+def as_text(value):
+    return str(value) if value is not None else None
+
+
+def as_json(value):
+    if isinstance(value, (str, bool, int, float, dict, list)) or value is None:
+        return value
+    return DjangoJSONEncoder().default(value)
+
+
+def display(name, value):
+    """A part in the form the API returns; see the module docstring."""
+    if value is None:
+        return None
+    if name == 'changes':
+        return {
+            field: {'old': as_text(change.get('old')), 'new': as_text(change.get('new'))}
+            for field, change in value.items()
+        }
+    return {field: as_json(item) for field, item in value.items()}
+
+
+def decode(data, ids=None):
+    """{'old_values': ..., 'new_values': ..., 'changes': ...} with typed values."""
+    ids = ids or field_ids
+    parts = dict.fromkeys(PARTS)
+    if not data:
+        return parts
+    document = read(data)
+    for name in ('old_values', 'new_values'):
+        flat = document.get(PARTS[name])
+        if flat is not None:
+            parts[name] = {
+                ids.name_for(flat[index]): unpack_value(flat[index + 1])
+                for index in range(0, len(flat), 2)
+            }
+    if 'c' in document:
+        parts['changes'] = {
+            ids.name_for(field_id): {'old': unpack_value(old), 'new': unpack_value(new)}
+            for field_id, old, new in document['c']
+        }
+    return parts
+
+
+class PayloadField(models.BinaryField):
+    """
+    Binary column holding an AuditLog's encoded payload. Parts assigned
+    through the model properties are encoded when the row is written, by
+    ``save()`` and ``bulk_create()`` alike.
+    """
+
+    def pre_save(self, model_instance, add):
+        pending = getattr(model_instance, '_pending_payload', None)
+        if pending is not None:
+            parts = decode(getattr(model_instance, self.attname))
+            parts.update(pending)
+            setattr(model_instance, self.attname, encode(**parts))
+            model_instance._pending_payload = None
+            model_instance._decoded_payload = None
+        return super().pre_save(model_instance, add)
+
+
+def payload_property(name):
+    """Model property reading and writing one part of the payload."""
+
+    def getter(self):
+        pending = getattr(self, '_pending_payload', None)
+        if pending is not None and name in pending:
+            return display(name, pending[name])
+        cached = getattr(self, '_decoded_payload', None)
+        if cached is None or cached[0] is not self.payload:
+            cached = self._decoded_payload = (self.payload, decode(self.payload))
+        return display(name, cached[1][name])
+
+    def setter(self, value):
+        if getattr(self, '_pending_payload', None) is None:
+            self._pending_payload = {}
+        self._pending_payload[name] = value
+
+    return property(getter, setter)
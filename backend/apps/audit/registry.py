@@ -0,0 +1,107 @@
+"""
+Audit registry for Audit app - which models are tracked and how they read.
+
+Built once when the app registry is ready, so writing an audit log needs no
+per-call lookups:
+
+    tracked = registry.get(instance)
+    if tracked is not None:
+        tracked.content_type_id, tracked.object_repr(instance)
+
+``object_repr`` follows the model's ``__str__`` but only uses what is already
+loaded. A related object that is not cached on the instance is written as
+"<Model> <id>" instead of being fetched (``OrderMaterial.__str__`` would load
+the order to print its quote number).
+"""
+
+import string
+
+from django.apps import apps as django_apps
+from django.contrib.contenttypes.models import ContentType
+from django.utils.text import capfirst
+
+# Tracked models and their object_repr templates: {field} or {relation.field}
+TRACKED_MODELS = {
+    'crm.Order': '{quote_number} - {project_name}',
+    'crm.Customer': '{company_name} ({name})',
+    'engineering.Drawing': '{drawing_number} v{version} - {title}',
+    'materials.OrderMaterial': '{order.quote_number} - {material.name}',
+    'production.ProductionRecord': '{order.quote_number} - {production_date} ({shift})',
+    'fabrication.OrderFabrication': '{order.quote_number} - {process.name}',
+    'surface_treatment.OrderSurfaceTreatment': '{order.quote_number} - {treatment_type.name}',
+    'inspection.OrderInspection': '{order.quote_number} - {inspection_type.name}',
+    'logistics.OrderDispatch': 'Dispatch: {order.quote_number}',
+}
+
+
+class TrackedModel:
+    """A tracked model with its compiled object_repr template."""
+
+    def __init__(self, registry, model, template):
+        self.registry = registry
+        self.model = model
+        self.label = model._meta.label_lower
+        self.parts = []
+        for literal, path, _spec, _conversion in string.Formatter().parse(template):
+            if path is None:
+                self.parts.append((literal, None, None))
+                continue
+            name, _, attribute = path.partition('.')
+            field = model._meta.get_field(name) if attribute else None
+            self.parts.append((literal, field, attribute or name))
+
+    @property
+    def content_type_id(self):
+        return self.registry.content_type_ids()[self.label]
+
+    def object_repr(self, instance):
+        pieces = []
+        for literal, field, attribute in self.parts:
+            pieces.append(literal)
+            if attribute is None:
+                continue
+            if field is None:
+                pieces.append(str(getattr(instance, attribute)))
+            elif field.is_cached(instance):
+                related = field.get_cached_value(instance)
+                pieces.append(str(getattr(related, attribute)) if related is not None else 'None')
+            else:
+                related_id = getattr(instance, field.attname)
+                pieces.append(f'{capfirst(field.related_model._meta.verbose_name)} {related_id}')
+        return ''.join(pieces)[:255]
+
+
+class AuditRegistry:
+    """Tracked models by lowercase label, filled in AuditConfig.ready()."""
+
+    def __init__(self):
+        self.labels = frozenset()
+        self.models = {}
+        self._content_type_ids = None
+
+    def populate(self, tracked=None):
+        tracked = TRACKED_MODELS if tracked is None else tracked
+        self.models = {}
+        for label, template in tracked.items():
+            model = django_apps.get_model(label)
+            self.models[model._meta.label_lower] = TrackedModel(self, model, template)
+        self.labels = frozenset(self.models)
+        self._content_type_ids = None
+
+    def get(self, instance_or_model):
+        """The TrackedModel for a model or instance, or None if not tracked."""
+        return self.models.get(instance_or_model._meta.label_lower)
+
+    def content_type_ids(self):
+        # Resolved on first use: the table may not exist yet when apps load
+        if self._content_type_ids is None:
+            content_types = ContentType.objects.get_for_models(
+                *(tracked.model for tracked in self.models.values())
+            )
+            self._content_type_ids = {
+                model._meta.label_lower: content_type.pk for model, content_type in content_types.items()
+            }
+        return self._content_type_ids
+
+
+registry = AuditRegistry()
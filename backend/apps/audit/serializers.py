@@ -4,21 +4,34 @@ Serializers for Audit app.
 
 from rest_framework import serializers
 from .models import AuditLog, UserActivity
+from apps.core.serializers import SparseFieldsMixin
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for AuditLog model."""
 
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     action_display = serializers.CharField(source='get_action_display', read_only=True)
+    old_values = serializers.JSONField(read_only=True)
+    new_values = serializers.JSONField(read_only=True)
+    changes = serializers.JSONField(read_only=True)
 
     class Meta:
         model = AuditLog
-        fields = '__all__'
+        fields = [
+            'id', 'user_name', 'action_display', 'user_email', 'action', 'object_id', 'model_name',
+            'object_repr', 'old_values', 'new_values', 'changes', 'ip_address', 'user_agent', 'notes',
+            'created_at', 'user', 'content_type',
+        ]
         read_only_fields = ['id', 'created_at']
+        field_dependencies = {
+            'old_values': ['payload'],
+            'new_values': ['payload'],
+            'changes': ['payload'],
+        }
 
 
-class UserActivitySerializer(serializers.ModelSerializer):
+class UserActivitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for UserActivity model."""
 
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
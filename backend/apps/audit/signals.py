@@ -3,74 +3,86 @@ Signals for Audit app - Auto-track model changes.
 """
 
 from django.db.models.signals import post_save, post_delete, pre_save
-from django.dispatch import receiver
-from django.contrib.contenttypes.models import ContentType
+from apps.core import snapshots
+from apps.core.context import get_context
 from .models import AuditLog
-
-# Models to track
-TRACKED_MODELS = [
-    'crm.Order',
-    'crm.Customer',
-    'engineering.Drawing',
-    'materials.OrderMaterial',
-    'production.ProductionRecord',
-    'fabrication.OrderFabrication',
-    'surface_treatment.OrderSurfaceTreatment',
-    'inspection.OrderInspection',
-    'logistics.OrderDispatch',
-]
+from . import writer
+from .registry import registry
 
 
 def get_model_changes(instance, old_instance):
-    """Get changes between old and new instance."""
+    """Get changed fields between old and new instance, with typed values."""
     changes = {}
-    for field in instance._meta.fields:
+    for field in instance._meta.concrete_fields:
         field_name = field.name
         if field_name in ['created_at', 'updated_at', 'id']:
             continue
         
-        old_value = getattr(old_instance, field_name, None) if old_instance else None
-        new_value = getattr(instance, field_name, None)
-        
-        # Handle foreign keys
-        if hasattr(old_value, 'pk'):
-            old_value = str(old_value.pk)
-        if hasattr(new_value, 'pk'):
-            new_value = str(new_value.pk)
+        # Foreign keys by their id, without loading the related rows
+        old_value = getattr(old_instance, field.attname, None) if old_instance else None
+        new_value = getattr(instance, field.attname, None)
         
         if old_value != new_value:
-            changes[field_name] = {
-                'old': str(old_value) if old_value is not None else None,
-                'new': str(new_value) if new_value is not None else None
-            }
+            changes[field_name] = {'old': old_value, 'new': new_value}
     
     return changes
 
 
 def create_audit_log(instance, action, old_instance=None, user=None):
-    """Create an audit log entry."""
-    model_label = f"{instance._meta.app_label}.{instance._meta.model_name}"
-    
-    if model_label.lower() not in [m.lower() for m in TRACKED_MODELS]:
+    """
+    Create an audit log entry. The user, IP address and user agent come
+    from the request context unless ``user`` is given.
+    """
+    tracked = registry.get(instance)
+    if tracked is None:
         return
     
-    content_type = ContentType.objects.get_for_model(instance)
-    
     changes = None
-    old_values = None
-    new_values = None
     
     if action == AuditLog.Action.UPDATE and old_instance:
         changes = get_model_changes(instance, old_instance)
         if not changes:  # No actual changes
             return
     
-    AuditLog.objects.create(
-        user=user,
+    context = get_context()
+    writer.record(AuditLog(
+        user_id=user.pk if user is not None else getattr(context, 'user_id', None),
+        user_email=user.email if user is not None else getattr(context, 'user_email', None),
         action=action,
-        content_type=content_type,
+        content_type_id=tracked.content_type_id,
         object_id=str(instance.pk),
         model_name=instance._meta.model_name,
-        object_repr=str(instance)[:255],
+        object_repr=tracked.object_repr(instance),
         changes=changes,
-    )
\ No newline at end of file
+        ip_address=getattr(context, 'ip_address', None),
+        user_agent=getattr(context, 'user_agent', None),
+    ))
+
+
+def remember_old_instance(sender, instance, raw=False, using=None, **kwargs):
+    """Keep the stored row of an updated object, to diff against after the save."""
+    instance._audit_old_instance = None if raw else snapshots.stored_instance(instance, using)
+
+
+def audit_saved_object(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        create_audit_log(instance, AuditLog.Action.CREATE)
+        return
+    old_instance = getattr(instance, '_audit_old_instance', None)
+    if old_instance is not None:
+        create_audit_log(instance, AuditLog.Action.UPDATE, old_instance=old_instance)
+
+
+def audit_deleted_object(sender, instance, **kwargs):
+    create_audit_log(instance, AuditLog.Action.DELETE)
+
+
+def connect_tracked_models():
+    """Connect the audit receivers to every model in the registry (called once it is populated)."""
+    for label, tracked in registry.models.items():
+        pre_save.connect(remember_old_instance, sender=tracked.model, dispatch_uid=f'audit-pre-{label}')
+        post_save.connect(audit_saved_object, sender=tracked.model, dispatch_uid=f'audit-save-{label}')
+        post_delete.connect(audit_deleted_object, sender=tracked.model, dispatch_uid=f'audit-delete-{label}')
+        snapshots.track(tracked.model)
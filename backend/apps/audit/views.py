@@ -6,16 +6,24 @@ from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
+from django.http import Http404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
+from . import archive
 from .models import AuditLog, UserActivity
 from .serializers import AuditLogSerializer, UserActivitySerializer
 from apps.accounts.permissions import IsAdmin
+from apps.core.routers import ReplicaReadMixin
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(ReplicaReadMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing audit logs."""
     
     queryset = AuditLog.objects.all()
@@ -41,9 +49,69 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # Archived months are merged in by date; other orderings cover the table only
+        ordering = request.query_params.get('ordering', '-created_at')
+        months = archive.archived_months()
+        if not months or ordering not in ('created_at', '-created_at'):
+            return super().list(request, *args, **kwargs)
+
+        params = request.query_params
+        row_filter = archive.ArchiveFilter(
+            start_date=parse_date(params.get('start_date') or ''),
+            end_date=parse_date(params.get('end_date') or ''),
+            search_terms=filters.SearchFilter().get_search_terms(request),
+            user_id=params.get('user'),
+            action=params.get('action'),
+            model_name=params.get('model_name'),
+        )
+        timeline = archive.AuditTimeline(
+            self.filter_queryset(self.get_queryset()), months, row_filter,
+            descending=ordering.startswith('-')
+        )
+        page = self.paginate_queryset(timeline)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(list(timeline), many=True)
+        return Response(serializer.data)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            log = archive.find(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+            if log is None:
+                raise
+            self.check_object_permissions(self.request, log)
+            return log
+
+    def keyset_response(self, request, queryset, **exact):
+        """
+        One page of ``queryset`` newest first, continuing into archived months.
+        ``?cursor=`` comes from the previous page's ``next`` link and
+        ``?page_size=`` (default 100, at most 500) sets the page length.
+        """
+        try:
+            cursor = archive.decode_cursor(request.query_params.get('cursor'))
+            size = min(max(int(request.query_params.get('page_size', 100)), 1), 500)
+        except ValueError:
+            return Response({'detail': 'Invalid cursor or page_size.'}, status=400)
+
+        logs, more = archive.keyset_page(
+            queryset.select_related('user'), archive.ArchiveFilter(**exact), cursor, size
+        )
+        next_url = None
+        if more:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', archive.encode_cursor(logs[-1])
+            )
+        serializer = AuditLogSerializer(logs, many=True)
+        return Response({'next': next_url, 'results': serializer.data})
+
     @action(detail=False, methods=['get'])
     def by_user(self, request):
-        """Get audit logs grouped by user."""
+        """Get a user's audit logs, newest first, one page at a time."""
         user_id = request.query_params.get('user_id')
         if not user_id:
             return Response(
@@ -51,13 +119,11 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                 status=400
             )
         
-        logs = AuditLog.objects.filter(user_id=user_id).order_by('-created_at')[:100]
-        serializer = AuditLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        return self.keyset_response(request, AuditLog.objects.filter(user_id=user_id), user_id=user_id)
 
     @action(detail=False, methods=['get'])
     def by_model(self, request):
-        """Get audit logs for a specific model."""
+        """Get audit logs for a specific model, newest first, one page at a time."""
         model_name = request.query_params.get('model_name')
         if not model_name:
             return Response(
@@ -65,13 +131,16 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                 status=400
             )
         
-        logs = AuditLog.objects.filter(model_name=model_name).order_by('-created_at')[:100]
-        serializer = AuditLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        return self.keyset_response(
+            request, AuditLog.objects.filter(model_name=model_name), model_name=model_name
+        )
 
     @action(detail=False, methods=['get'])
     def by_object(self, request):
-        """Get audit logs for a specific object."""
+        """
+        Get the audit trail of an object, newest first, one page at a time.
+        Pass ``model_name`` as well to narrow it to one model's object.
+        """
         object_id = request.query_params.get('object_id')
         if not object_id:
             return Response(
@@ -79,9 +148,17 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                 status=400
             )
         
-        logs = AuditLog.objects.filter(object_id=object_id).order_by('-created_at')
-        serializer = AuditLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        model_name = request.query_params.get('model_name')
+        content_types = ContentType.objects.all()
+        if model_name:
+            content_types = content_types.filter(model=model_name)
+        # Naming the content types, even all of them, lets the database use the
+        # (content_type, object_id, created_at) index
+        of_type = Q(content_type__in=list(content_types.values_list('id', flat=True)))
+        if not model_name:
+            of_type |= Q(content_type__isnull=True)
+        logs = AuditLog.objects.filter(of_type, object_id=object_id)
+        return self.keyset_response(request, logs, object_id=object_id, model_name=model_name)
 
     @action(detail=False, methods=['get'])
     def statistics(self, request):
@@ -106,15 +183,49 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
             count=Count('id')
         ).order_by('-count')[:10]
         
+        archived = archive.statistics(start_date)
+        if not any(archived.values()):
+            return Response({
+                'period_days': days,
+                'actions_by_type': list(actions_by_type),
+                'actions_by_model': list(actions_by_model),
+                'most_active_users': list(active_users)
+            })
+
+        # Part of the period is archived: add the archive counts
+        for row in actions_by_type:
+            archived['actions'][row['action']] += row['count']
+        for row in actions_by_model:
+            archived['models'][row['model_name'] or ''] += row['count']
+        for row in AuditLog.objects.filter(created_at__gte=start_date).values('user_id').annotate(count=Count('id')):
+            archived['users'][str(row['user_id'] or '')] += row['count']
+
+        top_users = archived['users'].most_common(10)
+        User = get_user_model()
+        users = User.objects.in_bulk([User._meta.pk.to_python(user_id) for user_id, _ in top_users if user_id])
+        most_active_users = []
+        for user_id, count in top_users:
+            user = users.get(User._meta.pk.to_python(user_id)) if user_id else None
+            most_active_users.append({
+                'user__email': user.email if user else None,
+                'user__first_name': user.first_name if user else None,
+                'user__last_name': user.last_name if user else None,
+                'count': count,
+            })
+
         return Response({
             'period_days': days,
-            'actions_by_type': list(actions_by_type),
-            'actions_by_model': list(actions_by_model),
-            'most_active_users': list(active_users)
+            'actions_by_type': [
+                {'action': name, 'count': count} for name, count in archived['actions'].items()
+            ],
+            'actions_by_model': [
+                {'model_name': name or None, 'count': count} for name, count in archived['models'].items()
+            ],
+            'most_active_users': most_active_users
         })
 
 
-class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
+class UserActivityViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing user activities."""
     
     queryset = UserActivity.objects.all()
@@ -0,0 +1,95 @@
+"""
+Batched audit log writer for Audit app.
+
+``record(log)`` queues an unsaved ``AuditLog``. Inside ``batch()`` (bound by
+``AuditMiddleware`` for each request) entries are written together when the
+batch ends, or earlier once ``AUDIT_FLUSH_SIZE`` are waiting. Outside a batch
+each entry is written straight away.
+
+An entry recorded inside a transaction is only queued once that transaction
+commits, so a rolled-back change leaves no audit entry.
+
+Each flush locks the chain head once, gives the entries their ``seq``,
+``created_at`` and ``row_hash`` (see chain.py), and inserts them with one
+``bulk_create``. Chaining costs a lock and a hash per flush, not per row.
+``created_at`` is the flush time, not the time the entry was recorded, so it
+rises with ``seq`` and each archived month holds one unbroken run of the chain.
+``bulk_create`` sends no ``post_save``, so the flush counts the entries in
+``erp_audit_writes_total`` itself. Bulk loaders that need historical dates
+(``generate_data``) flush with ``backdated=True``: entries keep their own
+``created_at``, raised where needed so it never falls behind the chain.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core import metrics
+
+from .chain import link, row_of
+from .models import AuditChainHead, AuditLog
+
+pending_entries = ContextVar('pending_audit_entries', default=None)
+
+
+def flush(logs, backdated=False):
+    """Chain and insert ``logs`` in one transaction; return them."""
+    if not logs:
+        return logs
+    with transaction.atomic(using='default'):
+        head, _ = AuditChainHead.objects.using('default').select_for_update().get_or_create(pk=1)
+        seq, previous = head.last_seq, head.last_hash
+        if backdated:
+            logs = sorted(logs, key=lambda log: log.created_at)
+            now = AuditLog.objects.using('default').filter(seq=seq).values_list('created_at', flat=True).first()
+        else:
+            # Never behind the previous flush, even across servers with skewed clocks
+            now = max(timezone.now(), head.updated_at)
+        for log in logs:
+            if log.user_id and not log.user_email:
+                log.user_email = log.user.email
+            seq += 1
+            log.seq = seq
+            if backdated:
+                now = log.created_at if now is None else max(log.created_at, now)
+            log.created_at = now
+            log.row_hash = previous = link(previous, row_of(log))
+        AuditLog.objects.using('default').bulk_create(logs, batch_size=1000)
+        head.last_seq, head.last_hash = seq, previous
+        head.save(update_fields=['last_seq', 'last_hash', 'updated_at'])
+        for action, written in Counter(log.action for log in logs).items():
+            metrics.inc('erp_audit_writes_total', written, action=action)
+    return logs
+
+
+def queue(entries, log):
+    entries.append(log)
+    if len(entries) >= getattr(settings, 'AUDIT_FLUSH_SIZE', 100):
+        flush(entries[:])
+        del entries[:]
+
+
+def record(log):
+    """Write ``log`` with the current batch, once its transaction commits."""
+    entries = pending_entries.get()
+    if entries is None:
+        transaction.on_commit(partial(flush, [log]), using='default')
+    else:
+        transaction.on_commit(partial(queue, entries, log), using='default')
+
+
+@contextmanager
+def batch():
+    """Collect the entries recorded in the block and write them at the end."""
+    entries = []
+    token = pending_entries.set(entries)
+    try:
+        yield entries
+    finally:
+        pending_entries.reset(token)
+        flush(entries)
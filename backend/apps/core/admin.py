@@ -0,0 +1,28 @@
+"""
+Admin configuration for Core app.
+"""
+
+from django.contrib import admin
+from . import jobs
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'idempotency_key']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'name', 'payload', 'status', 'priority', 'idempotency_key', 'attempts', 'max_attempts',
+        'run_at', 'locked_by', 'locked_at', 'last_error', 'created_at', 'finished_at'
+    ]
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Retry selected failed jobs')
+    def retry_jobs(self, request, queryset):
+        count = jobs.retry(queryset)
+        self.message_user(request, f'{count} jobs queued again.')
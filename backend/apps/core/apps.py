@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core Infrastructure'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        import apps.core.signals  # noqa
+        # Register background jobs and event types declared in each app's jobs.py and events.py
+        autodiscover_modules('jobs', 'events')
\ No newline at end of file
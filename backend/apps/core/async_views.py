@@ -0,0 +1,69 @@
+"""
+Async API views for Core app - for I/O-bound endpoints under ASGI.
+
+``AsyncAPIView`` is a DRF ``APIView`` whose handlers may be ``async def``.
+Under ASGI (``config.asgi``) the request is then served on the event loop
+instead of holding a worker thread. Authentication, permission and throttle
+checks still run synchronously, in Django's thread for sync code.
+
+The ORM is synchronous, so handlers call it through ``gather``. Like
+``apps.core.fanout.fan_out``, it runs each query function on the bounded
+fan-out pool with its own connection, so independent queries run
+concurrently:
+
+    class ProductionAnalyticsView(AsyncAPIView):
+        async def get(self, request):
+            daily, overall = await gather(
+                lambda: list(ProductionRecord.objects.values(...)),
+                lambda: ProductionRecord.objects.aggregate(...),
+            )
+
+Query functions must evaluate their queryset (``list()``, ``aggregate()``,
+``count()``...). A lazy queryset would run later, on the event loop.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import views
+
+from .fanout import get_executor, run_query
+
+
+async def gather(*queries):
+    """Run independent query functions concurrently; return their results in order."""
+    executor = get_executor()
+    if executor is None:
+        # Fan-out disabled: one after another in the thread for sync code
+        return [await sync_to_async(query)() for query in queries]
+    return await asyncio.gather(*(
+        sync_to_async(run_query, thread_sensitive=False, executor=executor)(query) for query in queries
+    ))
+
+
+class AsyncAPIView(views.APIView):
+    """APIView with an async ``dispatch`` for ``async def`` handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,15 @@
+"""
+MySQL backend with an optional per-process connection pool.
+
+Identical to ``django.db.backends.mysql`` unless ``OPTIONS['pool']`` is set;
+see apps.core.backends.pool.
+"""
+
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MySQLDatabaseWrapper):
+    def ping(self, connection):
+        connection.ping()
@@ -0,0 +1,196 @@
+"""
+Per-process database connection pool shared by a worker's threads.
+
+Django keeps one connection per thread, so a threaded worker (gunicorn
+``--threads``) holds up to one MySQL connection per thread, and with
+``CONN_MAX_AGE = 0`` reconnects on every request. With
+``OPTIONS['pool']`` set, ``PooledDatabaseWrapperMixin`` instead borrows a
+raw connection from a bounded pool when Django connects and hands it back
+when Django closes it at the end of the request:
+
+    'OPTIONS': {'pool': {'max_size': 8, 'timeout': 10, 'max_lifetime': 1800}}
+
+(``'pool': True`` uses the defaults in POOL_DEFAULTS.)
+
+Connections are health-checked on checkout when ``CONN_HEALTH_CHECKS`` is
+on, recycled after ``max_lifetime`` seconds and discarded instead of
+returned when the request left them in an error or transaction state.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+POOL_DEFAULTS = {'max_size': 10, 'timeout': 10.0, 'max_lifetime': 1800.0}
+
+# (alias, database, host, port, user) -> ConnectionPool for this process
+pools = {}
+pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """A bounded LIFO pool of raw DB-API connections."""
+
+    def __init__(self, alias, max_size, timeout, max_lifetime):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.pid = os.getpid()
+        self.idle = deque()
+        self.in_use = 0
+        self.condition = threading.Condition()
+        # Counters reported on /metrics and by the load test
+        self.opened = 0
+        self.discarded = 0
+        self.waits = 0
+
+    def acquire(self, connect, check):
+        """
+        Return ``(connection, created_at, reused)``. ``connect()`` opens a new
+        raw connection and ``check(connection)`` raises if an idle one is
+        dead, or is None to skip health checks.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while not self.idle and self.in_use >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise OperationalError(
+                        f"Connection pool for '{self.alias}' exhausted: "
+                        f'{self.max_size} connections in use after {self.timeout}s'
+                    )
+                self.waits += 1
+                self.condition.wait(remaining)
+            entry = self.idle.pop() if self.idle else None
+            self.in_use += 1
+
+        try:
+            if entry is not None:
+                connection, created_at = entry
+                if self.expired(created_at):
+                    self.close_quietly(connection)
+                else:
+                    try:
+                        if check is not None:
+                            check(connection)
+                        return connection, created_at, True
+                    except Exception:
+                        self.close_quietly(connection)
+            connection = connect()
+        except BaseException:
+            self.release(None)
+            raise
+        with self.condition:
+            self.opened += 1
+        return connection, time.monotonic(), False
+
+    def release(self, connection, created_at=None, reusable=True):
+        """Return a connection, or close it when it must not be reused."""
+        if connection is not None and (not reusable or self.expired(created_at) or self.pid != os.getpid()):
+            self.close_quietly(connection)
+            connection = None
+        with self.condition:
+            self.in_use -= 1
+            if connection is not None:
+                self.idle.append((connection, created_at))
+            self.condition.notify()
+
+    def expired(self, created_at):
+        return bool(self.max_lifetime) and time.monotonic() - created_at >= self.max_lifetime
+
+    def close_quietly(self, connection):
+        with self.condition:
+            self.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self.condition:
+            idle, self.idle = list(self.idle), deque()
+        for connection, _ in idle:
+            self.close_quietly(connection)
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'idle': len(self.idle),
+                'in_use': self.in_use,
+                'opened': self.opened,
+                'discarded': self.discarded,
+                'waits': self.waits,
+            }
+
+
+def get_pool(alias, settings_dict):
+    """
+    The pool for a connection's target in this process. Keyed by database as
+    well as alias so a test run's renamed database never gets a connection to
+    the real one; a forked worker starts a fresh pool.
+    """
+    key = (alias,) + tuple(settings_dict[name] for name in ('NAME', 'HOST', 'PORT', 'USER'))
+    pool = pools.get(key)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with pools_lock:
+        pool = pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            # Connections inherited from the parent process belong to it
+            options = settings_dict['OPTIONS']['pool']
+            options = {**POOL_DEFAULTS, **(options if isinstance(options, dict) else {})}
+            pool = ConnectionPool(alias, options['max_size'], options['timeout'], options['max_lifetime'])
+            pools[key] = pool
+    return pool
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    DatabaseWrapper mixin that takes raw connections from ``get_pool`` when
+    ``OPTIONS['pool']`` is set and behaves like the base backend otherwise.
+    """
+
+    pool = None
+    _pool_created_at = None
+    _pool_reused = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def ping(self, connection):
+        """Raise if ``connection`` is no longer usable."""
+        raise NotImplementedError
+
+    def get_new_connection(self, conn_params):
+        if not self.settings_dict['OPTIONS'].get('pool'):
+            return super().get_new_connection(conn_params)
+        pool = get_pool(self.alias, self.settings_dict)
+        check = self.ping if self.settings_dict['CONN_HEALTH_CHECKS'] else None
+        connection, self._pool_created_at, self._pool_reused = pool.acquire(
+            lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params), check
+        )
+        self.pool = pool
+        return connection
+
+    def init_connection_state(self):
+        # Session settings survive on a pooled connection
+        if not self._pool_reused:
+            super().init_connection_state()
+
+    def _close(self):
+        if self.pool is None:
+            return super()._close()
+        pool, self.pool = self.pool, None
+        reusable = not (
+            self.in_atomic_block
+            or self.autocommit != self.settings_dict['AUTOCOMMIT']
+            or (self.errors_occurred and not self.is_usable())
+        )
+        pool.release(self.connection, self._pool_created_at, reusable)
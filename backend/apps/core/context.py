@@ -0,0 +1,104 @@
+"""
+Request context for Core app - who is acting, carried in a context variable.
+
+``AuditMiddleware`` (apps.audit) binds a ``RequestContext`` for each request.
+Code further down, such as the audit writer, reads it with ``get_context()``
+instead of being handed the request:
+
+    context = get_context()
+    if context is not None:
+        context.user_id, context.ip_address, context.user_agent
+
+A context variable follows the request wherever its code runs. That covers
+the request thread, async views, ``sync_to_async`` calls and the query fan-out
+pool, which all copy the caller's context. Background jobs record the context
+they were enqueued under, and the worker binds it again while the job runs.
+
+The user is read from the request when asked for. Token authentication
+happens in the view, after the middleware, and DRF stores the authenticated
+user back on the request, so this gives the right user without a lookup.
+"""
+
+import ipaddress
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+request_context = ContextVar('request_context', default=None)
+
+
+def client_ip(request):
+    """Client address, the first X-Forwarded-For hop when behind a proxy."""
+    address = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
+    address = address or request.META.get('REMOTE_ADDR')
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+
+class RequestContext:
+    """The acting user and client of a request, or of the request that queued a job."""
+
+    __slots__ = ('request', '_user_id', '_user_email', 'ip_address', 'user_agent')
+
+    def __init__(self, request=None, user_id=None, user_email=None, ip_address=None, user_agent=None):
+        self.request = request
+        self._user_id = user_id
+        self._user_email = user_email
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(
+            request=request,
+            ip_address=client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        )
+
+    @property
+    def user(self):
+        """The authenticated user of a request context, else None."""
+        user = getattr(self.request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
+
+    @property
+    def user_id(self):
+        if self.request is not None:
+            user = self.user
+            return user.pk if user is not None else None
+        return self._user_id
+
+    @property
+    def user_email(self):
+        if self.request is not None:
+            user = self.user
+            return user.email if user is not None else None
+        return self._user_email
+
+    def as_dict(self):
+        """JSON-serializable copy, without the request."""
+        user_id = self.user_id
+        return {
+            'user_id': str(user_id) if user_id is not None else None,
+            'user_email': self.user_email,
+            'ip_address': self.ip_address,
+            'user_agent': self.user_agent,
+        }
+
+
+def get_context():
+    """The RequestContext bound to the running code, or None."""
+    return request_context.get()
+
+
+@contextmanager
+def bind(context):
+    """Make ``context`` current for the enclosed block."""
+    token = request_context.set(context)
+    try:
+        yield context
+    finally:
+        request_context.reset(token)
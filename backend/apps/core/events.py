@@ -0,0 +1,255 @@
+"""
+Change events for Core app - transactional outbox and in-process event bus.
+
+Apps declare typed events in their ``events`` module (imported at startup)
+and publish them where the change is made:
+
+    @register
+    @dataclass(frozen=True)
+    class OrderStatusChanged(Event):
+        event_type = 'crm.OrderStatusChanged'
+        order_id: str
+        previous_status: str
+        new_status: str
+
+    publish(OrderStatusChanged(order_id=str(order.pk), ...))
+
+``publish`` writes an ``OutboxEvent`` row on the default database, so inside
+``transaction.atomic()`` the event is stored if and only if the change
+commits. After commit a dispatcher thread in the same process (web servers
+and ``run_jobs`` workers) delivers pending events, oldest first and in
+batches, to the subscribers:
+
+    @subscribe(OrderStatusChanged)
+    def refresh_dashboard(event):
+        ...
+
+    @subscribe(OrderStatusChanged, StockMoved, batch=True)
+    def invalidate_caches(events):
+        ...
+
+Delivery is at least once. Events left by a crashed process, or published by
+a management command (which runs no dispatcher thread), are picked up by the
+next dispatch, from any process (``manage.py dispatch_events`` drains them
+too). Each subscriber runs in its own savepoint. An exception rolls back that
+subscriber's writes and is logged, but it does not stop other subscribers or
+later events. The event stays pending and is delivered again, to all of its
+subscribers, after ``OUTBOX_RETRY_DELAY`` seconds, doubling with each attempt.
+After ``OUTBOX_MAX_ATTEMPTS`` failures it is left undelivered with its
+``last_error`` for an operator. Events of an unknown type (a subscriber app
+not deployed yet) are retried the same way. Subscribers must therefore be
+idempotent.
+
+With ``OUTBOX_DISPATCH_INLINE`` (tests) events are delivered in the
+publishing thread right after commit instead.
+"""
+
+import dataclasses
+import logging
+import os
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# event_type -> Event subclass
+event_types = {}
+# Event subclass -> [(handler, batch)]
+subscribers = {}
+
+
+class Event:
+    """Base class for typed change events (declare them as frozen dataclasses)."""
+
+    event_type = None
+
+    @property
+    def aggregate_id(self):
+        """Id of the object the event is about, stored for lookups."""
+        for field in dataclasses.fields(self):
+            if field.name.endswith('_id'):
+                return getattr(self, field.name)
+        return ''
+
+    def as_payload(self):
+        return dataclasses.asdict(self)
+
+
+def register(event_class):
+    """Class decorator making an event type deliverable from the outbox."""
+    if not event_class.event_type:
+        raise ValueError(f'{event_class.__name__} must set event_type.')
+    event_types[event_class.event_type] = event_class
+    return event_class
+
+
+def subscribe(*event_classes, batch=False):
+    """
+    Register the decorated function for ``event_classes``. It receives one
+    event at a time, or with ``batch=True`` the list of matching events in
+    each delivered batch.
+    """
+    def decorator(func):
+        for event_class in event_classes:
+            subscribers.setdefault(event_class, []).append((func, batch))
+        return func
+    return decorator
+
+
+def publish(event):
+    """Store ``event`` in the outbox and schedule its delivery after commit."""
+    if type(event).event_type not in event_types:
+        raise KeyError(f'{type(event).__name__} is not a registered event type.')
+    OutboxEvent.objects.using('default').create(
+        event_type=event.event_type,
+        aggregate_id=str(event.aggregate_id)[:100],
+        payload=event.as_payload(),
+    )
+    transaction.on_commit(schedule_dispatch, using='default')
+
+
+def deliver(events):
+    """
+    Call the subscribers of each event type, in the order of ``events``.
+    Return {position in ``events``: error} for the events a subscriber failed on.
+    """
+    by_class = {}
+    for position, event in enumerate(events):
+        by_class.setdefault(type(event), []).append((position, event))
+
+    failed = {}
+    for event_class, matching in by_class.items():
+        for handler, batch in subscribers.get(event_class, ()):
+            groups = [matching] if batch else [[item] for item in matching]
+            for group in groups:
+                try:
+                    with transaction.atomic():
+                        handler([event for _position, event in group] if batch else group[0][1])
+                except Exception:
+                    logger.exception(
+                        'Event subscriber %s.%s failed for %s',
+                        handler.__module__, handler.__qualname__, event_class.event_type
+                    )
+                    error = traceback.format_exc()
+                    for position, _event in group:
+                        failed.setdefault(position, error)
+    return failed
+
+
+def retry_later(row, error, now):
+    """Record a failed delivery of ``row``; it is retried after a backoff."""
+    row.attempts += 1
+    row.last_error = error
+    delay = getattr(settings, 'OUTBOX_RETRY_DELAY', 30) * 2 ** (row.attempts - 1)
+    row.next_attempt_at = now + timedelta(seconds=delay)
+    if row.attempts >= getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5):
+        logger.error('Outbox event %s failed %s times; giving up', row, row.attempts)
+
+
+def dispatch_pending(batch_size=None):
+    """Deliver one batch of pending events; return how many were handled."""
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+    now = timezone.now()
+    with transaction.atomic(using='default'):
+        rows = list(
+            OutboxEvent.objects.using('default').select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True, attempts__lt=getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5))
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('id')[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        known, events, retried = [], [], []
+        for row in rows:
+            event_class = event_types.get(row.event_type)
+            if event_class is None:
+                logger.error('Unknown event type %s in outbox row %s', row.event_type, row.pk)
+                retry_later(row, f'Unknown event type {row.event_type}.', now)
+                retried.append(row)
+                continue
+            known.append(row)
+            events.append(event_class(**row.payload))
+
+        failed = deliver(events)
+        for position, row in enumerate(known):
+            if position in failed:
+                retry_later(row, failed[position], now)
+                retried.append(row)
+        delivered = [row.pk for position, row in enumerate(known) if position not in failed]
+        if delivered:
+            OutboxEvent.objects.using('default').filter(pk__in=delivered).update(dispatched_at=now)
+        if retried:
+            OutboxEvent.objects.using('default').bulk_update(retried, ['attempts', 'next_attempt_at', 'last_error'])
+    return len(rows)
+
+
+def dispatch_all(batch_size=None):
+    """Deliver pending events until the outbox is drained; return the count."""
+    total = 0
+    while True:
+        handled = dispatch_pending(batch_size)
+        if not handled:
+            return total
+        total += handled
+
+
+class Dispatcher:
+    """
+    Per-process daemon thread delivering outbox events after commits.
+
+    Only long-running processes start it (``enable()`` in config.wsgi,
+    config.asgi and ``run_jobs``); elsewhere, such as in other management
+    commands, events wait in the outbox for the next dispatch.
+    """
+
+    def __init__(self):
+        self.pending = threading.Event()
+        self.thread = None
+        self.pid = None
+        self.lock = threading.Lock()
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def wake(self):
+        if not self.enabled:
+            return
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+                    self.pid = os.getpid()
+                    self.thread = threading.Thread(target=self.run, name='outbox-dispatcher', daemon=True)
+                    self.thread.start()
+        self.pending.set()
+
+    def run(self):
+        interval = getattr(settings, 'OUTBOX_POLL_INTERVAL', 30)
+        while True:
+            self.pending.wait(interval)
+            self.pending.clear()
+            try:
+                dispatch_all()
+            except Exception:
+                logger.exception('Outbox dispatch failed')
+            finally:
+                close_old_connections()
+
+
+dispatcher = Dispatcher()
+
+
+def schedule_dispatch():
+    if getattr(settings, 'OUTBOX_DISPATCH_INLINE', False):
+        dispatch_all()
+    else:
+        dispatcher.wake()
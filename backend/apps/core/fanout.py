@@ -0,0 +1,82 @@
+"""
+Query fan-out for Core app - run independent queries concurrently.
+
+Composite views (dashboards) run several independent aggregate queries. Run
+one after another, their latencies add up. ``fan_out`` runs them on a small
+per-process thread pool instead, each thread on its own database connection,
+so the view takes about as long as its slowest query:
+
+    results = fan_out(
+        total_orders=lambda: Order.objects.count(),
+        revenue=lambda: Order.objects.aggregate(total=Sum('total_amount')),
+    )
+    results['total_orders']
+
+Query functions must evaluate their queryset (``count()``, ``aggregate()``,
+``list()``...). They run with the caller's context variables, so replica
+routing and request instrumentation apply to them as well.
+
+``settings.QUERY_FANOUT_WORKERS`` bounds the pool; each of its threads may
+hold a database connection. With 0 or 1 workers, and inside a transaction
+(whose uncommitted rows other connections cannot see), the functions run in
+order in the calling thread.
+"""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .instrumentation import count_queries
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor():
+    """The process's fan-out pool, or None when fan-out is disabled."""
+    global _executor, _executor_pid
+    workers = getattr(settings, 'QUERY_FANOUT_WORKERS', 4)
+    if workers <= 1:
+        return None
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            # A forked worker cannot use its parent's threads
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(workers, thread_name_prefix='query-fanout')
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def run_query(query):
+    """Run ``query()`` in a pool thread, then release its connections."""
+    _local.active = True
+    try:
+        with count_queries():
+            return query()
+    finally:
+        _local.active = False
+        # Pool threads never see request_finished
+        close_old_connections()
+
+
+def in_transaction():
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def fan_out(**queries):
+    """Run independent query functions concurrently; return their results by name."""
+    executor = get_executor()
+    if executor is None or len(queries) < 2 or getattr(_local, 'active', False) or in_transaction():
+        return {name: query() for name, query in queries.items()}
+
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, run_query, query)
+        for name, query in queries.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,238 @@
+"""
+Request instrumentation - per-action query counts, timings and budgets.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+# Histogram bucket upper bounds
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+RESPONSE_SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when an action runs more queries than its budget."""
+
+
+def query_budget(max_queries):
+    """
+    Declare the maximum number of SQL queries a view handler may run.
+
+    Usable on viewset actions and APIView methods:
+
+        @action(detail=False, methods=['get'])
+        @query_budget(5)
+        def pending_dispatch(self, request):
+            ...
+
+    Viewsets can also declare budgets for several actions at once with a
+    ``query_budgets = {'list': 3, 'pending_dispatch': 5}`` class attribute.
+    """
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+def resolve_view(view_func, method):
+    """Return (action key, query budget) for a resolved view function."""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}", getattr(view_func, 'query_budget', None)
+
+    method = method.lower()
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        # Viewset: map the HTTP method to the routed action name
+        action = actions.get(method, method)
+    else:
+        action = method
+
+    budget = getattr(view_class, 'query_budgets', {}).get(action)
+    if budget is None:
+        handler = getattr(view_class, action, None)
+        budget = getattr(handler, 'query_budget', None)
+    return f"{view_class.__name__}.{action}", budget
+
+
+class Histogram:
+    """Fixed-bucket cumulative histogram."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def cumulative(self):
+        """Yield (upper bound, cumulative count) pairs, ending with +Inf."""
+        total = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), self.counts):
+            total += bucket_count
+            yield bound, total
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'avg': round(self.sum / self.count, 3) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': {str(bound): total for bound, total in self.cumulative()},
+        }
+
+
+class ActionStats:
+    """Aggregated request statistics for a single view action."""
+
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.sql_ms = Histogram(DURATION_BUCKETS_MS)
+        self.render_ms = Histogram(DURATION_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.response_bytes = Histogram(RESPONSE_SIZE_BUCKETS)
+        self.max_queries = 0
+        self.budget = None
+        self.budget_violations = 0
+        self.status_codes = {}
+
+    def as_dict(self):
+        return {
+            'duration_ms': self.duration_ms.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'render_ms': self.render_ms.as_dict(),
+            'queries': self.queries.as_dict(),
+            'response_bytes': self.response_bytes.as_dict(),
+            'max_queries': self.max_queries,
+            'query_budget': self.budget,
+            'budget_violations': self.budget_violations,
+            'status_codes': dict(self.status_codes),
+        }
+
+
+class RequestMetricsRegistry:
+    """In-process, thread-safe store of per-action request statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._actions = {}
+
+    def record(self, sample):
+        with self._lock:
+            stats = self._actions.get(sample.action)
+            if stats is None:
+                stats = self._actions[sample.action] = ActionStats()
+            stats.duration_ms.observe(sample.duration_ms)
+            stats.sql_ms.observe(sample.sql_ms)
+            stats.render_ms.observe(sample.render_ms)
+            stats.queries.observe(sample.query_count)
+            if sample.response_bytes is not None:
+                stats.response_bytes.observe(sample.response_bytes)
+            stats.max_queries = max(stats.max_queries, sample.query_count)
+            stats.budget = sample.budget
+            if sample.over_budget:
+                stats.budget_violations += 1
+            stats.status_codes[sample.status_code] = stats.status_codes.get(sample.status_code, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {action: stats.as_dict() for action, stats in sorted(self._actions.items())}
+
+    def items(self):
+        """Return a copy of (action, ActionStats) pairs for exporters."""
+        with self._lock:
+            return sorted(self._actions.items())
+
+    def reset(self):
+        with self._lock:
+            self._actions.clear()
+
+
+class RequestSample:
+    """Measurements collected for a single request."""
+
+    __slots__ = (
+        'action', 'budget', 'started', 'query_count', 'sql_ms',
+        'render_started', 'render_ms', 'duration_ms', 'response_bytes', 'status_code', 'lock',
+    )
+
+    def __init__(self, started):
+        self.action = None
+        self.budget = None
+        self.started = started
+        self.query_count = 0
+        self.sql_ms = 0.0
+        self.render_started = None
+        self.render_ms = 0.0
+        self.duration_ms = 0.0
+        self.response_bytes = None
+        self.status_code = None
+        # Async views run queries on several threads at once
+        self.lock = threading.Lock()
+
+    def count_query(self, execute, sql, params, many, context):
+        """Connection execute wrapper that adds the query to this sample."""
+        query_started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - query_started) * 1000
+            with self.lock:
+                self.query_count += 1
+                self.sql_ms += elapsed_ms
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.query_count > self.budget
+
+    def server_timing(self):
+        app_ms = max(self.duration_ms - self.sql_ms - self.render_ms, 0.0)
+        return ', '.join([
+            f'db;dur={self.sql_ms:.2f};desc="{self.query_count} queries"',
+            f'serialize;dur={self.render_ms:.2f}',
+            f'app;dur={app_ms:.2f}',
+            f'total;dur={self.duration_ms:.2f}',
+        ])
+
+
+request_metrics = RequestMetricsRegistry()
+
+# Sample of the request being handled, visible to threads it hands work to
+current_sample = ContextVar('current_sample', default=None)
+
+
+@contextmanager
+def count_queries(sample=None):
+    """
+    Count the queries this thread's connections run into ``sample`` (by
+    default the current request's), e.g. in executor threads of async views.
+    """
+    sample = sample or current_sample.get()
+    with ExitStack() as stack:
+        if sample is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sample.count_query))
+        yield sample
@@ -0,0 +1,203 @@
+"""
+Background jobs for Core app - a database-backed queue without a broker.
+
+Register a function as a job in an app's ``jobs`` module (imported at
+startup) and enqueue it from a request handler:
+
+    @job('production.update_summary', priority=10)
+    def update_production_summary(order_id):
+        ...
+
+    enqueue('production.update_summary', order_id=str(order.pk))
+
+The job row is written in the caller's transaction, so it exists only if the
+request commits, and ``manage.py run_jobs`` workers pick it up from there.
+Payloads are keyword arguments and must be JSON serializable. The job also
+keeps the request context it was enqueued under (``apps.core.context``), so
+audit entries written by the job name the user who caused it.
+
+Workers claim due jobs highest priority first. A job that raises is retried
+with exponential backoff until ``max_attempts``, then left as failed with its
+error. A job whose worker died is claimed again once its lock is older than
+``JOB_LOCK_TIMEOUT`` seconds, so job functions must be safe to run twice.
+Passing ``key=`` makes enqueueing idempotent: an existing job with the same
+key is returned instead of adding another.
+
+Finished jobs (succeeded or failed) are deleted ``JOBS_RETENTION_DAYS`` after
+they finish by ``prune``, which idle workers run hourly; their idempotency
+keys can then be used again.
+
+With ``JOBS_RUN_INLINE`` (development, tests) jobs run in the request process
+right after the transaction commits instead.
+"""
+
+import logging
+import os
+import socket
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .context import RequestContext, bind, get_context
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# name -> JobSpec
+registry = {}
+
+
+class JobSpec:
+    """A registered job function and its defaults."""
+
+    def __init__(self, name, func, priority, max_attempts, retry_delay):
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    def backoff(self, attempts):
+        """Seconds to wait before retrying after ``attempts`` failed runs."""
+        return self.retry_delay * 2 ** (attempts - 1)
+
+
+def job(name, priority=0, max_attempts=3, retry_delay=30):
+    """Register the decorated function as the job ``name``."""
+    def decorator(func):
+        if name in registry and registry[name].func is not func:
+            raise ValueError(f"Job '{name}' is already registered.")
+        registry[name] = JobSpec(name, func, priority, max_attempts, retry_delay)
+        return func
+    return decorator
+
+
+def enqueue(name, *, key=None, priority=None, delay=None, **payload):
+    """
+    Queue the job ``name`` with ``payload`` as its keyword arguments and
+    return the Job. ``delay`` (seconds or timedelta) postpones the first run.
+    """
+    spec = registry.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown job '{name}'.")
+    if isinstance(delay, (int, float)):
+        delay = timedelta(seconds=delay)
+
+    context = get_context()
+    fields = {
+        'name': name,
+        'payload': payload,
+        'context': context.as_dict() if context is not None else {},
+        'priority': spec.priority if priority is None else priority,
+        'max_attempts': spec.max_attempts,
+        'run_at': timezone.now() + (delay or timedelta()),
+    }
+    if key is None:
+        queued = Job.objects.create(**fields)
+    else:
+        try:
+            with transaction.atomic():
+                queued = Job.objects.create(idempotency_key=key, **fields)
+        except IntegrityError:
+            return Job.objects.get(idempotency_key=key)
+
+    if getattr(settings, 'JOBS_RUN_INLINE', False):
+        transaction.on_commit(lambda: run_job(queued.pk))
+    return queued
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim(worker, limit=1):
+    """Lock up to ``limit`` due jobs for ``worker`` and return them."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'JOB_LOCK_TIMEOUT', 600))
+    with transaction.atomic():
+        # Jobs whose worker stopped without finishing them
+        abandoned = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=stale)
+        abandoned.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.Status.FAILED, locked_by='', locked_at=None, finished_at=now,
+            last_error='Worker stopped while running the job.',
+        )
+        abandoned.update(status=Job.Status.QUEUED, locked_by='', locked_at=None)
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=now)
+            .order_by('-priority', 'run_at', 'id')[:limit]
+        )
+        for queued in jobs:
+            queued.status = Job.Status.RUNNING
+            queued.locked_by = worker
+            queued.locked_at = now
+            queued.attempts += 1
+        Job.objects.bulk_update(jobs, ['status', 'locked_by', 'locked_at', 'attempts'])
+    return jobs
+
+
+def run_job(job_or_pk, worker=None):
+    """Run one job and record its outcome; return the updated Job."""
+    if not isinstance(job_or_pk, Job):
+        # Inline mode: claim the row so a worker cannot run it as well
+        claimed = Job.objects.filter(pk=job_or_pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, locked_by=worker or worker_id(), locked_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if not claimed:
+            return None
+        job_or_pk = Job.objects.get(pk=job_or_pk)
+    queued = job_or_pk
+
+    spec = registry.get(queued.name)
+    try:
+        if spec is None:
+            raise KeyError(f"Unknown job '{queued.name}'.")
+        context = RequestContext(**queued.context) if queued.context else None
+        # All or nothing, so a retry starts from a clean slate
+        with bind(context) if context is not None else nullcontext(), transaction.atomic():
+            spec.func(**queued.payload)
+    except Exception:
+        queued.last_error = traceback.format_exc()
+        if spec is not None and queued.attempts < queued.max_attempts:
+            queued.status = Job.Status.QUEUED
+            queued.run_at = timezone.now() + timedelta(seconds=spec.backoff(queued.attempts))
+            logger.warning('Job %s failed (attempt %s), retrying', queued, queued.attempts, exc_info=True)
+        else:
+            queued.status = Job.Status.FAILED
+            queued.finished_at = timezone.now()
+            logger.error('Job %s failed permanently', queued, exc_info=True)
+    else:
+        queued.status = Job.Status.SUCCEEDED
+        queued.finished_at = timezone.now()
+        queued.last_error = ''
+    queued.locked_by = ''
+    queued.locked_at = None
+    queued.save(update_fields=['status', 'run_at', 'last_error', 'finished_at', 'locked_by', 'locked_at'])
+    return queued
+
+
+def prune(days, batch_size=1000):
+    """Delete jobs that finished more than ``days`` days ago; return how many."""
+    finished = Job.objects.filter(
+        status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED],
+        finished_at__lt=timezone.now() - timedelta(days=days),
+    )
+    deleted = 0
+    while True:
+        ids = list(finished.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += Job.objects.filter(pk__in=ids).delete()[0]
+
+
+def retry(queryset):
+    """Queue failed jobs again with a fresh set of attempts."""
+    return queryset.filter(status=Job.Status.FAILED).update(
+        status=Job.Status.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None
+    )
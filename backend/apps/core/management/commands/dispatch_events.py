@@ -0,0 +1,60 @@
+"""
+Deliver pending outbox events and prune delivered ones (apps.core.events).
+
+Web and worker processes deliver events themselves after each commit; run
+this from cron to pick up events published by other management commands or
+left by processes that stopped, and to keep the outbox table small. Events
+that failed ``OUTBOX_MAX_ATTEMPTS`` times are reported; ``--retry-failed``
+gives them a fresh set of attempts.
+
+Examples:
+    python manage.py dispatch_events
+    python manage.py dispatch_events --prune-days 7
+    python manage.py dispatch_events --retry-failed
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core import events
+from apps.core.models import OutboxEvent
+
+
+class Command(BaseCommand):
+    help = 'Deliver pending outbox events.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=None, help='Events per delivery batch')
+        parser.add_argument(
+            '--prune-days', type=int, default=None,
+            help='Also delete events delivered more than this many days ago'
+        )
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Deliver events that ran out of attempts again'
+        )
+
+    def handle(self, *args, **options):
+        max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+        undelivered = OutboxEvent.objects.filter(dispatched_at__isnull=True, attempts__gte=max_attempts)
+        if options['retry_failed']:
+            retried = undelivered.update(attempts=0, next_attempt_at=None)
+            self.stdout.write(f'Retrying {retried} failed events.')
+
+        delivered = events.dispatch_all(options['batch'])
+        self.stdout.write(self.style.SUCCESS(f'Delivered {delivered} events.'))
+
+        if options['prune_days'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['prune_days'])
+            pruned, _ = OutboxEvent.objects.filter(dispatched_at__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} delivered events.'))
+
+        failed = undelivered.count()
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f'{failed} events failed {max_attempts} times and are not retried; '
+                'see their last_error, then run with --retry-failed.'
+            ))
@@ -0,0 +1,823 @@
+"""
+Generate a large, realistic data set for profiling and benchmarks.
+
+Builds on the master data from seed_data/seed.py (users, process, inspection,
+treatment and packing masters) and bulk-inserts synthetic customers, materials,
+orders with their per-department records, and audit log rows (hash chained
+through apps.audit.writer, so verify_audit_chain passes on generated data).
+
+The distribution is deliberately skewed the way production data is: a few
+customers own most of the orders, order sizes follow a long-tailed Pareto
+distribution, recent months are busier than old ones and old orders are mostly
+closed. Output is deterministic for a given --seed and starting database.
+
+Examples:
+    python manage.py generate_data --orders 10000
+    python manage.py generate_data --orders 1_000_000 --records-per-order 50 --audit-rows 50_000_000
+"""
+
+import contextlib
+import io
+import random
+import time
+import uuid
+from bisect import bisect
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.audit import writer
+from apps.audit.models import AuditLog
+from apps.crm.models import Customer, Order, OrderStatusHistory
+from apps.fabrication.models import FabricationProcess, OrderFabrication, FabricationLog
+from apps.inspection.models import InspectionType, OrderInspection, InspectionChecklist
+from apps.logistics.models import PackingStandard, OrderDispatch
+from apps.materials.models import MaterialType, Material, OrderMaterial, MaterialTransaction
+from apps.production.models import ProductionRecord, ProductionSummary
+from apps.surface_treatment.models import TreatmentType, OrderSurfaceTreatment
+
+
+# Share of an order's child records that goes to each table
+RECORD_MIX = {
+    'fabrication_logs': 0.35,
+    'production_records': 0.20,
+    'checklist_items': 0.20,
+    'material_transactions': 0.15,
+    'status_history': 0.10,
+}
+
+# Status weights for orders older than RECENT_FRACTION of the date range
+CLOSED_STATUS_WEIGHTS = {
+    Order.Status.COMPLETED: 78,
+    Order.Status.DISPATCHED: 8,
+    Order.Status.CANCELLED: 7,
+    Order.Status.ON_HOLD: 3,
+    Order.Status.IN_PRODUCTION: 2,
+    Order.Status.READY_FOR_DISPATCH: 2,
+}
+
+# Status weights for recent orders, most of which are still in the pipeline
+OPEN_STATUS_WEIGHTS = {
+    Order.Status.DRAFT: 6,
+    Order.Status.QUOTED: 10,
+    Order.Status.CONFIRMED: 14,
+    Order.Status.IN_PRODUCTION: 30,
+    Order.Status.QUALITY_CHECK: 10,
+    Order.Status.READY_FOR_DISPATCH: 8,
+    Order.Status.DISPATCHED: 7,
+    Order.Status.COMPLETED: 10,
+    Order.Status.ON_HOLD: 3,
+    Order.Status.CANCELLED: 2,
+}
+
+RECENT_FRACTION = 0.15
+
+# Path an order takes through the workflow, used for status history
+STATUS_PATH = [
+    Order.Status.DRAFT,
+    Order.Status.QUOTED,
+    Order.Status.CONFIRMED,
+    Order.Status.IN_PRODUCTION,
+    Order.Status.QUALITY_CHECK,
+    Order.Status.READY_FOR_DISPATCH,
+    Order.Status.DISPATCHED,
+    Order.Status.COMPLETED,
+]
+
+PRODUCTION_STATUSES = STATUS_PATH[STATUS_PATH.index(Order.Status.IN_PRODUCTION):]
+DISPATCH_STATUSES = STATUS_PATH[STATUS_PATH.index(Order.Status.READY_FOR_DISPATCH):]
+
+AUDIT_ACTION_WEIGHTS = {
+    AuditLog.Action.UPDATE: 55,
+    AuditLog.Action.CREATE: 18,
+    AuditLog.Action.STATUS_CHANGE: 12,
+    AuditLog.Action.VIEW: 8,
+    AuditLog.Action.APPROVE: 4,
+    AuditLog.Action.EXPORT: 2,
+    AuditLog.Action.DELETE: 1,
+}
+
+CITIES = [
+    ('Pune', 'Maharashtra'), ('Mumbai', 'Maharashtra'), ('Ahmedabad', 'Gujarat'),
+    ('Surat', 'Gujarat'), ('Chennai', 'Tamil Nadu'), ('Coimbatore', 'Tamil Nadu'),
+    ('Bengaluru', 'Karnataka'), ('Hyderabad', 'Telangana'), ('Faridabad', 'Haryana'),
+    ('Ludhiana', 'Punjab'), ('Nashik', 'Maharashtra'), ('Rajkot', 'Gujarat'),
+]
+
+PROJECT_WORDS = [
+    'Frame', 'Enclosure', 'Bracket', 'Chassis', 'Panel', 'Housing', 'Conveyor',
+    'Rack', 'Guard', 'Base Plate', 'Cabinet', 'Trolley', 'Duct', 'Hopper',
+]
+
+CHECK_PARAMETERS = [
+    'Overall length', 'Overall width', 'Hole position', 'Flatness', 'Weld quality',
+    'Coating thickness', 'Surface finish', 'Bend angle', 'Thread gauge', 'Squareness',
+]
+
+
+@contextlib.contextmanager
+def manual_timestamps(*models):
+    """
+    Let bulk_create store the created_at/updated_at values we generate.
+    auto_now/auto_now_add would otherwise stamp every row with the current time.
+    """
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def percentage(part, whole):
+    if whole <= 0:
+        return Decimal('0.00')
+    return Decimal(part / whole * 100).quantize(Decimal('0.01'))
+
+
+class WeightedChoice:
+    """O(log n) sampling from a fixed weighted population."""
+
+    def __init__(self, population, weights):
+        self.population = list(population)
+        self.cum_weights = list(accumulate(weights))
+        self.total = self.cum_weights[-1]
+
+    def __call__(self, rng):
+        return self.population[bisect(self.cum_weights, rng.random() * self.total)]
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate a large synthetic data set on top of the seed master data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=10000, help='Orders to create')
+        parser.add_argument(
+            '--records-per-order', type=int, default=20,
+            help='Average child records per order (fabrication logs, production '
+                 'records, checklist items, material transactions, status history)'
+        )
+        parser.add_argument(
+            '--audit-rows', type=int, default=None,
+            help='Audit log rows to create (default: 2 per order record)'
+        )
+        parser.add_argument('--customers', type=int, default=None, help='Customers to top up to (default: orders / 200)')
+        parser.add_argument('--materials', type=int, default=200, help='Materials to top up to')
+        parser.add_argument('--users', type=int, default=40, help='Synthetic shop-floor users to top up to')
+        parser.add_argument('--days', type=int, default=730, help='Spread orders over this many past days')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Orders per bulk insert transaction')
+        parser.add_argument('--skip-seed', action='store_true', help='Do not run seed_data/seed.py master data')
+
+    def handle(self, *args, **options):
+        if options['orders'] < 0 or options['records_per_order'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--orders and --records-per-order must be >= 0 and --batch-size >= 1.')
+
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.verbosity = options['verbosity']
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        self.records_per_order = options['records_per_order']
+        audit_rows = options['audit_rows']
+        if audit_rows is None:
+            audit_rows = options['orders'] * max(self.records_per_order, 1) * 2
+
+        started = time.monotonic()
+        if not options['skip_seed']:
+            self.run_seed()
+        self.load_masters()
+        self.ensure_users(options['users'])
+        self.ensure_customers(options['customers'] if options['customers'] is not None else max(10, options['orders'] // 200))
+        self.ensure_materials(options['materials'])
+        self.prepare_samplers()
+
+        self.audit_target = audit_rows
+        self.audit_written = 0
+        self.audit_made = 0
+        self.audit_rate = audit_rows / options['orders'] if options['orders'] else 0
+        self.counts = {}
+
+        if options['orders']:
+            self.generate_orders(options['orders'])
+        if self.audit_written < self.audit_target:
+            self.generate_remaining_audit()
+
+        # bulk_create bypasses the signal handlers that maintain metric gauges,
+        # customer order counters, order progress and the search index
+        call_command('sync_metrics', stdout=io.StringIO())
+        call_command('reconcile_customer_counters', stdout=io.StringIO())
+        call_command('refresh_order_progress', stdout=io.StringIO())
+        call_command('rebuild_search_index', stdout=io.StringIO())
+
+        elapsed = time.monotonic() - started
+        summary = ', '.join(f'{name}={count}' for name, count in sorted(self.counts.items()))
+        if self.verbosity:
+            self.stdout.write(self.style.SUCCESS(f'Generated {summary or "nothing"} in {elapsed:.1f}s'))
+
+    # -- master data -----------------------------------------------------
+
+    def run_seed(self):
+        from seed_data import seed
+
+        with contextlib.redirect_stdout(self.stdout if self.verbosity > 1 else io.StringIO()):
+            seed.create_users()
+            seed.create_material_types()
+            seed.create_materials()
+            seed.create_fabrication_processes()
+            seed.create_treatment_types()
+            seed.create_inspection_types()
+            seed.create_packing_standards()
+            seed.create_role_permissions()
+
+    def load_masters(self):
+        self.admin = User.objects.filter(is_superuser=True).order_by('date_joined').first()
+        self.processes = list(FabricationProcess.objects.filter(is_active=True).order_by('sequence_order'))
+        self.inspection_types = list(InspectionType.objects.filter(is_active=True).order_by('code'))
+        self.treatment_types = list(TreatmentType.objects.filter(is_active=True).order_by('code'))
+        self.packing_standards = list(PackingStandard.objects.order_by('code'))
+        self.material_types = list(MaterialType.objects.order_by('name'))
+        if not (self.admin and self.processes and self.inspection_types and self.treatment_types
+                and self.packing_standards and self.material_types):
+            raise CommandError('Master data is missing; run without --skip-seed first.')
+        self.pdi_type = next(
+            (t for t in self.inspection_types if t.stage == InspectionType.Stage.PDI), None
+        )
+
+    def ensure_users(self, count):
+        existing = User.objects.filter(email__endswith='@synthetic.example.com').count()
+        unusable = make_password(None)
+        roles = [User.Role.PRODUCTION] * 5 + [User.Role.QUALITY] * 2 + [User.Role.SALES, User.Role.LOGISTICS]
+        users = [
+            User(
+                email=f'operator{index:04d}@synthetic.example.com',
+                password=unusable,
+                first_name=f'Operator{index:04d}',
+                last_name='Synthetic',
+                role=roles[index % len(roles)],
+                employee_id=f'SYN-{index:05d}',
+            )
+            for index in range(existing, count)
+        ]
+        User.objects.bulk_create(users, batch_size=1000)
+        self.users = list(User.objects.filter(is_active=True).order_by('email'))
+        self.users_by_role = {}
+        for user in self.users:
+            self.users_by_role.setdefault(user.role, []).append(user)
+
+    def ensure_customers(self, count):
+        existing = Customer.objects.filter(email__endswith='@synthetic.example.com').count()
+        rng = random.Random(self.options['seed'] + existing)
+        customers = []
+        for index in range(existing, count):
+            city, state = rng.choice(CITIES)
+            created = self.now - timedelta(days=self.options['days'] + rng.randint(0, 365))
+            customers.append(Customer(
+                id=self.make_uuid(rng),
+                name=f'Buyer {index:06d}',
+                company_name=f'Synthetic Industries {index:06d}',
+                customer_type=rng.choices(
+                    [Customer.CustomerType.REGULAR, Customer.CustomerType.PREMIUM, Customer.CustomerType.VIP],
+                    weights=[80, 15, 5]
+                )[0],
+                email=f'buyer{index:06d}@synthetic.example.com',
+                phone=f'+91-9{rng.randint(100000000, 999999999)}',
+                address=f'{rng.randint(1, 999)}, Industrial Area',
+                city=city,
+                state=state,
+                postal_code=str(rng.randint(110001, 799999)),
+                created_by=self.admin,
+                created_at=created,
+                updated_at=created,
+            ))
+        with manual_timestamps(Customer):
+            Customer.objects.bulk_create(customers, batch_size=self.batch_size)
+        self.customers = list(Customer.objects.filter(is_active=True).order_by('created_at', 'id'))
+
+    def ensure_materials(self, count):
+        existing = Material.objects.filter(code__startswith='SYN-').count()
+        rng = random.Random(self.options['seed'] * 7 + existing)
+        materials = []
+        for index in range(existing, count):
+            minimum = Decimal(rng.randint(10, 500))
+            # Roughly one material in ten sits below its reorder level
+            cover = rng.uniform(0.3, 1.0) if rng.random() < 0.1 else rng.uniform(1.2, 20)
+            stock = minimum * Decimal(str(round(cover, 3)))
+            materials.append(Material(
+                id=self.make_uuid(rng),
+                material_type=rng.choice(self.material_types),
+                code=f'SYN-{index:05d}',
+                name=f'Synthetic Material {index:05d}',
+                grade=rng.choice(['IS 2062', 'SS 304', 'SS 316', 'AL 6061', 'EN8']),
+                thickness=Decimal(rng.choice(['1.0', '1.5', '2.0', '3.0', '5.0', '8.0'])),
+                unit=rng.choice([Material.Unit.KG, Material.Unit.SHEET, Material.Unit.PIECE, Material.Unit.METER]),
+                unit_price=Decimal(rng.randint(20, 2500)),
+                stock_quantity=stock.quantize(Decimal('0.001')),
+                minimum_stock=minimum,
+            ))
+        Material.objects.bulk_create(materials, batch_size=self.batch_size)
+        self.materials = list(Material.objects.filter(is_active=True).order_by('code'))
+
+    def prepare_samplers(self):
+        # Zipf-like customer popularity: the first customers get most orders
+        self.pick_customer = WeightedChoice(
+            self.customers, [1 / (rank + 1) ** 1.1 for rank in range(len(self.customers))]
+        )
+        self.pick_material = WeightedChoice(
+            self.materials, [1 / (rank + 1) ** 0.8 for rank in range(len(self.materials))]
+        )
+        self.pick_closed_status = WeightedChoice(CLOSED_STATUS_WEIGHTS, CLOSED_STATUS_WEIGHTS.values())
+        self.pick_open_status = WeightedChoice(OPEN_STATUS_WEIGHTS, OPEN_STATUS_WEIGHTS.values())
+        self.pick_audit_action = WeightedChoice(AUDIT_ACTION_WEIGHTS, AUDIT_ACTION_WEIGHTS.values())
+        self.operators = self.users_by_role.get(User.Role.PRODUCTION) or self.users
+        self.inspectors = self.users_by_role.get(User.Role.QUALITY) or self.users
+        self.content_types = {
+            model: ContentType.objects.get_for_model(model)
+            for model in (Order, OrderFabrication, ProductionRecord, OrderInspection, OrderMaterial, OrderDispatch)
+        }
+
+    # -- orders ----------------------------------------------------------
+
+    def generate_orders(self, total):
+        start = Order.objects.filter(quote_number__startswith='SYN-').count()
+        rng = self.rng
+        created = 0
+        while created < total:
+            size = min(self.batch_size, total - created)
+            batch = OrderBatch()
+            for offset in range(size):
+                self.build_order(batch, start + created + offset, rng)
+            self.write_batch(batch)
+            created += size
+            if self.verbosity > 1 or (self.verbosity and created % (self.batch_size * 10) == 0):
+                self.stdout.write(f'  {created}/{total} orders, {self.audit_written} audit rows')
+        self.last_batch_orders = batch.orders
+
+    def order_size(self, rng):
+        """Long-tailed number of child records for one order, averaging --records-per-order."""
+        if not self.records_per_order:
+            return 0
+        # Pareto(1.5) has mean 3; cap the tail at 25x the average
+        return min(int(rng.paretovariate(1.5) * self.records_per_order / 3), self.records_per_order * 25)
+
+    def build_order(self, batch, index, rng):
+        days = self.options['days']
+        # Squaring biases order dates towards the recent end of the range
+        age_days = int(days * rng.random() ** 2)
+        created_at = self.now - timedelta(days=age_days, seconds=rng.randint(0, 86399))
+        recent = age_days < days * RECENT_FRACTION
+        status = (self.pick_open_status if recent else self.pick_closed_status)(rng)
+        quantity = max(1, int(rng.lognormvariate(3.5, 1.1)))
+        unit_price = Decimal(rng.randint(50, 20000))
+        lead_time = rng.choice([15, 21, 30, 45, 60, 90])
+        expected = created_at.date() + timedelta(days=lead_time)
+        delivered = None
+        if status == Order.Status.COMPLETED:
+            # Most orders ship on time, a fifth slip by up to three weeks
+            slip = rng.randint(1, 21) if rng.random() < 0.2 else -rng.randint(0, 5)
+            delivered = min(expected + timedelta(days=slip), self.now.date())
+        path_end = STATUS_PATH.index(status) + 1 if status in STATUS_PATH else rng.randint(2, 4)
+        progress = {
+            Order.Status.DRAFT: 0, Order.Status.QUOTED: 5, Order.Status.CONFIRMED: 10,
+            Order.Status.IN_PRODUCTION: rng.randint(15, 70), Order.Status.QUALITY_CHECK: 80,
+            Order.Status.READY_FOR_DISPATCH: 90, Order.Status.DISPATCHED: 95, Order.Status.COMPLETED: 100,
+        }.get(status, rng.randint(0, 60))
+
+        order = Order(
+            id=self.make_uuid(rng),
+            quote_number=f'SYN-Q-{index:08d}',
+            po_number=f'SYN-PO-{index:08d}' if path_end > 2 else None,
+            work_order_number=f'SYN-WO-{index:08d}' if path_end > 3 else None,
+            invoice_number=f'SYN-INV-{index:08d}' if delivered else None,
+            customer=self.pick_customer(rng),
+            project_name=f'{rng.choice(PROJECT_WORDS)} {rng.choice(PROJECT_WORDS)} {index % 997}',
+            ordered_quantity=quantity,
+            order_date=created_at.date(),
+            planned_lead_time=lead_time,
+            actual_lead_time=(delivered - created_at.date()).days if delivered else None,
+            expected_delivery_date=expected,
+            actual_delivery_date=delivered,
+            status=status,
+            status_percentage=progress,
+            priority=rng.choices(
+                [Order.Priority.LOW, Order.Priority.NORMAL, Order.Priority.HIGH, Order.Priority.URGENT],
+                weights=[15, 60, 20, 5]
+            )[0],
+            unit_price=unit_price,
+            total_amount=unit_price * quantity,
+            created_by=self.admin,
+            assigned_to=rng.choice(self.users),
+            created_at=created_at,
+            updated_at=created_at + timedelta(days=min(age_days, lead_time)),
+        )
+        batch.orders.append(order)
+
+        size = self.order_size(rng)
+        quota = {name: int(round(size * share)) for name, share in RECORD_MIX.items()}
+        children = {Order: [order]}
+
+        self.build_status_history(batch, order, path_end, quota['status_history'], rng)
+        if status in PRODUCTION_STATUSES or status == Order.Status.ON_HOLD:
+            children[OrderFabrication] = self.build_fabrication(batch, order, quota['fabrication_logs'], rng)
+            children[ProductionRecord] = self.build_production(batch, order, quota['production_records'], rng)
+            children[OrderMaterial] = self.build_materials(batch, order, quota['material_transactions'], rng)
+            self.build_surface_treatment(batch, order, rng)
+        if status in PRODUCTION_STATUSES[1:]:
+            children[OrderInspection] = self.build_inspections(batch, order, quota['checklist_items'], rng)
+        if status in DISPATCH_STATUSES:
+            children[OrderDispatch] = [self.build_dispatch(batch, order, rng)]
+
+        self.build_audit(batch, children, size, rng)
+
+    def build_status_history(self, batch, order, path_end, count, rng):
+        path = STATUS_PATH[:path_end]
+        if order.status not in path:
+            path.append(order.status)
+        # Pad with on-hold round trips when the quota exceeds the plain path
+        while len(path) < count:
+            position = rng.randint(1, len(path) - 1) if len(path) > 1 else 1
+            path[position:position] = [Order.Status.ON_HOLD, path[position - 1]]
+        step = max((order.updated_at - order.created_at) / max(len(path), 1), timedelta(minutes=5))
+        previous = None
+        for position, status in enumerate(path):
+            batch.status_history.append(OrderStatusHistory(
+                id=self.make_uuid(rng),
+                order=order,
+                previous_status=previous,
+                new_status=status,
+                changed_by=order.assigned_to if previous else order.created_by,
+                created_at=order.created_at + step * position,
+            ))
+            previous = status
+
+    def build_fabrication(self, batch, order, log_count, rng):
+        count = rng.randint(min(2, len(self.processes)), len(self.processes))
+        processes = sorted(rng.sample(self.processes, count), key=lambda process: process.sequence_order)
+        finished = order.status in PRODUCTION_STATUSES[1:]
+        fabrications = []
+        for position, process in enumerate(processes):
+            if finished or position < len(processes) * order.status_percentage / 100:
+                status = OrderFabrication.Status.COMPLETED
+            elif position == 0 or fabrications[-1].status == OrderFabrication.Status.COMPLETED:
+                status = OrderFabrication.Status.IN_PROGRESS
+            else:
+                status = OrderFabrication.Status.PENDING
+            start = order.order_date + timedelta(days=2 + position * 2)
+            completed = order.ordered_quantity if status == OrderFabrication.Status.COMPLETED else (
+                rng.randint(0, order.ordered_quantity) if status == OrderFabrication.Status.IN_PROGRESS else 0
+            )
+            fabrication = OrderFabrication(
+                id=self.make_uuid(rng),
+                order=order,
+                process=process,
+                status=status,
+                planned_quantity=order.ordered_quantity,
+                completed_quantity=completed,
+                planned_start_date=start,
+                planned_end_date=start + timedelta(days=2),
+                actual_start_date=start if status != OrderFabrication.Status.PENDING else None,
+                actual_end_date=start + timedelta(days=rng.randint(1, 5)) if status == OrderFabrication.Status.COMPLETED else None,
+                machine=f'M-{rng.randint(1, 40):02d}',
+                operator=rng.choice(self.operators),
+                created_by=self.admin,
+                created_at=order.created_at,
+                updated_at=order.updated_at,
+            )
+            fabrications.append(fabrication)
+        batch.fabrications.extend(fabrications)
+
+        # Logs cluster on the first processes, which run longest
+        picker = WeightedChoice(fabrications, [1 / (rank + 1) for rank in range(len(fabrications))])
+        for _ in range(log_count):
+            fabrication = picker(rng)
+            batch.fabrication_logs.append(FabricationLog(
+                id=self.make_uuid(rng),
+                order_fabrication=fabrication,
+                previous_status=OrderFabrication.Status.IN_PROGRESS,
+                new_status=rng.choice([OrderFabrication.Status.IN_PROGRESS, fabrication.status]),
+                quantity_completed=rng.randint(0, max(fabrication.completed_quantity, 1)),
+                notes=rng.choice([None, 'Shift update', 'Material shortage cleared', 'Rework completed']),
+                logged_by=fabrication.operator,
+                created_at=order.created_at + timedelta(hours=rng.randint(1, 24 * 60)),
+            ))
+        return fabrications
+
+    def build_production(self, batch, order, count, rng):
+        shifts = ['day', 'night', 'general']
+        records = []
+        remaining = order.ordered_quantity
+        for position in range(count):
+            planned = max(1, order.ordered_quantity // max(count, 1))
+            # Once the ordered quantity is covered, later shifts only produce top-ups
+            produced = min(remaining, planned) if remaining > 0 else rng.randint(0, planned)
+            remaining = max(remaining - produced, 0)
+            rework = int(produced * rng.uniform(0, 0.06))
+            rejected = int(produced * rng.uniform(0, 0.03))
+            record = ProductionRecord(
+                id=self.make_uuid(rng),
+                order=order,
+                production_date=order.order_date + timedelta(days=3 + position // len(shifts)),
+                shift=shifts[position % len(shifts)],
+                planned_quantity=planned,
+                ok_quantity=produced - rework - rejected,
+                rework_quantity=rework,
+                rejection_quantity=rejected,
+                rejection_reasons='Dimensional deviation' if rejected else None,
+                recorded_by=rng.choice(self.operators),
+                created_at=order.created_at + timedelta(days=3 + position // len(shifts)),
+                updated_at=order.updated_at,
+            )
+            record.calculate_quantities()
+            records.append(record)
+        batch.production_records.extend(records)
+
+        if records:
+            totals = {
+                'planned': sum(r.planned_quantity for r in records),
+                'produced': sum(r.produced_quantity for r in records),
+                'ok': sum(r.ok_quantity for r in records),
+                'rework': sum(r.rework_quantity for r in records),
+                'rejection': sum(r.rejection_quantity for r in records),
+            }
+            batch.production_summaries.append(ProductionSummary(
+                id=self.make_uuid(rng),
+                order=order,
+                total_planned=totals['planned'],
+                total_produced=totals['produced'],
+                total_ok=totals['ok'],
+                total_rework=totals['rework'],
+                total_rejection=totals['rejection'],
+                overall_ok_percentage=percentage(totals['ok'], totals['produced']),
+                overall_rework_percentage=percentage(totals['rework'], totals['produced']),
+                overall_rejection_percentage=percentage(totals['rejection'], totals['produced']),
+                overall_yield_percentage=percentage(totals['ok'] + totals['rework'], totals['produced']),
+                completion_percentage=min(percentage(totals['ok'], order.ordered_quantity), Decimal('100.00')),
+                last_updated=order.updated_at,
+            ))
+        return records
+
+    def build_materials(self, batch, order, transaction_count, rng):
+        order_materials = []
+        for material in {self.pick_material(rng) for _ in range(rng.randint(1, 4))}:
+            required = Decimal(str(round(order.ordered_quantity * rng.uniform(0.2, 3.0), 3))) or Decimal('1.000')
+            issued = required
+            if order.status == Order.Status.IN_PRODUCTION:
+                issued = (required * Decimal(str(round(rng.random(), 2)))).quantize(Decimal('0.001'))
+            order_materials.append(OrderMaterial(
+                id=self.make_uuid(rng),
+                order=order,
+                material=material,
+                required_quantity=required,
+                issued_quantity=issued,
+                consumed_quantity=(issued * Decimal('0.95')).quantize(Decimal('0.001')),
+                status=OrderMaterial.Status.FULLY_ISSUED if issued >= required else OrderMaterial.Status.PARTIALLY_ISSUED,
+                created_by=self.admin,
+                issued_by=rng.choice(self.operators),
+                issued_at=order.created_at + timedelta(days=2),
+                created_at=order.created_at,
+                updated_at=order.updated_at,
+            ))
+        batch.order_materials.extend(order_materials)
+
+        for position in range(transaction_count):
+            order_material = order_materials[position % len(order_materials)]
+            transaction_type = rng.choices(
+                [MaterialTransaction.TransactionType.ISSUE, MaterialTransaction.TransactionType.RETURN,
+                 MaterialTransaction.TransactionType.SCRAP, MaterialTransaction.TransactionType.ADJUSTMENT],
+                weights=[80, 10, 7, 3]
+            )[0]
+            quantity = Decimal(str(round(rng.uniform(0.5, 50), 3)))
+            stock_before = order_material.material.stock_quantity + quantity * (transaction_count - position)
+            batch.material_transactions.append(MaterialTransaction(
+                id=self.make_uuid(rng),
+                material=order_material.material,
+                order=order,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                stock_before=stock_before,
+                stock_after=stock_before - quantity,
+                reference_number=order.work_order_number,
+                created_by=order_material.issued_by,
+                created_at=order.created_at + timedelta(days=2, hours=position),
+            ))
+        return order_materials
+
+    def build_surface_treatment(self, batch, order, rng):
+        for treatment_type in rng.sample(self.treatment_types, rng.randint(0, min(2, len(self.treatment_types)))):
+            done = order.status in PRODUCTION_STATUSES[1:]
+            batch.surface_treatments.append(OrderSurfaceTreatment(
+                id=self.make_uuid(rng),
+                order=order,
+                treatment_type=treatment_type,
+                status=OrderSurfaceTreatment.Status.COMPLETED if done else OrderSurfaceTreatment.Status.PENDING,
+                planned_quantity=order.ordered_quantity,
+                completed_quantity=order.ordered_quantity if done else 0,
+                color=rng.choice(['RAL 7035', 'RAL 9005', 'RAL 5015', None]),
+                is_outsourced=rng.random() < 0.3,
+                created_by=self.admin,
+                created_at=order.created_at,
+                updated_at=order.updated_at,
+            ))
+
+    def build_inspections(self, batch, order, item_count, rng):
+        inspections = []
+        approved = order.status in DISPATCH_STATUSES
+        types = rng.sample(self.inspection_types, rng.randint(1, len(self.inspection_types)))
+        if approved and self.pdi_type and self.pdi_type not in types:
+            types.append(self.pdi_type)
+        for inspection_type in types:
+            failed = int(order.ordered_quantity * rng.uniform(0, 0.05))
+            result = OrderInspection.Result.PASS if approved or rng.random() < 0.85 else rng.choice(
+                [OrderInspection.Result.FAIL, OrderInspection.Result.REWORK, OrderInspection.Result.CONDITIONAL]
+            )
+            inspected_at = order.created_at + timedelta(days=rng.randint(5, 40))
+            inspector = rng.choice(self.inspectors)
+            inspections.append(OrderInspection(
+                id=self.make_uuid(rng),
+                order=order,
+                inspection_type=inspection_type,
+                inspected_quantity=order.ordered_quantity,
+                passed_quantity=order.ordered_quantity - failed,
+                failed_quantity=failed,
+                result=result,
+                inspection_date=inspected_at.date(),
+                inspected_at=inspected_at,
+                is_qa_approved=approved or (result == OrderInspection.Result.PASS and rng.random() < 0.7),
+                qa_approved_by=inspector if approved else None,
+                qa_approved_at=inspected_at if approved else None,
+                inspected_by=inspector,
+                created_at=inspected_at,
+                updated_at=inspected_at,
+            ))
+        batch.inspections.extend(inspections)
+
+        for position in range(item_count):
+            inspection = inspections[position % len(inspections)]
+            batch.checklist_items.append(InspectionChecklist(
+                id=self.make_uuid(rng),
+                inspection=inspection,
+                parameter=CHECK_PARAMETERS[position % len(CHECK_PARAMETERS)],
+                specification='As per drawing',
+                actual_value=f'{rng.uniform(0, 500):.2f}',
+                is_passed=inspection.result == OrderInspection.Result.PASS or rng.random() < 0.8,
+                created_at=inspection.created_at,
+            ))
+        return inspections
+
+    def build_dispatch(self, batch, order, rng):
+        shipped = order.status in (Order.Status.DISPATCHED, Order.Status.COMPLETED)
+        dispatched_at = order.created_at + timedelta(days=order.planned_lead_time - rng.randint(0, 5))
+        dispatch = OrderDispatch(
+            id=self.make_uuid(rng),
+            order=order,
+            packing_standard=rng.choice(self.packing_standards),
+            total_packages=rng.randint(1, 40),
+            gross_weight=Decimal(rng.randint(10, 5000)),
+            status=(OrderDispatch.DispatchStatus.DELIVERED if order.status == Order.Status.COMPLETED
+                    else OrderDispatch.DispatchStatus.IN_TRANSIT if shipped
+                    else OrderDispatch.DispatchStatus.PACKED),
+            transport_mode=rng.choices(
+                [OrderDispatch.TransportMode.ROAD, OrderDispatch.TransportMode.COURIER, OrderDispatch.TransportMode.SEA],
+                weights=[85, 10, 5]
+            )[0],
+            transporter_name=rng.choice(['VRL Logistics', 'Gati', 'TCI Freight', 'Blue Dart']) if shipped else None,
+            vehicle_number=f'MH12{rng.randint(1000, 9999)}' if shipped else None,
+            planned_dispatch_date=order.expected_delivery_date - timedelta(days=2),
+            actual_dispatch_date=dispatched_at.date() if shipped else None,
+            dispatched_at=dispatched_at if shipped else None,
+            actual_delivery_date=order.actual_delivery_date,
+            dispatched_by=rng.choice(self.users_by_role.get(User.Role.LOGISTICS) or self.users) if shipped else None,
+            created_by=self.admin,
+            created_at=dispatched_at - timedelta(days=2),
+            updated_at=order.updated_at,
+        )
+        batch.dispatches.append(dispatch)
+        return dispatch
+
+    # -- audit -----------------------------------------------------------
+
+    def build_audit(self, batch, children, size, rng):
+        if self.audit_written + len(batch.audit_logs) >= self.audit_target:
+            return
+        # Busy orders attract proportionally more audit activity
+        weight = size / self.records_per_order if self.records_per_order else 1
+        count = int(self.audit_rate * weight + rng.random())
+        count = min(count, self.audit_target - self.audit_written - len(batch.audit_logs))
+        models = [model for model, objects in children.items() if objects]
+        # Orders get half of the activity; the rest spreads over child records
+        pick_model = WeightedChoice(models, [len(models) if model is Order else 1 for model in models])
+        order = children[Order][0]
+        for _ in range(count):
+            model = pick_model(rng)
+            instance = rng.choice(children[model])
+            batch.audit_logs.append(self.make_audit_log(instance, model, order, rng))
+
+    def make_audit_log(self, instance, model, order, rng):
+        action = self.pick_audit_action(rng)
+        user = rng.choice(self.users)
+        changes = None
+        if action == AuditLog.Action.STATUS_CHANGE and hasattr(instance, 'status'):
+            changes = {'status': {'old': rng.choice(STATUS_PATH[:3]), 'new': str(instance.status)}}
+        elif action == AuditLog.Action.UPDATE:
+            field = rng.choice(['remarks', 'priority', 'expected_delivery_date', 'status_percentage', 'assigned_to'])
+            changes = {field: {'old': str(rng.randint(0, 100)), 'new': str(rng.randint(0, 100))}}
+        # Audit rows are chained in date order, so their dates follow a clock
+        # over the date range (biased to the recent end, like order dates)
+        position = self.audit_made / max(self.audit_target, 1)
+        self.audit_made += 1
+        created_at = self.now - timedelta(days=self.options['days'] * (1 - position) ** 2)
+        return AuditLog(
+            id=self.make_uuid(rng),
+            user=user,
+            user_email=user.email,
+            action=action,
+            content_type=self.content_types[model],
+            object_id=str(instance.pk),
+            model_name=model._meta.model_name,
+            object_repr=(f'{order.quote_number} - {order.project_name}' if model is Order
+                         else f'{order.quote_number} - {model._meta.verbose_name}')[:255],
+            changes=changes,
+            ip_address=f'10.{rng.randint(0, 20)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+            user_agent='Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0',
+            created_at=created_at,
+        )
+
+    def generate_remaining_audit(self):
+        """Top up audit rows against existing orders when the per-order share fell short."""
+        orders = getattr(self, 'last_batch_orders', None) or list(
+            Order.objects.only('id', 'quote_number', 'project_name', 'created_at', 'planned_lead_time')
+            .order_by('-created_at')[:100000]
+        )
+        if not orders:
+            self.stderr.write('No orders available for audit rows; skipping.')
+            return
+        rng = self.rng
+        while self.audit_written < self.audit_target:
+            size = min(self.batch_size * 10, self.audit_target - self.audit_written)
+            batch = OrderBatch()
+            for _ in range(size):
+                order = rng.choice(orders)
+                batch.audit_logs.append(self.make_audit_log(order, Order, order, rng))
+            self.write_batch(batch)
+
+    # -- helpers ---------------------------------------------------------
+
+    @staticmethod
+    def make_uuid(rng):
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    def write_batch(self, batch):
+        with transaction.atomic(), manual_timestamps(*batch.models()):
+            for model, objects, key in batch.tables():
+                if objects:
+                    model.objects.bulk_create(objects, batch_size=1000)
+                    self.counts[key] = self.counts.get(key, 0) + len(objects)
+            # Through the writer, so the rows are hash chained like live ones
+            writer.flush(batch.audit_logs, backdated=True)
+        self.counts['audit_logs'] = self.counts.get('audit_logs', 0) + len(batch.audit_logs)
+        self.audit_written += len(batch.audit_logs)
+
+
+class OrderBatch:
+    """Objects accumulated for one bulk insert transaction, in foreign key order."""
+
+    TABLES = [
+        (Order, 'orders'),
+        (OrderStatusHistory, 'status_history'),
+        (OrderFabrication, 'fabrications'),
+        (FabricationLog, 'fabrication_logs'),
+        (ProductionRecord, 'production_records'),
+        (ProductionSummary, 'production_summaries'),
+        (OrderMaterial, 'order_materials'),
+        (MaterialTransaction, 'material_transactions'),
+        (OrderSurfaceTreatment, 'surface_treatments'),
+        (OrderInspection, 'inspections'),
+        (InspectionChecklist, 'checklist_items'),
+        (OrderDispatch, 'dispatches'),
+    ]
+
+    def __init__(self):
+        for _model, key in self.TABLES:
+            setattr(self, key, [])
+        self.audit_logs = []
+
+    def models(self):
+        return [model for model, _key in self.TABLES]
+
+    def tables(self):
+        for model, key in self.TABLES:
+            yield model, getattr(self, key), key
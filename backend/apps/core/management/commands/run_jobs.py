@@ -0,0 +1,86 @@
+"""
+Run background jobs from the database queue (apps.core.jobs).
+
+Start one or more workers next to the web processes; each claims due jobs,
+highest priority first, and runs them one at a time. SIGTERM/SIGINT stop the
+worker after the job in hand. While idle, a worker deletes jobs that finished
+more than ``--prune-days`` days ago, at most once an hour.
+
+Examples:
+    python manage.py run_jobs
+    python manage.py run_jobs --once          # drain due jobs, then exit
+    python manage.py run_jobs --batch 20 --sleep 2
+    python manage.py run_jobs --once --prune-days 7
+"""
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import F
+
+from apps.core import events, jobs
+from apps.core.models import Job
+
+# Seconds between sweeps of finished jobs
+PRUNE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when no job is due instead of waiting')
+        parser.add_argument('--batch', type=int, default=10, help='Jobs to claim per round trip')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument(
+            '--prune-days', type=int, default=None,
+            help='Delete jobs finished more than this many days ago (default JOBS_RETENTION_DAYS, 0 keeps them)'
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        # Deliver the change events that jobs publish, as web processes do
+        events.dispatcher.enable()
+        prune_days = options['prune_days']
+        if prune_days is None:
+            prune_days = getattr(settings, 'JOBS_RETENTION_DAYS', 14)
+        last_prune = None
+
+        worker = jobs.worker_id()
+        self.stdout.write(f'Job worker {worker} started ({len(jobs.registry)} job types registered).')
+        done = 0
+        while not self.stopping:
+            close_old_connections()
+            claimed = jobs.claim(worker, options['batch'])
+            if not claimed:
+                if prune_days > 0 and (last_prune is None or time.monotonic() - last_prune >= PRUNE_INTERVAL):
+                    pruned = jobs.prune(prune_days)
+                    last_prune = time.monotonic()
+                    if pruned:
+                        self.stdout.write(f'Pruned {pruned} finished jobs.')
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            for index, queued in enumerate(claimed):
+                if self.stopping:
+                    # Hand back what we claimed but did not start
+                    Job.objects.filter(pk__in=[item.pk for item in claimed[index:]]).update(
+                        status=Job.Status.QUEUED, locked_by='', locked_at=None, attempts=F('attempts') - 1
+                    )
+                    break
+                result = jobs.run_job(queued, worker)
+                done += 1
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{result} attempt {result.attempts}')
+
+        self.stdout.write(self.style.SUCCESS(f'Job worker {worker} stopped after {done} jobs.'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,48 @@
+"""
+Recompute business gauges from the domain tables.
+
+Run once after deploying the metrics tables, and periodically if you want
+to correct drift from writes that bypass model signals (bulk updates).
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from apps.core import metrics
+from apps.crm.models import Order
+from apps.fabrication.models import OrderFabrication
+from apps.inspection.models import OrderInspection
+from apps.materials.models import Material
+
+
+class Command(BaseCommand):
+    help = 'Recompute business metric gauges from the database.'
+
+    def handle(self, *args, **options):
+        status_counts = dict(
+            Order.objects.values_list('status').annotate(count=Count('id')).order_by()
+        )
+        for status, _label in Order.Status.choices:
+            metrics.set_value('erp_orders', status_counts.get(status, 0), status=status)
+
+        metrics.set_value(
+            'erp_open_fabrications',
+            OrderFabrication.objects.exclude(
+                status__in=[OrderFabrication.Status.COMPLETED, OrderFabrication.Status.SKIPPED]
+            ).count()
+        )
+        metrics.set_value(
+            'erp_pending_qa_approvals',
+            OrderInspection.objects.filter(
+                is_qa_approved=False,
+                result__in=[OrderInspection.Result.PASS, OrderInspection.Result.CONDITIONAL]
+            ).count()
+        )
+        metrics.set_value(
+            'erp_low_stock_materials',
+            Material.objects.filter(
+                is_active=True, stock_quantity__lte=F('minimum_stock')
+            ).count()
+        )
+
+        self.stdout.write(self.style.SUCCESS('Business metric gauges synchronised.'))
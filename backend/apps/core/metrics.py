@@ -0,0 +1,234 @@
+"""
+Business and runtime metrics with Prometheus text exposition.
+
+Counters and gauges are stored in ``MetricValue`` rows that write paths
+update incrementally, so scraping never runs aggregate queries over the
+domain tables. Request histograms come from the in-process instrumentation
+registry and therefore describe the worker that served the scrape.
+
+Increments are not written in the writer's transaction: once it commits
+they are added to a per-process buffer, which is written out at most every
+``METRICS_FLUSH_INTERVAL`` seconds, before a scrape and at exit. Concurrent
+writers therefore never wait on a shared ``MetricValue`` row, and a rolled
+back write is not counted. A process that dies loses its unflushed
+increments; ``sync_metrics`` corrects the gauges.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .backends.pool import pools
+from .instrumentation import request_metrics
+
+logger = logging.getLogger(__name__)
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+
+# name -> (type, help text)
+METRICS = {
+    'erp_orders': (GAUGE, 'Orders by status.'),
+    'erp_order_status_changes_total': (COUNTER, 'Order status transitions by new status.'),
+    'erp_open_fabrications': (GAUGE, 'Order fabrications not completed or skipped.'),
+    'erp_pending_qa_approvals': (GAUGE, 'Passed or conditional inspections awaiting QA approval.'),
+    'erp_low_stock_materials': (GAUGE, 'Active materials at or below minimum stock.'),
+    'erp_production_records_total': (COUNTER, 'Production records created.'),
+    'erp_production_quantity_total': (COUNTER, 'Quantities recorded on new production records by kind.'),
+    'erp_stock_movements_total': (COUNTER, 'Material transactions by type.'),
+    'erp_stock_movement_quantity_total': (COUNTER, 'Material quantity moved by transaction type.'),
+    'erp_audit_writes_total': (COUNTER, 'Audit log entries written by action.'),
+}
+
+PROCESS_START_TIME = time.time()
+
+
+def format_labels(labels):
+    """Render labels in canonical (sorted) Prometheus form."""
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in sorted(labels.items()))
+
+
+class IncrementBuffer:
+    """Per-process sums of committed increments, waiting to be written."""
+
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def add(self, key, amount):
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + amount
+            due = time.monotonic() - self.last_flush >= interval
+        if due:
+            self.flush()
+
+    def discard(self, key):
+        with self.lock:
+            self.pending.pop(key, None)
+
+    def flush(self):
+        """Write the buffered increments, each in its own short transaction."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        items = [(key, amount) for key, amount in pending.items() if amount]
+        for index, ((name, labels), amount) in enumerate(items):
+            try:
+                write_increment(name, labels, amount)
+            except Exception:
+                logger.exception('Writing metric increments failed')
+                # Keep what was not written for the next flush
+                for key, rest in items[index:]:
+                    with self.lock:
+                        self.pending[key] = self.pending.get(key, 0) + rest
+                return
+
+
+buffer = IncrementBuffer()
+
+
+def write_increment(name, labels, amount):
+    from .models import MetricValue
+
+    updated = MetricValue.objects.filter(name=name, labels=labels).update(value=F('value') + amount)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            MetricValue.objects.create(name=name, labels=labels, value=amount)
+    except IntegrityError:
+        # Created concurrently - fall back to the increment
+        MetricValue.objects.filter(name=name, labels=labels).update(value=F('value') + amount)
+
+
+def inc(name, amount=1, **labels):
+    """Increment a counter or gauge by ``amount`` (may be negative for gauges) once the transaction commits."""
+    if not amount:
+        return
+    key = (name, format_labels(labels))
+    transaction.on_commit(lambda: buffer.add(key, amount))
+
+
+def flush():
+    """Write this process's buffered increments now."""
+    buffer.flush()
+
+
+def dec(name, amount=1, **labels):
+    """Decrement a gauge."""
+    inc(name, -amount, **labels)
+
+
+def set_value(name, value, **labels):
+    """Set a gauge to an absolute value."""
+    from .models import MetricValue
+
+    key = format_labels(labels)
+    # The absolute value already includes what this process has buffered
+    buffer.discard((name, key))
+    MetricValue.objects.update_or_create(
+        name=name, labels=key, defaults={'value': value}
+    )
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _sample(lines, name, labels, value):
+    lines.append(f"{name}{{{labels}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}")
+
+
+def render_business_metrics(lines):
+    from .models import MetricValue
+
+    flush()
+    rows = {}
+    for name, labels, value in MetricValue.objects.values_list('name', 'labels', 'value'):
+        rows.setdefault(name, []).append((labels, value))
+
+    for name, (metric_type, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in rows.pop(name, []):
+            _sample(lines, name, labels, value)
+
+
+def render_request_metrics(lines):
+    items = request_metrics.items()
+    histograms = [
+        ('erp_http_request_duration_ms', 'duration_ms', 'Request duration in milliseconds.'),
+        ('erp_http_request_sql_ms', 'sql_ms', 'SQL time per request in milliseconds.'),
+        ('erp_http_request_queries', 'queries', 'SQL queries per request.'),
+        ('erp_http_response_bytes', 'response_bytes', 'Response body size in bytes.'),
+    ]
+    for name, attribute, help_text in histograms:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for action, stats in items:
+            histogram = getattr(stats, attribute)
+            action_label = format_labels({'action': action})
+            for bound, total in histogram.cumulative():
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                _sample(lines, f'{name}_bucket', f'{action_label},le="{le}"', total)
+            _sample(lines, f'{name}_sum', action_label, histogram.sum)
+            _sample(lines, f'{name}_count', action_label, histogram.count)
+
+    name = 'erp_http_query_budget_violations_total'
+    lines.append(f'# HELP {name} Requests that exceeded their declared query budget.')
+    lines.append(f'# TYPE {name} counter')
+    for action, stats in items:
+        if stats.budget is not None:
+            _sample(lines, name, format_labels({'action': action}), stats.budget_violations)
+
+
+def render_process_metrics(lines):
+    lines.append('# HELP process_start_time_seconds Start time of the process since unix epoch.')
+    lines.append('# TYPE process_start_time_seconds gauge')
+    _sample(lines, 'process_start_time_seconds', '', round(PROCESS_START_TIME, 3))
+
+
+def render_database_metrics(lines):
+    stats = [(pool.alias, pool.stats()) for pool in list(pools.values())]
+
+    name = 'erp_db_pool_connections'
+    lines.append(f'# HELP {name} Pooled database connections by state.')
+    lines.append(f'# TYPE {name} gauge')
+    for alias, values in stats:
+        for state in ('idle', 'in_use'):
+            _sample(lines, name, format_labels({'alias': alias, 'state': state}), values[state])
+
+    for name, key, help_text in (
+        ('erp_db_pool_opened_total', 'opened', 'Database connections opened by the pool.'),
+        ('erp_db_pool_waits_total', 'waits', 'Checkouts that waited for a free pooled connection.'),
+    ):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for alias, values in stats:
+            _sample(lines, name, format_labels({'alias': alias}), values[key])
+
+
+atexit.register(flush)
+
+
+def render_prometheus():
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    render_business_metrics(lines)
+    render_request_metrics(lines)
+    render_database_metrics(lines)
+    render_process_metrics(lines)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,111 @@
+"""
+Middleware for Core app - Request instrumentation and replica stickiness.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+from .instrumentation import (
+    QueryBudgetExceeded,
+    RequestSample,
+    count_queries,
+    current_sample,
+    request_metrics,
+    resolve_view,
+)
+from .routers import pin_to_primary, replica_configured
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Record SQL query count, SQL time, serialization time and response size
+    for every request, keyed by the resolved viewset action.
+
+    Adds a ``Server-Timing`` header and enforces declared query budgets.
+    Should be placed first in MIDDLEWARE so the whole request is measured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', True)
+        self.server_timing = getattr(settings, 'SERVER_TIMING_HEADER', False)
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        sample = RequestSample(time.perf_counter())
+        request._instrumentation = sample
+
+        token = current_sample.set(sample)
+        try:
+            with count_queries(sample):
+                response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+
+        sample.duration_ms = (time.perf_counter() - sample.started) * 1000
+        sample.status_code = response.status_code
+        if not response.streaming:
+            sample.response_bytes = len(response.content)
+        if sample.action is None:
+            sample.action = 'unresolved'
+
+        request_metrics.record(sample)
+
+        if self.server_timing:
+            response['Server-Timing'] = sample.server_timing()
+
+        if sample.over_budget:
+            message = (
+                f"{sample.action} ran {sample.query_count} queries "
+                f"(budget {sample.budget}) for {request.method} {request.path}"
+            )
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning('Query budget exceeded: %s', message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        sample = getattr(request, '_instrumentation', None)
+        if sample is not None:
+            sample.action, sample.budget = resolve_view(view_func, request.method)
+        return None
+
+    def process_template_response(self, request, response):
+        sample = getattr(request, '_instrumentation', None)
+        if sample is not None:
+            sample.render_started = time.perf_counter()
+
+            def finish_render(rendered):
+                sample.render_ms = (time.perf_counter() - sample.render_started) * 1000
+
+            response.add_post_render_callback(finish_render)
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin a user's reads to the primary database after a successful write so
+    replica-backed views (see apps.core.routers) reflect their own changes.
+
+    Runs after the view, so it also sees users authenticated by DRF (JWT).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or response.status_code >= 400:
+            return response
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and replica_configured():
+            pin_to_primary(user)
+        return response
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.9 on 2026-10-19 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('labels', models.CharField(blank=True, default='', max_length=255)),
+                ('value', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Metric Value',
+                'verbose_name_plural': 'Metric Values',
+                'ordering': ['name', 'labels'],
+                'unique_together': {('name', 'labels')},
+            },
+        ),
+    ]
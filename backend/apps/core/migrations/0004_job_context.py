@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_outboxevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='context',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
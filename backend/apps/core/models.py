@@ -0,0 +1,108 @@
+"""
+Models for Core app - Persistent metric storage, background jobs and the event outbox.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class MetricValue(models.Model):
+    """
+    Current value of a business counter or gauge.
+
+    Write paths update rows incrementally so the metrics endpoint can be
+    scraped with a single small query instead of aggregating domain tables.
+    """
+
+    name = models.CharField(max_length=100)
+    labels = models.CharField(max_length=255, blank=True, default='')
+    value = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Metric Value')
+        verbose_name_plural = _('Metric Values')
+        ordering = ['name', 'labels']
+        unique_together = ['name', 'labels']
+
+    def __str__(self):
+        return f"{self.name}{{{self.labels}}} = {self.value}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work in the database-backed job queue.
+
+    Rows are written by ``apps.core.jobs.enqueue`` (in the caller's
+    transaction) and claimed and run by ``manage.py run_jobs`` workers.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', _('Queued')
+        RUNNING = 'running', _('Running')
+        SUCCEEDED = 'succeeded', _('Succeeded')
+        FAILED = 'failed', _('Failed')
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Request context it was enqueued under (apps.core.context), bound while it runs
+    context = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    # Higher runs first
+    priority = models.SmallIntegerField(default=0)
+    # Enqueueing an existing key returns the existing job
+    idempotency_key = models.CharField(max_length=255, unique=True, blank=True, null=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = _('Job')
+        verbose_name_plural = _('Jobs')
+        ordering = ['-priority', 'run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'priority', 'run_at'], name='core_job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class OutboxEvent(models.Model):
+    """
+    A change event waiting for, or done with, delivery to subscribers.
+
+    Written by ``apps.core.events.publish`` in the same transaction as the
+    change it describes; ``dispatched_at`` is set once every subscriber has
+    handled it. Failed deliveries are retried from ``next_attempt_at``.
+    """
+
+    event_type = models.CharField(max_length=100)
+    aggregate_id = models.CharField(max_length=100, blank=True, default='')
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(blank=True, null=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        verbose_name = _('Outbox Event')
+        verbose_name_plural = _('Outbox Events')
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['dispatched_at', 'id'], name='core_outbox_pending_idx'),
+            models.Index(fields=['event_type', 'aggregate_id'], name='core_outbox_aggregate_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.pk}"
@@ -0,0 +1,38 @@
+"""
+Parsers for Core app.
+"""
+
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.json import strict_constant
+
+from .renderers import orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes UTF-8 bodies with orjson when it is installed.
+
+    Bodies orjson rejects are re-parsed with the standard library, so invalid
+    JSON produces the same ParseError message as JSONParser. Unlike json,
+    orjson decodes integers wider than 64 bits as floats.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+        try:
+            return json.loads(body.decode(encoding), parse_constant=strict_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,22 @@
+"""
+Permission classes for Core app.
+"""
+
+import hmac
+
+from django.conf import settings
+from rest_framework import permissions
+
+
+class CanScrapeMetrics(permissions.BasePermission):
+    """
+    Allow Prometheus scrapes with ``Authorization: Bearer <METRICS_AUTH_TOKEN>``.
+    Without a configured token only authenticated admins can read metrics.
+    """
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+        if token:
+            header = request.META.get('HTTP_AUTHORIZATION', '')
+            return hmac.compare_digest(header, f'Bearer {token}')
+        return bool(request.user and request.user.is_authenticated and request.user.is_admin)
@@ -0,0 +1,228 @@
+"""
+Compiled read path for list/retrieve endpoints.
+
+``CompiledReader`` turns a (sparse) ModelSerializer into a list of
+``values()`` lookups and per-field accessors, built once per request:
+
+    customer_name = CharField(source='customer.company_name')  -> customer__company_name
+    status_display = CharField(source='get_status_display')   -> status, label dict
+    is_delayed = BooleanField()  (property)                     -> Meta.field_dependencies
+
+Rows are then rendered without instantiating models or running the
+serializer machinery per row, producing the same data as
+``serializer.data``. Serializers with nested serializers, method fields,
+file fields or undeclared properties are not compilable and keep using the
+regular path.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+
+from .serializers import DISPLAY_METHOD
+
+
+# Accessor result for fields DRF leaves out of the row (SkipField)
+SKIP = object()
+
+
+class NotCompilable(Exception):
+    """The serializer uses a field the compiled path cannot reproduce."""
+
+
+def bare_instance(model, values):
+    """A model instance without __init__, enough to evaluate simple properties."""
+    instance = model.__new__(model)
+    instance.__dict__.update(values)
+    return instance
+
+
+class CompiledReader:
+    """values()-based renderer for one serializer's readable fields."""
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+        self.lookups = []
+        self.columns = []
+        for field in serializer._readable_fields:
+            accessor = self.compile_field(field)
+            self.columns.append((field.field_name, accessor, self.get_representation(field)))
+
+    def add_lookup(self, lookup):
+        if lookup not in self.lookups:
+            self.lookups.append(lookup)
+        return lookup
+
+    # -- compilation -----------------------------------------------------
+
+    def compile_field(self, field):
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField,
+                              serializers.FileField, serializers.ManyRelatedField)):
+            raise NotCompilable(field.field_name)
+        if field.source == '*':
+            raise NotCompilable(field.field_name)
+        if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise NotCompilable(field.field_name)
+
+        model, path, nullable = self.compile_path(field)
+        attr = field.source_attrs[-1]
+        if field.field_name in self.dependencies:
+            accessor = self.compile_computed(field, model, path, attr)
+        elif DISPLAY_METHOD.match(attr):
+            model_field = self.get_model_field(model, DISPLAY_METHOD.match(attr).group(1), field)
+            labels = {value: str(label) for value, label in model_field.flatchoices}
+            lookup = self.add_lookup('__'.join(path + [model_field.name]))
+            accessor = lambda row: labels.get(row[lookup], row[lookup])  # noqa: E731
+        else:
+            model_field = self.get_model_field(model, attr, field)
+            if not model_field.concrete or model_field.many_to_many:
+                raise NotCompilable(field.field_name)
+            lookup = self.add_lookup('__'.join(path + [model_field.name]))
+            accessor = lambda row: row[lookup]  # noqa: E731
+
+        if not nullable:
+            return accessor
+        missing = self.get_missing(field)
+
+        def guarded(row):
+            for lookup in nullable:
+                if row[lookup] is None:
+                    return missing
+            return accessor(row)
+        return guarded
+
+    def compile_path(self, field):
+        """Follow the foreign keys of a dotted source, noting the nullable ones."""
+        model = self.model
+        path = []
+        nullable = []
+        for attr in field.source_attrs[:-1]:
+            relation = self.get_model_field(model, attr, field)
+            if not (relation.is_relation and relation.many_to_one):
+                raise NotCompilable(field.field_name)
+            path.append(relation.name)
+            if relation.null:
+                nullable.append(self.add_lookup('__'.join(path)))
+            model = relation.related_model
+        return model, path, nullable
+
+    def compile_computed(self, field, model, path, attr):
+        """Properties/methods evaluated on a bare instance built from their dependencies."""
+        if not hasattr(model, attr):
+            raise NotCompilable(field.field_name)
+        prefix = ''.join(name + '__' for name in path)
+        relations = {'__'.join(path[:i + 1]) for i in range(len(path))}
+
+        names = {}
+        for dependency in self.dependencies[field.field_name]:
+            if dependency in relations:
+                continue
+            name = dependency[len(prefix):]
+            if not dependency.startswith(prefix) or '__' in name:
+                raise NotCompilable(field.field_name)
+            model_field = self.get_model_field(model, name, field)
+            if model_field.is_relation:
+                raise NotCompilable(field.field_name)
+            names[model_field.attname] = self.add_lookup(dependency)
+
+        def accessor(row):
+            value = getattr(bare_instance(model, {name: row[lookup] for name, lookup in names.items()}), attr)
+            return value() if callable(value) else value
+        return accessor
+
+    @staticmethod
+    def get_missing(field):
+        """What Field.get_attribute yields when a relation on the source path is null."""
+        if field.default is not empty:
+            raise NotCompilable(field.field_name)
+        if field.allow_null:
+            return None
+        if not field.required:
+            return SKIP
+        raise NotCompilable(field.field_name)
+
+    @staticmethod
+    def get_representation(field):
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # values() already holds the raw key DRF's PKOnlyObject would wrap
+            return field.pk_field.to_representation if field.pk_field else (lambda value: value)
+        return field.to_representation
+
+    @staticmethod
+    def get_model_field(model, name, field):
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise NotCompilable(field.field_name)
+
+    # -- rendering -------------------------------------------------------
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.lookups)
+
+    def to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, accessor, represent in self.columns:
+                value = accessor(row)
+                if value is None:
+                    item[name] = None
+                elif value is not SKIP:
+                    item[name] = represent(value)
+            data.append(item)
+        return data
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        try:
+            return cls(serializer)
+        except NotCompilable:
+            return None
+
+
+class CompiledReadMixin:
+    """
+    ViewSet mixin that serves list/retrieve through CompiledReader whenever
+    the action's serializer is compilable, and the regular serializer path
+    otherwise.
+    """
+
+    compiled_actions = ('list', 'retrieve')
+
+    def get_compiled_reader(self):
+        if self.action not in self.compiled_actions:
+            return None
+        return CompiledReader.for_serializer(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        reader = self.get_compiled_reader()
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.to_representation(page))
+        return Response(reader.to_representation(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        reader = self.get_compiled_reader()
+        if reader is None or self.has_object_permissions():
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = reader.values(self.filter_queryset(self.get_queryset()))
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(reader.to_representation([row])[0])
+
+    def has_object_permissions(self):
+        # Object permissions need a model instance, so those views keep the regular path
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
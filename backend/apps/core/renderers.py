@@ -0,0 +1,100 @@
+"""
+Renderers for Core app.
+"""
+
+import datetime
+import decimal
+import uuid
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; the stdlib encoder is used instead
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+
+def encode_datetime(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+class FastJSONEncoder(encoders.JSONEncoder):
+    """
+    DRF's JSONEncoder with an exact-type lookup for the values every model
+    here is full of (UUID keys, DecimalFields, dates) ahead of its isinstance
+    chain. Output is identical.
+    """
+
+    fast_types = {
+        decimal.Decimal: float,
+        uuid.UUID: str,
+        datetime.date: datetime.date.isoformat,
+        datetime.datetime: encode_datetime,
+    }
+
+    def default(self, obj):
+        encode = self.fast_types.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        return super().default(obj)
+
+
+fallback_encoder = FastJSONEncoder()
+
+
+def orjson_default(obj):
+    # orjson handles UUID, date and datetime itself; Decimal is the common miss
+    if type(obj) is decimal.Decimal:
+        return float(obj)
+    return fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that encodes with orjson when it is installed.
+
+    Indented output (the browsable API, ``Accept: application/json; indent=4``)
+    and non-default UNICODE_JSON/COMPACT_JSON settings use the standard
+    encoder, as does any payload orjson rejects, so responses match
+    JSONRenderer byte for byte apart from float formatting.
+    """
+
+    encoder_class = FastJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer so output is safe to embed in <script>
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class PrometheusRenderer(BaseRenderer):
+    """Render pre-formatted Prometheus text exposition."""
+
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Error responses (e.g. authentication failures) arrive as dicts
+        return str(data.get('detail', data) if isinstance(data, dict) else data).encode(self.charset)
@@ -0,0 +1,86 @@
+"""
+Database routing for Core app - optional read replica.
+
+Reads are sent to ``settings.REPLICA_DATABASE`` only inside views that opt in
+with ``ReplicaReadMixin`` (dashboards, audit browsing, exports); everything
+else, and every write, stays on ``default``. After a user writes, their reads
+stay on the primary for ``REPLICA_STICKY_SECONDS`` so they never see data
+older than their own change.
+"""
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+# Alias reads are routed to in the current request, or None for the primary
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+def replica_configured():
+    return getattr(settings, 'REPLICA_DATABASE', None) in settings.DATABASES
+
+
+def pin_key(user):
+    return f'replica-pin:{user.pk}'
+
+
+def pin_to_primary(user):
+    """Keep ``user``'s reads on the primary for the stickiness window."""
+    timeout = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+    if timeout > 0:
+        caches[getattr(settings, 'REPLICA_PIN_CACHE', 'default')].set(pin_key(user), True, timeout)
+
+
+def is_pinned(user):
+    return bool(caches[getattr(settings, 'REPLICA_PIN_CACHE', 'default')].get(pin_key(user)))
+
+
+class ReplicaRouter:
+    """Route opted-in reads to the replica; all writes and migrations use default."""
+
+    def db_for_read(self, model, **hints):
+        return replica_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # A write mid-request sends the rest of that request's reads to the primary
+        if replica_alias.get() is not None:
+            replica_alias.set(None)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    APIView mixin that serves safe requests from the read replica when one is
+    configured and the user has not written within the stickiness window.
+
+    Authentication and permission checks still run on the primary.
+    ``replica_actions`` limits routing to some actions of a viewset.
+    """
+
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.use_replica(request):
+            # Restored by value: async views run initial() in another context
+            self._replica_previous = replica_alias.get()
+            replica_alias.set(settings.REPLICA_DATABASE)
+
+    def use_replica(self, request):
+        if request.method not in SAFE_METHODS or not replica_configured():
+            return False
+        if self.replica_actions is not None and getattr(self, 'action', None) not in self.replica_actions:
+            return False
+        return not (request.user.is_authenticated and is_pinned(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if hasattr(self, '_replica_previous'):
+            replica_alias.set(self._replica_previous)
+            del self._replica_previous
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,214 @@
+"""
+Shared serializer mixins for Core app.
+
+Sparse fieldsets and field expansion:
+
+    GET /api/v1/logistics/dispatches/?fields=id,order_quote_number,status
+    GET /api/v1/inspection/order-inspections/?expand=checklist_items
+
+``fields`` keeps only the named top-level fields. Nested child collections
+listed in ``Meta.expandable_fields`` are left out unless named in ``expand``.
+Viewsets using ``SparseQuerysetMixin`` then load only the columns, joins and
+prefetches the remaining fields need.
+"""
+
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+DISPLAY_METHOD = re.compile(r'^get_(\w+)_display$')
+
+
+def parse_field_list(value):
+    if not value:
+        return set()
+    if isinstance(value, str):
+        value = value.split(',')
+    return {item.strip() for item in value if item and item.strip()}
+
+
+def prefetch_path(lookup):
+    return getattr(lookup, 'prefetch_to', lookup)
+
+
+def flatten_select_related(tree, prefix=''):
+    """Turn Query.select_related ({'order': {'customer': {}}}) into lookup paths."""
+    paths = []
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        if children:
+            paths.extend(flatten_select_related(children, f'{path}__'))
+        else:
+            paths.append(path)
+    return paths
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ``?fields=`` and ``?expand=``.
+
+    Meta options:
+        expandable_fields   {field name: prefetch lookup or Prefetch} for nested
+                            children that are only serialized when expanded.
+        field_dependencies  {field name: [model field names]} for properties and
+                            method fields, so the queryset can be pruned safely.
+
+    ``fields``/``expand`` may also be passed as keyword arguments, which take
+    precedence over the query string. Query parameters only apply to the
+    top-level serializer of a safe (read) request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._requested_fields = kwargs.pop('fields', None)
+        self._requested_expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def is_top_level(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_requested(self):
+        """Return (fields, expand) sets; an empty fields set means all fields."""
+        fields = parse_field_list(self._requested_fields)
+        expand = parse_field_list(self._requested_expand)
+        request = self.context.get('request')
+        if request is not None and request.method in SAFE_METHODS and self.is_top_level():
+            params = getattr(request, 'query_params', request.GET)
+            if self._requested_fields is None:
+                fields = parse_field_list(params.get('fields'))
+            if self._requested_expand is None:
+                expand = parse_field_list(params.get('expand'))
+        return fields, expand
+
+    def get_fields(self):
+        all_fields = super().get_fields()
+        requested, expand = self.get_requested()
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        # Explicitly listing an expandable field in ?fields= also expands it
+        expand = expand | (requested & set(expandable))
+
+        for name in list(all_fields):
+            if name in expandable and name not in expand:
+                all_fields.pop(name)
+            elif requested and name not in requested:
+                all_fields.pop(name)
+        return all_fields
+
+    # -- queryset pruning ------------------------------------------------
+
+    def get_prefetches(self):
+        """Prefetch lookups for the expandable fields being serialized."""
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        return [expandable[name] for name in self.fields if name in expandable and expandable[name]]
+
+    def get_model_lookups(self):
+        """
+        Model fields the serialized fields read, or None when that cannot be
+        determined (a property or method field without declared dependencies).
+        """
+        model = self.Meta.model
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        lookups = {model._meta.pk.name}
+
+        for name, field in self.fields.items():
+            if name in dependencies:
+                lookups.update(dependencies[name])
+                continue
+            if name in expandable or isinstance(field, serializers.ListSerializer):
+                # Reverse relations are loaded by prefetch, not by columns
+                continue
+            if field.source == '*':
+                return None
+            attribute = field.source_attrs[0]
+            display = DISPLAY_METHOD.match(attribute)
+            if display:
+                attribute = display.group(1)
+            try:
+                model_field = model._meta.get_field(attribute)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                if model_field.is_relation:
+                    continue
+                return None
+            # Only the local column; related rows stay fully loaded via select_related
+            lookups.add(model_field.name)
+        return lookups
+
+    def optimize_queryset(self, queryset):
+        """Drop unneeded columns, joins and prefetches from a read queryset."""
+        model = self.Meta.model
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        lookups = self.get_model_lookups()
+        prune = not (
+            lookups is None
+            or queryset.query.deferred_loading[0]
+            or queryset.query.select_related is True
+        )
+
+        def is_needed(path):
+            if path in skipped_paths:
+                return False
+            if not prune:
+                return True
+            # Prefetches through a pruned foreign key would reload it row by row
+            name = path.split('__', 1)[0]
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return True
+            return not field.concrete or name in lookups
+
+        skipped_paths = {
+            prefetch_path(lookup) for name, lookup in expandable.items()
+            if lookup and name not in self.fields
+        }
+        current = list(queryset._prefetch_related_lookups)
+        kept = [lookup for lookup in current if is_needed(prefetch_path(lookup))]
+        existing = {prefetch_path(lookup) for lookup in kept}
+        kept += [lookup for lookup in self.get_prefetches() if prefetch_path(lookup) not in existing]
+        if kept != current:
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+        if not prune:
+            return queryset
+
+        select_related = queryset.query.select_related
+        if select_related:
+            needed = [
+                path for path in flatten_select_related(select_related)
+                if path.split('__', 1)[0] in lookups
+            ]
+            queryset = queryset.select_related(None)
+            if needed:
+                queryset = queryset.select_related(*needed)
+        return queryset.only(*lookups)
+
+
+class SparseQuerysetMixin:
+    """
+    ViewSet mixin that prunes list/retrieve querysets to the serializer's
+    requested fields (see SparseFieldsMixin). Custom read actions can call
+    ``sparse_queryset`` with the serializer class they render, which must then
+    be given the request in its context.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        # Runs after get_queryset and the filter backends, so pruning sees the final joins
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'action', None) in self.sparse_actions:
+            queryset = self.sparse_queryset(queryset, self.get_serializer_class())
+        return queryset
+
+    def sparse_queryset(self, queryset, serializer_class):
+        if self.request.method not in SAFE_METHODS or not issubclass(serializer_class, SparseFieldsMixin):
+            return queryset
+        serializer = serializer_class(context=self.get_serializer_context())
+        return serializer.optimize_queryset(queryset)
@@ -0,0 +1,99 @@
+"""
+Signals for Core app - Keep business metrics current from write paths.
+"""
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.crm.models import Order
+from apps.fabrication.models import OrderFabrication
+from apps.inspection.models import OrderInspection
+from apps.materials.models import Material, MaterialTransaction
+from apps.production.models import ProductionRecord
+from . import metrics, snapshots
+
+
+def is_open_fabrication(fabrication):
+    return fabrication.status not in [
+        OrderFabrication.Status.COMPLETED, OrderFabrication.Status.SKIPPED
+    ]
+
+
+def is_pending_qa_approval(inspection):
+    return not inspection.is_qa_approved and inspection.result in [
+        OrderInspection.Result.PASS, OrderInspection.Result.CONDITIONAL
+    ]
+
+
+def is_low_stock(material):
+    return material.is_active and material.stock_quantity <= material.minimum_stock
+
+
+# model -> (gauge name, predicate, fields the predicate reads)
+TRACKED_GAUGES = {
+    OrderFabrication: ('erp_open_fabrications', is_open_fabrication, ['status']),
+    OrderInspection: ('erp_pending_qa_approvals', is_pending_qa_approval, ['is_qa_approved', 'result']),
+    Material: ('erp_low_stock_materials', is_low_stock, ['is_active', 'stock_quantity', 'minimum_stock']),
+}
+
+
+def remember_gauge_state(sender, instance, using=None, **kwargs):
+    """Evaluate the gauge predicate against the stored row before it changes."""
+    gauge, predicate, fields = TRACKED_GAUGES[sender]
+    # Shared with the audit receiver, so audited models load their row once per save
+    stored = snapshots.stored_instance(instance, using)
+    instance._metric_was_counted = stored is not None and predicate(stored)
+
+
+def update_gauge(sender, instance, **kwargs):
+    gauge, predicate, fields = TRACKED_GAUGES[sender]
+    delta = int(predicate(instance)) - int(getattr(instance, '_metric_was_counted', False))
+    metrics.inc(gauge, delta)
+
+
+def release_gauge(sender, instance, **kwargs):
+    gauge, predicate, fields = TRACKED_GAUGES[sender]
+    if predicate(instance):
+        metrics.dec(gauge)
+
+
+for tracked_model in TRACKED_GAUGES:
+    pre_save.connect(remember_gauge_state, sender=tracked_model, dispatch_uid=f'metrics-pre-{tracked_model.__name__}')
+    post_save.connect(update_gauge, sender=tracked_model, dispatch_uid=f'metrics-post-{tracked_model.__name__}')
+    post_delete.connect(release_gauge, sender=tracked_model, dispatch_uid=f'metrics-delete-{tracked_model.__name__}')
+    snapshots.track(tracked_model)
+
+
+@receiver(post_save, sender=Order)
+def track_order_status(sender, instance, created, **kwargs):
+    """Move the order between status gauges (previous status is set by crm signals)."""
+    previous_status = getattr(instance, '_previous_status', None)
+    if created:
+        metrics.inc('erp_orders', status=instance.status)
+    elif previous_status and previous_status != instance.status:
+        metrics.dec('erp_orders', status=previous_status)
+        metrics.inc('erp_orders', status=instance.status)
+        metrics.inc('erp_order_status_changes_total', status=instance.status)
+
+
+@receiver(post_delete, sender=Order)
+def release_order_status(sender, instance, **kwargs):
+    metrics.dec('erp_orders', status=instance.status)
+
+
+@receiver(post_save, sender=ProductionRecord)
+def track_production_record(sender, instance, created, **kwargs):
+    if not created:
+        return
+    metrics.inc('erp_production_records_total')
+    metrics.inc('erp_production_quantity_total', instance.ok_quantity, kind='ok')
+    metrics.inc('erp_production_quantity_total', instance.rework_quantity, kind='rework')
+    metrics.inc('erp_production_quantity_total', instance.rejection_quantity, kind='rejection')
+
+
+@receiver(post_save, sender=MaterialTransaction)
+def track_stock_movement(sender, instance, created, **kwargs):
+    if not created:
+        return
+    metrics.inc('erp_stock_movements_total', type=instance.transaction_type)
+    metrics.inc('erp_stock_movement_quantity_total', float(instance.quantity), type=instance.transaction_type)
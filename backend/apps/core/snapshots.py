@@ -0,0 +1,32 @@
+"""
+Pre-save snapshots for Core app - one stored-row query per save, shared.
+
+Receivers that compare an instance with its stored row (audit diffs, order
+status history, customer counters) call ``stored_instance`` in ``pre_save``.
+The first call of a save loads the row and keeps it on the instance, and the
+other receivers of that save reuse it. ``track(model)`` drops the snapshot
+after each save of ``model``, so the next save loads the row again.
+"""
+
+from django.db.models.signals import post_save
+
+SNAPSHOT_ATTRIBUTE = '_stored_instance'
+
+
+def stored_instance(instance, using=None):
+    """The row of ``instance`` as stored before the current save, or None for new ones."""
+    if instance._state.adding:
+        return None
+    if SNAPSHOT_ATTRIBUTE not in instance.__dict__:
+        manager = type(instance)._base_manager.using(using or instance._state.db)
+        instance.__dict__[SNAPSHOT_ATTRIBUTE] = manager.filter(pk=instance.pk).first()
+    return instance.__dict__[SNAPSHOT_ATTRIBUTE]
+
+
+def forget_stored_instance(sender, instance, **kwargs):
+    instance.__dict__.pop(SNAPSHOT_ATTRIBUTE, None)
+
+
+def track(model):
+    """Drop the snapshot of ``model`` instances once they are saved."""
+    post_save.connect(forget_stored_instance, sender=model, dispatch_uid=f'snapshot-{model._meta.label_lower}')
@@ -0,0 +1,92 @@
+"""
+Tests for Core app - query budgets.
+
+Every view that declares a query budget (``query_budgets`` or
+``@query_budget``) is called in strict mode against a generated data set, so
+a change that adds queries to a budgeted view fails here instead of slipping
+into production as a warning.
+"""
+
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+from apps.crm.models import Order
+from apps.crm.views import OrderViewSet
+
+from .instrumentation import QueryBudgetExceeded
+
+
+@override_settings(QUERY_BUDGET_STRICT=True, REQUEST_METRICS_ENABLED=True, JOBS_RUN_INLINE=True)
+class QueryBudgetTests(TestCase):
+    """Budgeted endpoints stay within their budgets on a realistic data set."""
+
+    # (path, query params) of every budgeted endpoint; {order} is filled in
+    BUDGETED = [
+        ('/api/v1/crm/orders/', {}),
+        ('/api/v1/crm/orders/{order}/', {}),
+        ('/api/v1/crm/orders/delayed/', {}),
+        ('/api/v1/materials/materials/low_stock/', {}),
+        ('/api/v1/inspection/order-inspections/pending_approval/', {}),
+        ('/api/v1/inspection/order-inspections/failed_inspections/', {}),
+        ('/api/v1/fabrication/order-fabrications/by_order/', {'order_id': '{order}'}),
+        ('/api/v1/fabrication/order-fabrications/in_progress/', {}),
+        ('/api/v1/fabrication/order-fabrications/delayed/', {}),
+        ('/api/v1/logistics/dispatches/pending_dispatch/', {}),
+        ('/api/v1/logistics/dispatches/in_transit/', {}),
+        ('/api/v1/logistics/dispatches/delayed/', {}),
+        ('/api/v1/dashboards/order-workspace/{order}/', {}),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('generate_data', orders=60, records_per_order=15, audit_rows=200, seed=7, verbosity=0)
+        cls.admin = User.objects.filter(is_superuser=True, is_active=True).order_by('date_joined').first()
+        cls.order = Order.objects.annotate(
+            fabrication_count=Count('order_fabrications')
+        ).order_by('-fabrication_count').first()
+        cls.assignee = User.objects.annotate(
+            order_count=Count('assigned_orders')
+        ).order_by('-order_count').first()
+
+    def client_for(self, user):
+        client = APIClient()
+        # A real JWT so authentication queries count against the budget
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def get(self, path, params=None, user=None):
+        fill = {'order': self.order.pk}
+        params = {name: value.format(**fill) for name, value in (params or {}).items()}
+        return self.client_for(user or self.admin).get(path.format(**fill), params)
+
+    def test_budgeted_endpoints_stay_within_budget(self):
+        for path, params in self.BUDGETED:
+            with self.subTest(path=path):
+                response = self.get(path, params)
+                self.assertEqual(response.status_code, 200)
+                sample = response.wsgi_request._instrumentation
+                self.assertIsNotNone(sample.budget, f'{path} declares no query budget')
+                self.assertFalse(sample.over_budget)
+
+    def test_my_orders_stays_within_budget(self):
+        response = self.get('/api/v1/crm/orders/my_orders/', user=self.assignee)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data)
+
+    def test_view_over_budget_raises(self):
+        with mock.patch.dict(OrderViewSet.query_budgets, {'list': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get('/api/v1/crm/orders/')
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_view_over_budget_only_warns_when_not_strict(self):
+        with mock.patch.dict(OrderViewSet.query_budgets, {'list': 1}):
+            with self.assertLogs('apps.core.middleware', level='WARNING'):
+                response = self.get('/api/v1/crm/orders/')
+        self.assertEqual(response.status_code, 200)
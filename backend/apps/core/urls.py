@@ -0,0 +1,10 @@
+"""
+URL patterns for Core app.
+"""
+
+from django.urls import path
+from .views import RequestMetricsView
+
+urlpatterns = [
+    path('request-metrics/', RequestMetricsView.as_view(), name='request-metrics'),
+]
@@ -0,0 +1,42 @@
+"""
+Views for Core app.
+"""
+
+from django.conf import settings
+from rest_framework import views, status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from apps.accounts.permissions import IsAdmin
+from .instrumentation import request_metrics
+from .metrics import render_prometheus
+from .permissions import CanScrapeMetrics
+from .renderers import PrometheusRenderer
+
+
+class RequestMetricsView(views.APIView):
+    """Per-action latency, query count and response size histograms."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({'actions': request_metrics.snapshot()})
+
+    def delete(self, request):
+        request_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+
+class MetricsView(views.APIView):
+    """Prometheus exposition of business counters, gauges and request histograms."""
+    renderer_classes = [PrometheusRenderer]
+    permission_classes = [CanScrapeMetrics]
+
+    def get_authenticators(self):
+        # Scrapers send the metrics token, which is not a JWT
+        if getattr(settings, 'METRICS_AUTH_TOKEN', ''):
+            return []
+        return super().get_authenticators()
+
+    def get(self, request):
+        return Response(render_prometheus())
@@ -0,0 +1,94 @@
+"""
+Customer order counters for CRM app.
+
+``Customer.total_orders``, ``active_orders`` and ``lifetime_value`` are
+stored on the customer rather than counted per request. The order signals
+move each order's contribution when the order is created or deleted, or when
+its status, amount or customer changes:
+
+    contribution(order)  ->  (customer_id, orders, active orders, value)
+
+Counters are adjusted with F() expressions in the saving transaction, so
+concurrent orders of one customer do not overwrite each other's changes.
+Writes that bypass model signals (``bulk_create``, ``queryset.update()``,
+``generate_data``) leave them behind; ``manage.py reconcile_customer_counters``
+recounts them from the orders table.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import Customer, Order
+
+# Orders in these statuses no longer count as active
+INACTIVE_STATUSES = [Order.Status.COMPLETED, Order.Status.CANCELLED]
+
+
+def contribution(order):
+    """What one order adds to its customer's counters."""
+    return (
+        order.customer_id,
+        1,
+        int(order.status not in INACTIVE_STATUSES),
+        Decimal(order.total_amount or 0),
+    )
+
+
+def apply(before=None, after=None):
+    """Move an order's contribution from ``before`` to ``after`` (either may be None)."""
+    if before == after:
+        return
+    deltas = defaultdict(lambda: [0, 0, Decimal('0')])
+    for sign, part in ((-1, before), (1, after)):
+        if part is None:
+            continue
+        customer_id, orders, active, value = part
+        delta = deltas[customer_id]
+        delta[0] += sign * orders
+        delta[1] += sign * active
+        delta[2] += sign * value
+    for customer_id, (orders, active, value) in deltas.items():
+        if orders or active or value:
+            Customer.objects.filter(pk=customer_id).update(
+                total_orders=F('total_orders') + orders,
+                active_orders=F('active_orders') + active,
+                lifetime_value=F('lifetime_value') + value,
+            )
+
+
+def counted(customer_ids):
+    """{customer_id: (orders, active orders, value)} counted from the orders table."""
+    rows = Order.objects.filter(customer_id__in=customer_ids).order_by().values('customer_id').annotate(
+        orders=Count('id'),
+        active=Count('id', filter=~Q(status__in=INACTIVE_STATUSES)),
+        value=Sum('total_amount'),
+    )
+    return {row['customer_id']: (row['orders'], row['active'], row['value'] or Decimal('0')) for row in rows}
+
+
+def reconcile(batch_size=1000, dry_run=False):
+    """Recount every customer's counters; return the customers that were off."""
+    fixed = []
+    customers = Customer.objects.only('pk', 'company_name', 'total_orders', 'active_orders', 'lifetime_value').order_by('pk')
+    last = None
+    while True:
+        with transaction.atomic():
+            # Locked while counting: an order saved meanwhile adjusts the
+            # counters after this batch is written, not before
+            batch = list((customers if last is None else customers.filter(pk__gt=last)).select_for_update()[:batch_size])
+            if not batch:
+                return fixed
+            counts = counted([customer.pk for customer in batch])
+            stale = []
+            for customer in batch:
+                expected = counts.get(customer.pk, (0, 0, Decimal('0')))
+                if (customer.total_orders, customer.active_orders, customer.lifetime_value) != expected:
+                    customer.total_orders, customer.active_orders, customer.lifetime_value = expected
+                    stale.append(customer)
+            if stale and not dry_run:
+                Customer.objects.bulk_update(stale, ['total_orders', 'active_orders', 'lifetime_value'])
+        fixed.extend(stale)
+        last = batch[-1].pk
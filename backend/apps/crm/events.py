@@ -0,0 +1,21 @@
+"""
+Change events for CRM app (see apps.core.events).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from apps.core.events import Event, register
+
+
+@register
+@dataclass(frozen=True)
+class OrderStatusChanged(Event):
+    """An order moved to a new status (or was created with its first one)."""
+
+    event_type = 'crm.OrderStatusChanged'
+
+    order_id: str
+    quote_number: str
+    previous_status: Optional[str]
+    new_status: str
@@ -0,0 +1,16 @@
+"""
+Background jobs for CRM app.
+"""
+
+from apps.core.jobs import enqueue, job
+from . import progress
+from .models import OrderProgressMark
+
+
+@job(progress.REFRESH_JOB, priority=5)
+def refresh_order_progress():
+    """Recompute the percentage of a batch of marked orders (see progress.py)."""
+    progress.refresh_marked()
+    if OrderProgressMark.objects.exists():
+        # More than one batch was marked, or another worker holds some marks
+        enqueue(progress.REFRESH_JOB)
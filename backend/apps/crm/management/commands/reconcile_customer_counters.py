@@ -0,0 +1,39 @@
+"""
+Recount the customer order counters (apps.crm.counters) from the orders table.
+
+Order saves and deletes keep ``total_orders``, ``active_orders`` and
+``lifetime_value`` current; writes that bypass model signals
+(``generate_data``, bulk loads, ``queryset.update()``) do not. Run it after
+such loads and nightly from cron; only customers whose counters are off are
+written.
+
+Examples:
+    python manage.py reconcile_customer_counters
+    python manage.py reconcile_customer_counters --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.crm import counters
+
+
+class Command(BaseCommand):
+    help = 'Recount customer order counters from the orders table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Customers per recount batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report customers whose counters are off')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        stale = counters.reconcile(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        for customer in stale[:20]:
+            self.stdout.write(
+                f'{customer.company_name}: {customer.total_orders} orders, '
+                f'{customer.active_orders} active, {customer.lifetime_value} value'
+            )
+        if options['dry_run']:
+            self.stdout.write(f'{len(stale)} customers have stale counters.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(stale)} customers reconciled.'))
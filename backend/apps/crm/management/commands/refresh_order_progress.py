@@ -0,0 +1,50 @@
+"""
+Recompute every order's progress percentage (apps.crm.progress) from its
+stage rows.
+
+Stage row saves and deletes keep ``status_percentage`` current through the
+``crm.refresh_progress`` job; writes that bypass model signals
+(``generate_data``, bulk loads, ``queryset.update()``) do not. Run it after
+such loads and after changing ``ORDER_PROGRESS_WEIGHTS``; only orders whose
+percentage is off are written.
+
+Examples:
+    python manage.py refresh_order_progress
+    python manage.py refresh_order_progress --dry-run
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.crm import progress
+from apps.crm.models import Order
+
+
+class Command(BaseCommand):
+    help = 'Recompute order progress percentages from their stage rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Orders per recompute batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report orders whose percentage is off')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive.')
+        changed = 0
+        last = None
+        while True:
+            orders = Order.objects.order_by('pk')
+            if last is not None:
+                orders = orders.filter(pk__gt=last)
+            order_ids = list(orders.values_list('pk', flat=True)[:batch_size])
+            if not order_ids:
+                break
+            with transaction.atomic():
+                changed += len(progress.refresh(order_ids, dry_run=options['dry_run']))
+            last = order_ids[-1]
+
+        if options['dry_run']:
+            self.stdout.write(f'{changed} orders have a stale percentage.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{changed} orders refreshed.'))
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:31
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+BATCH_SIZE = 1000
+
+
+def count_orders(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Customer = apps.get_model('crm', 'Customer')
+    Order = apps.get_model('crm', 'Order')
+    totals = Order.objects.using(alias).order_by().values('customer_id').annotate(
+        orders=Count('id'),
+        active=Count('id', filter=~Q(status__in=['completed', 'cancelled'])),
+        value=Sum('total_amount'),
+    )
+    batch = []
+    for row in totals.iterator(chunk_size=BATCH_SIZE):
+        batch.append(Customer(
+            pk=row['customer_id'], total_orders=row['orders'],
+            active_orders=row['active'], lifetime_value=row['value'] or 0,
+        ))
+        if len(batch) == BATCH_SIZE:
+            Customer.objects.using(alias).bulk_update(batch, ['total_orders', 'active_orders', 'lifetime_value'])
+            batch = []
+    if batch:
+        Customer.objects.using(alias).bulk_update(batch, ['total_orders', 'active_orders', 'lifetime_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='active_orders',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='lifetime_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='total_orders',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['lifetime_value'], name='crm_custome_lifetim_67b468_idx'),
+        ),
+        migrations.RunPython(count_orders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_customer_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderProgressMark',
+            fields=[
+                ('order_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('marked_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Order Progress Mark',
+                'verbose_name_plural': 'Order Progress Marks',
+                'ordering': ['marked_at'],
+            },
+        ),
+    ]
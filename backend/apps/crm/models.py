@@ -41,6 +41,11 @@ class Customer(models.Model):
     contact_email = models.EmailField(blank=True, null=True)
     contact_phone = models.CharField(max_length=20, blank=True, null=True)
     
+    # Order counters, kept current by the order signals (see counters.py)
+    total_orders = models.IntegerField(default=0, editable=False)
+    active_orders = models.IntegerField(default=0, editable=False)
+    lifetime_value = models.DecimalField(max_digits=18, decimal_places=2, default=0, editable=False)
+    
     # Metadata
     notes = models.TextField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
@@ -57,20 +62,13 @@ class Customer(models.Model):
         verbose_name = _('Customer')
         verbose_name_plural = _('Customers')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['lifetime_value']),
+        ]
 
     def __str__(self):
         return f"{self.company_name} ({self.name})"
 
-    @property
-    def total_orders(self):
-        return self.orders.count()
-
-    @property
-    def active_orders(self):
-        return self.orders.exclude(
-            status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED]
-        ).count()
-
 
 class Order(models.Model):
     """
@@ -189,9 +187,20 @@ class Order(models.Model):
     def __str__(self):
         return f"{self.quote_number} - {self.project_name}"
 
+    # Written only by the crm.refresh_progress job (progress.py), never by saves
+    DERIVED_FIELDS = ['status_percentage']
+
     def save(self, *args, **kwargs):
         # Auto-calculate total amount
         self.total_amount = self.unit_price * self.ordered_quantity
+        updating = not self._state.adding and not kwargs.get('force_insert')
+        if updating and not args and kwargs.get('update_fields') is None:
+            # A stale instance (an admin form, update_status) must not put back
+            # the percentage the refresh job has since computed
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DERIVED_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     @property
@@ -247,4 +256,25 @@ class OrderStatusHistory(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.order.quote_number}: {self.previous_status} -> {self.new_status}"
\ No newline at end of file
+        return f"{self.order.quote_number}: {self.previous_status} -> {self.new_status}"
+
+
+class OrderProgressMark(models.Model):
+    """
+    An order whose ``status_percentage`` is waiting to be recomputed.
+
+    Written when a stage row of the order changes and removed by the
+    ``crm.refresh_progress`` job (see progress.py). Holds the order id without
+    a foreign key, so a mark left for a deleted order is simply dropped.
+    """
+
+    order_id = models.UUIDField(primary_key=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Order Progress Mark')
+        verbose_name_plural = _('Order Progress Marks')
+        ordering = ['marked_at']
+
+    def __str__(self):
+        return f"Progress of {self.order_id} (marked {self.marked_at})"
@@ -0,0 +1,167 @@
+"""
+Order progress roll-up for CRM app.
+
+``Order.status_percentage`` is derived from the order's stage rows instead of
+being entered by hand. Each stage gives a fraction between 0 and 1:
+
+    fabrication        completed share of each process, averaged (skipped ones left out)
+    surface_treatment  completed share of each treatment, averaged (not required ones left out)
+    production         ProductionSummary.completion_percentage
+    inspection         share of inspections passed, conditionally or not
+
+and the percentage is the weighted mean over the stages the order has rows
+for (``ORDER_PROGRESS_WEIGHTS``). Completed and dispatched orders are at 100.
+
+A change to a stage row, or to the order's status, marks the order
+(``OrderProgressMark``) in the saving transaction and enqueues the
+``crm.refresh_progress`` job for the end of the current debounce window
+(``ORDER_PROGRESS_DEBOUNCE`` seconds). Every change in the window shares that
+one job, which recomputes the marked orders in batches of
+``ORDER_PROGRESS_BATCH_SIZE`` with a handful of grouped queries per batch.
+``manage.py refresh_order_progress`` recomputes every order, for data loaded
+without model signals. ``Order.save()`` leaves ``status_percentage`` out of
+updates, so saving a stale order instance does not undo a refresh.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.jobs import enqueue
+from apps.core.models import Job
+from apps.fabrication.models import OrderFabrication
+from apps.inspection.models import OrderInspection
+from apps.production.models import ProductionSummary
+from apps.surface_treatment.models import OrderSurfaceTreatment
+
+from .models import Order, OrderProgressMark
+
+REFRESH_JOB = 'crm.refresh_progress'
+
+# Relative weight of each stage in the order percentage
+STAGE_WEIGHTS = {
+    'fabrication': 40,
+    'surface_treatment': 15,
+    'production': 30,
+    'inspection': 15,
+}
+
+# Stage rows whose changes move an order's progress
+STAGE_MODELS = [OrderFabrication, OrderSurfaceTreatment, ProductionSummary, OrderInspection]
+
+# Orders in these statuses are done, whatever their stage rows say
+FINISHED_STATUSES = [Order.Status.COMPLETED, Order.Status.DISPATCHED]
+
+PASSED_RESULTS = [OrderInspection.Result.PASS, OrderInspection.Result.CONDITIONAL]
+
+
+def weights():
+    return getattr(settings, 'ORDER_PROGRESS_WEIGHTS', STAGE_WEIGHTS)
+
+
+def share(completed, planned):
+    """Completed share of a planned quantity, capped at 1."""
+    return min(completed / planned, 1.0) if planned > 0 else 0.0
+
+
+def stage_fractions(order_ids):
+    """{order_id: {stage: fraction}} for the stages each order has rows for."""
+    shares = defaultdict(lambda: defaultdict(list))
+
+    fabrication = OrderFabrication.objects.filter(order_id__in=order_ids).exclude(
+        status=OrderFabrication.Status.SKIPPED
+    ).order_by().values_list('order_id', 'status', 'completed_quantity', 'planned_quantity')
+    for order_id, status, completed, planned in fabrication:
+        done = status == OrderFabrication.Status.COMPLETED
+        shares[order_id]['fabrication'].append(1.0 if done else share(completed, planned))
+
+    treatments = OrderSurfaceTreatment.objects.filter(order_id__in=order_ids).exclude(
+        status=OrderSurfaceTreatment.Status.NOT_REQUIRED
+    ).order_by().values_list('order_id', 'status', 'completed_quantity', 'planned_quantity')
+    for order_id, status, completed, planned in treatments:
+        done = status == OrderSurfaceTreatment.Status.COMPLETED
+        shares[order_id]['surface_treatment'].append(1.0 if done else share(completed, planned))
+
+    inspections = OrderInspection.objects.filter(order_id__in=order_ids).order_by().values_list('order_id', 'result')
+    for order_id, result in inspections:
+        shares[order_id]['inspection'].append(1.0 if result in PASSED_RESULTS else 0.0)
+
+    summaries = ProductionSummary.objects.filter(order_id__in=order_ids).values_list('order_id', 'completion_percentage')
+    for order_id, completion in summaries:
+        shares[order_id]['production'].append(float(completion) / 100)
+
+    return {
+        order_id: {stage: sum(values) / len(values) for stage, values in stages.items()}
+        for order_id, stages in shares.items()
+    }
+
+
+def percentage(status, fractions):
+    """Weighted order percentage (0-100) from its stage fractions."""
+    if status in FINISHED_STATUSES:
+        return 100
+    stage_weights = weights()
+    total = sum(stage_weights.get(stage, 0) for stage in fractions)
+    if not total:
+        return 0
+    weighted = sum(stage_weights.get(stage, 0) * fraction for stage, fraction in fractions.items())
+    return round(weighted / total * 100)
+
+
+def refresh(order_ids, dry_run=False):
+    """Recompute ``status_percentage`` of ``order_ids``; return the orders that changed."""
+    orders = list(Order.objects.filter(pk__in=order_ids).only('pk', 'status', 'status_percentage'))
+    fractions = stage_fractions([order.pk for order in orders])
+    changed = []
+    for order in orders:
+        value = percentage(order.status, fractions.get(order.pk, {}))
+        if value != order.status_percentage:
+            order.status_percentage = value
+            changed.append(order)
+    if changed and not dry_run:
+        # update, not save: no audit entry, search reindex or counter move for a derived value
+        Order.objects.bulk_update(changed, ['status_percentage'])
+    return changed
+
+
+def schedule():
+    """Enqueue the refresh job for the end of the current debounce window."""
+    window = getattr(settings, 'ORDER_PROGRESS_DEBOUNCE', 10)
+    if window <= 0:
+        enqueue(REFRESH_JOB)
+        return
+    now = timezone.now().timestamp()
+    bucket = int(now // window)
+    delay = (bucket + 1) * window - now
+    queued = enqueue(REFRESH_JOB, key=f'{REFRESH_JOB}:{bucket}', delay=delay)
+    if queued.status != Job.Status.QUEUED:
+        # This window's job has already started and may miss the new mark
+        enqueue(REFRESH_JOB, delay=delay)
+
+
+def mark(order_id):
+    """Queue a recompute of the order's percentage (in the caller's transaction)."""
+    try:
+        with transaction.atomic():
+            OrderProgressMark.objects.create(order_id=order_id)
+    except IntegrityError:
+        # Already marked, and a refresh job is waiting for it
+        return
+    schedule()
+
+
+def refresh_marked(batch_size=None):
+    """Recompute one batch of marked orders; return how many marks were taken."""
+    batch_size = batch_size or getattr(settings, 'ORDER_PROGRESS_BATCH_SIZE', 200)
+    with transaction.atomic():
+        order_ids = list(
+            OrderProgressMark.objects.select_for_update(skip_locked=True)
+            .order_by('marked_at').values_list('order_id', flat=True)[:batch_size]
+        )
+        if not order_ids:
+            return 0
+        OrderProgressMark.objects.filter(order_id__in=order_ids).delete()
+        refresh(order_ids)
+    return len(order_ids)
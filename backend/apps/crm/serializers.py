@@ -3,17 +3,17 @@ Serializers for CRM app.
 """
 
 from rest_framework import serializers
+from django.db.models import Prefetch
 from django.contrib.auth import get_user_model
 from .models import Customer, Order, OrderStatusHistory
+from apps.core.serializers import SparseFieldsMixin
 
 User = get_user_model()
 
 
-class CustomerListSerializer(serializers.ModelSerializer):
+class CustomerListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for customer list view."""
 
-    total_orders = serializers.IntegerField(read_only=True)
-    active_orders = serializers.IntegerField(read_only=True)
     customer_type_display = serializers.CharField(source='get_customer_type_display', read_only=True)
 
     class Meta:
@@ -21,15 +21,13 @@ class CustomerListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'company_name', 'customer_type', 'customer_type_display',
             'email', 'phone', 'city', 'is_active', 'total_orders', 'active_orders',
-            'created_at'
+            'lifetime_value', 'created_at'
         ]
 
 
-class CustomerDetailSerializer(serializers.ModelSerializer):
+class CustomerDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for customer detail view."""
 
-    total_orders = serializers.IntegerField(read_only=True)
-    active_orders = serializers.IntegerField(read_only=True)
     customer_type_display = serializers.CharField(source='get_customer_type_display', read_only=True)
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
 
@@ -51,7 +49,7 @@ class CustomerCreateUpdateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class OrderStatusHistorySerializer(serializers.ModelSerializer):
+class OrderStatusHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for order status history."""
 
     changed_by_name = serializers.CharField(source='changed_by.get_full_name', read_only=True)
@@ -67,7 +65,7 @@ class OrderStatusHistorySerializer(serializers.ModelSerializer):
         ]
 
 
-class OrderListSerializer(serializers.ModelSerializer):
+class OrderListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for order list view."""
 
     customer_name = serializers.CharField(source='customer.company_name', read_only=True)
@@ -85,9 +83,13 @@ class OrderListSerializer(serializers.ModelSerializer):
             'priority_display', 'expected_delivery_date', 'is_delayed',
             'days_remaining', 'total_amount', 'created_at'
         ]
+        field_dependencies = {
+            'is_delayed': ['expected_delivery_date', 'status'],
+            'days_remaining': ['expected_delivery_date'],
+        }
 
 
-class OrderDetailSerializer(serializers.ModelSerializer):
+class OrderDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for order detail view."""
 
     customer_name = serializers.CharField(source='customer.company_name', read_only=True)
@@ -104,6 +106,12 @@ class OrderDetailSerializer(serializers.ModelSerializer):
         model = Order
         fields = '__all__'
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'total_amount']
+        expandable_fields = {
+            'status_history': Prefetch(
+                'status_history', queryset=OrderStatusHistory.objects.select_related('changed_by')
+            ),
+        }
+        field_dependencies = OrderListSerializer.Meta.field_dependencies
 
 
 class OrderCreateSerializer(serializers.ModelSerializer):
@@ -133,7 +141,7 @@ class OrderUpdateSerializer(serializers.ModelSerializer):
             'po_number', 'work_order_number', 'invoice_number', 'grn_number',
             'project_name', 'description', 'ordered_quantity', 'planned_lead_time',
             'actual_lead_time', 'expected_delivery_date', 'actual_delivery_date',
-            'status', 'status_percentage', 'priority', 'unit_price', 'remarks',
+            'status', 'priority', 'unit_price', 'remarks',
             'internal_notes', 'assigned_to'
         ]
 
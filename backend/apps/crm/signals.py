@@ -2,22 +2,29 @@
 Signals for CRM app.
 """
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from apps.core import snapshots
+from apps.core.events import publish
+from . import counters, progress
+from .events import OrderStatusChanged
 from .models import Order, OrderStatusHistory
 
 
 @receiver(pre_save, sender=Order)
-def track_status_change(sender, instance, **kwargs):
+def track_status_change(sender, instance, using=None, **kwargs):
     """Store previous status before save for history tracking."""
-    if instance.pk:
-        try:
-            old_instance = Order.objects.get(pk=instance.pk)
-            instance._previous_status = old_instance.status
-        except Order.DoesNotExist:
-            instance._previous_status = None
+    # Shared with the audit receiver, so an order save loads its row once
+    old_instance = snapshots.stored_instance(instance, using)
+    if old_instance is not None:
+        instance._previous_status = old_instance.status
+        instance._previous_counters = counters.contribution(old_instance)
     else:
         instance._previous_status = None
+        instance._previous_counters = None
+
+
+snapshots.track(Order)
 
 
 @receiver(post_save, sender=Order)
@@ -40,4 +47,53 @@ def create_status_history(sender, instance, created, **kwargs):
             previous_status=previous_status,
             new_status=instance.status,
             changed_by=None  # Will be set by view if available
-        )
\ No newline at end of file
+        )
+
+
+@receiver(post_save, sender=Order)
+def publish_status_change(sender, instance, created, **kwargs):
+    """Publish OrderStatusChanged with the same transaction as the save."""
+    previous_status = getattr(instance, '_previous_status', None)
+    if created or (previous_status and previous_status != instance.status):
+        publish(OrderStatusChanged(
+            order_id=str(instance.pk),
+            quote_number=instance.quote_number,
+            previous_status=None if created else previous_status,
+            new_status=instance.status,
+        ))
+
+
+@receiver(post_save, sender=Order)
+def update_customer_counters(sender, instance, created, raw=False, **kwargs):
+    """Move the order's contribution to its customer's counters."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_previous_counters', None)
+    counters.apply(previous, counters.contribution(instance))
+
+
+@receiver(post_delete, sender=Order)
+def remove_from_customer_counters(sender, instance, **kwargs):
+    """Take a deleted order off its customer's counters."""
+    counters.apply(before=counters.contribution(instance))
+
+
+@receiver(post_save, sender=Order)
+def mark_progress_on_status(sender, instance, created, raw=False, **kwargs):
+    """Recompute the order's percentage when it enters or leaves a finished status."""
+    if raw or created:
+        return
+    if getattr(instance, '_previous_status', None) != instance.status:
+        progress.mark(instance.pk)
+
+
+def mark_progress(sender, instance, raw=False, **kwargs):
+    """Recompute the percentage of the order a stage row belongs to."""
+    if not raw:
+        progress.mark(instance.order_id)
+
+
+for stage_model in progress.STAGE_MODELS:
+    label = stage_model._meta.label_lower
+    post_save.connect(mark_progress, sender=stage_model, dispatch_uid=f'progress-save-{label}')
+    post_delete.connect(mark_progress, sender=stage_model, dispatch_uid=f'progress-delete-{label}')
@@ -7,7 +7,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count
 from .models import Customer, Order, OrderStatusHistory
 from .serializers import (
     CustomerListSerializer,
@@ -21,9 +22,11 @@ from .serializers import (
     OrderStatusHistorySerializer
 )
 from apps.accounts.permissions import IsSales, IsAdminOrReadOnly
+from apps.core.readers import CompiledReadMixin
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing customers."""
     
     queryset = Customer.objects.all()
@@ -31,7 +34,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['customer_type', 'is_active', 'city', 'state', 'country']
     search_fields = ['name', 'company_name', 'email', 'phone', 'gst_number']
-    ordering_fields = ['company_name', 'created_at', 'customer_type']
+    ordering_fields = ['company_name', 'created_at', 'customer_type', 'total_orders', 'lifetime_value']
     ordering = ['-created_at']
 
     def get_serializer_class(self):
@@ -41,16 +44,6 @@ class CustomerViewSet(viewsets.ModelViewSet):
             return CustomerCreateUpdateSerializer
         return CustomerDetailSerializer
 
-    def get_queryset(self):
-        queryset = Customer.objects.annotate(
-            total_orders_count=Count('orders'),
-            active_orders_count=Count(
-                'orders',
-                filter=~Q(orders__status__in=['completed', 'cancelled'])
-            )
-        )
-        return queryset
-
     @action(detail=True, methods=['get'])
     def orders(self, request, pk=None):
         """Get all orders for a specific customer."""
@@ -68,7 +61,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         return Response(CustomerDetailSerializer(customer).data)
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(CompiledReadMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing orders."""
     
     queryset = Order.objects.all()
@@ -78,6 +71,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     search_fields = ['quote_number', 'po_number', 'work_order_number', 'project_name']
     ordering_fields = ['created_at', 'expected_delivery_date', 'status', 'priority']
     ordering = ['-created_at']
+    query_budgets = {'list': 4, 'retrieve': 5, 'delayed': 3, 'my_orders': 3}
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -114,6 +108,7 @@ class OrderViewSet(viewsets.ModelViewSet):
         return queryset
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def update_status(self, request, pk=None):
         """Update order status with history tracking."""
         order = self.get_object()
@@ -155,8 +150,9 @@ class OrderViewSet(viewsets.ModelViewSet):
             expected_delivery_date__lt=timezone.now().date()
         ).exclude(
             status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED, Order.Status.DISPATCHED]
-        )
-        serializer = OrderListSerializer(delayed_orders, many=True)
+        ).select_related('customer')
+        delayed_orders = self.sparse_queryset(delayed_orders, OrderListSerializer)
+        serializer = OrderListSerializer(delayed_orders, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -168,6 +164,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_orders(self, request):
         """Get orders assigned to current user."""
-        orders = Order.objects.filter(assigned_to=request.user)
-        serializer = OrderListSerializer(orders, many=True)
+        orders = Order.objects.filter(assigned_to=request.user).select_related('customer')
+        orders = self.sparse_queryset(orders, OrderListSerializer)
+        serializer = OrderListSerializer(orders, many=True, context={'request': request})
         return Response(serializer.data)
\ No newline at end of file
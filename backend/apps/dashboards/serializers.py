@@ -0,0 +1,19 @@
+"""
+Serializers for Dashboards app.
+"""
+
+from apps.crm.serializers import OrderDetailSerializer
+from apps.fabrication.serializers import OrderFabricationSerializer
+
+
+class WorkspaceOrderSerializer(OrderDetailSerializer):
+    """Order detail without the unbounded status history (paginated separately)."""
+
+    status_history = None
+
+
+class WorkspaceFabricationSerializer(OrderFabricationSerializer):
+    """Fabrication process without nested logs (paginated separately)."""
+
+    logs = None
+
@@ -6,6 +6,7 @@ from django.urls import path
 from .views import (
     DashboardOverviewView,
     OrderStatusTrackingView,
+    OrderWorkspaceView,
     DelayedOrdersView,
     ProductionAnalyticsView,
     DepartmentPerformanceView,
@@ -18,6 +19,7 @@ from .views import (
 urlpatterns = [
     path('overview/', DashboardOverviewView.as_view(), name='dashboard-overview'),
     path('order-tracking/', OrderStatusTrackingView.as_view(), name='order-tracking'),
+    path('order-workspace/<uuid:pk>/', OrderWorkspaceView.as_view(), name='order-workspace'),
     path('delayed-orders/', DelayedOrdersView.as_view(), name='delayed-orders'),
     path('production-analytics/', ProductionAnalyticsView.as_view(), name='production-analytics'),
     path('department-performance/', DepartmentPerformanceView.as_view(), name='department-performance'),
@@ -5,20 +5,37 @@ Views for Dashboards app - Analytics and KPIs.
 from rest_framework import views, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Sum, Avg, F, Q
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Sum, Avg, F, Q, Prefetch
 from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 
-from apps.crm.models import Order, Customer
+from apps.core.async_views import AsyncAPIView, gather
+from apps.core.fanout import fan_out
+from apps.core.instrumentation import query_budget
+from apps.core.routers import ReplicaReadMixin
+from apps.crm.models import Order, Customer, OrderStatusHistory
+from apps.crm.serializers import OrderStatusHistorySerializer
+from apps.engineering.models import Drawing
+from apps.engineering.serializers import DrawingListSerializer
+from apps.materials.models import OrderMaterial
+from apps.materials.serializers import OrderMaterialSerializer
 from apps.production.models import ProductionRecord, ProductionSummary
-from apps.fabrication.models import OrderFabrication
+from apps.production.serializers import ProductionRecordSerializer, ProductionSummarySerializer
+from apps.fabrication.models import OrderFabrication, FabricationLog
+from apps.fabrication.serializers import FabricationLogSerializer
+from apps.surface_treatment.models import OrderSurfaceTreatment
+from apps.surface_treatment.serializers import OrderSurfaceTreatmentSerializer
 from apps.inspection.models import OrderInspection
-from apps.logistics.models import OrderDispatch
+from apps.inspection.serializers import OrderInspectionSerializer
+from apps.logistics.models import OrderDispatch, DispatchDocument
+from apps.logistics.serializers import OrderDispatchSerializer
+from .serializers import WorkspaceOrderSerializer, WorkspaceFabricationSerializer
 
 
-class DashboardOverviewView(views.APIView):
+class DashboardOverviewView(ReplicaReadMixin, views.APIView):
     """Overall dashboard with key metrics."""
     permission_classes = [IsAuthenticated]
 
@@ -26,60 +43,57 @@ class DashboardOverviewView(views.APIView):
         today = timezone.now().date()
         thirty_days_ago = today - timedelta(days=30)
         
-        # Order Statistics
-        total_orders = Order.objects.count()
-        active_orders = Order.objects.exclude(
-            status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED]
-        ).count()
-        
-        orders_this_month = Order.objects.filter(
-            created_at__date__gte=today.replace(day=1)
-        ).count()
-        
-        # Delayed Orders
-        delayed_orders = Order.objects.filter(
-            expected_delivery_date__lt=today
-        ).exclude(
-            status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED, Order.Status.DISPATCHED]
-        ).count()
-        
-        # Customer Statistics
-        total_customers = Customer.objects.filter(is_active=True).count()
-        new_customers_this_month = Customer.objects.filter(
-            created_at__date__gte=today.replace(day=1)
-        ).count()
-        
-        # Production Statistics
-        production_stats = ProductionRecord.objects.filter(
-            production_date__gte=thirty_days_ago
-        ).aggregate(
-            total_produced=Sum('produced_quantity'),
-            total_ok=Sum('ok_quantity'),
-            total_rejection=Sum('rejection_quantity'),
-            avg_yield=Avg('total_yield_percentage')
+        results = fan_out(
+            # Order Statistics
+            total_orders=lambda: Order.objects.count(),
+            active_orders=lambda: Order.objects.exclude(
+                status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED]
+            ).count(),
+            orders_this_month=lambda: Order.objects.filter(
+                created_at__date__gte=today.replace(day=1)
+            ).count(),
+            # Delayed Orders
+            delayed_orders=lambda: Order.objects.filter(
+                expected_delivery_date__lt=today
+            ).exclude(
+                status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED, Order.Status.DISPATCHED]
+            ).count(),
+            # Customer Statistics
+            total_customers=lambda: Customer.objects.filter(is_active=True).count(),
+            new_customers_this_month=lambda: Customer.objects.filter(
+                created_at__date__gte=today.replace(day=1)
+            ).count(),
+            # Production Statistics
+            production_stats=lambda: ProductionRecord.objects.filter(
+                production_date__gte=thirty_days_ago
+            ).aggregate(
+                total_produced=Sum('produced_quantity'),
+                total_ok=Sum('ok_quantity'),
+                total_rejection=Sum('rejection_quantity'),
+                avg_yield=Avg('total_yield_percentage')
+            ),
+            # Order Status Distribution
+            status_distribution=lambda: list(Order.objects.values('status').annotate(
+                count=Count('id')
+            ).order_by('status')),
+            # Revenue (last 30 days)
+            revenue=lambda: Order.objects.filter(
+                status=Order.Status.COMPLETED,
+                actual_delivery_date__gte=thirty_days_ago
+            ).aggregate(total=Sum('total_amount')),
         )
-        
-        # Order Status Distribution
-        status_distribution = Order.objects.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
-        
-        # Revenue (last 30 days)
-        revenue = Order.objects.filter(
-            status=Order.Status.COMPLETED,
-            actual_delivery_date__gte=thirty_days_ago
-        ).aggregate(total=Sum('total_amount'))
+        production_stats = results['production_stats']
         
         return Response({
             'orders': {
-                'total': total_orders,
-                'active': active_orders,
-                'this_month': orders_this_month,
-                'delayed': delayed_orders,
+                'total': results['total_orders'],
+                'active': results['active_orders'],
+                'this_month': results['orders_this_month'],
+                'delayed': results['delayed_orders'],
             },
             'customers': {
-                'total': total_customers,
-                'new_this_month': new_customers_this_month,
+                'total': results['total_customers'],
+                'new_this_month': results['new_customers_this_month'],
             },
             'production': {
                 'total_produced': production_stats['total_produced'] or 0,
@@ -87,79 +101,258 @@ class DashboardOverviewView(views.APIView):
                 'total_rejection': production_stats['total_rejection'] or 0,
                 'avg_yield': round(production_stats['avg_yield'] or 0, 2),
             },
-            'status_distribution': list(status_distribution),
-            'revenue_30_days': float(revenue['total'] or 0),
+            'status_distribution': results['status_distribution'],
+            'revenue_30_days': float(results['revenue']['total'] or 0),
         })
 
 
-class OrderStatusTrackingView(views.APIView):
+class OrderStatusTrackingView(ReplicaReadMixin, AsyncAPIView):
     """Order status tracking and workflow."""
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         order_id = request.query_params.get('order_id')
         
         if order_id:
             try:
-                order = Order.objects.get(id=order_id)
-                
-                # Get all related data
-                materials = order.materials.all().values(
-                    'material__name', 'required_quantity', 'issued_quantity', 'status'
-                )
-                
-                fabrications = order.fabrication_processes.all().values(
-                    'process__name', 'status', 'completed_quantity', 'planned_quantity'
-                )
-                
-                treatments = order.surface_treatments.all().values(
-                    'treatment_type__name', 'status', 'completed_quantity', 'planned_quantity'
-                )
-                
-                inspections = order.inspections.all().values(
-                    'inspection_type__name', 'result', 'is_qa_approved'
-                )
-                
-                dispatch = None
-                if hasattr(order, 'dispatch'):
-                    dispatch = {
-                        'status': order.dispatch.status,
-                        'planned_dispatch_date': order.dispatch.planned_dispatch_date,
-                        'actual_dispatch_date': order.dispatch.actual_dispatch_date,
-                    }
-                
-                return Response({
-                    'order': {
-                        'id': str(order.id),
-                        'quote_number': order.quote_number,
-                        'project_name': order.project_name,
-                        'status': order.status,
-                        'status_percentage': order.status_percentage,
-                    },
-                    'materials': list(materials),
-                    'fabrications': list(fabrications),
-                    'surface_treatments': list(treatments),
-                    'inspections': list(inspections),
-                    'dispatch': dispatch,
-                })
+                order, = await gather(lambda: Order.objects.get(id=order_id))
             except Order.DoesNotExist:
                 return Response(
                     {'detail': 'Order not found.'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+
+            # Get all related data
+            materials, fabrications, treatments, inspections, dispatch = await gather(
+                lambda: list(order.materials.all().values(
+                    'material__name', 'required_quantity', 'issued_quantity', 'status'
+                )),
+                lambda: list(order.fabrication_processes.all().values(
+                    'process__name', 'status', 'completed_quantity', 'planned_quantity'
+                )),
+                lambda: list(order.surface_treatments.all().values(
+                    'treatment_type__name', 'status', 'completed_quantity', 'planned_quantity'
+                )),
+                lambda: list(order.inspections.all().values(
+                    'inspection_type__name', 'result', 'is_qa_approved'
+                )),
+                lambda: OrderDispatch.objects.filter(order=order).values(
+                    'status', 'planned_dispatch_date', 'actual_dispatch_date'
+                ).first(),
+            )
+            
+            return Response({
+                'order': {
+                    'id': str(order.id),
+                    'quote_number': order.quote_number,
+                    'project_name': order.project_name,
+                    'status': order.status,
+                    'status_percentage': order.status_percentage,
+                },
+                'materials': materials,
+                'fabrications': fabrications,
+                'surface_treatments': treatments,
+                'inspections': inspections,
+                'dispatch': dispatch,
+            })
         
         # Return summary for all active orders
-        active_orders = Order.objects.exclude(
+        active_orders, = await gather(lambda: list(Order.objects.exclude(
             status__in=[Order.Status.COMPLETED, Order.Status.CANCELLED]
         ).values(
             'id', 'quote_number', 'project_name', 'status',
             'status_percentage', 'expected_delivery_date'
-        )
+        )))
         
-        return Response({'active_orders': list(active_orders)})
+        return Response({'active_orders': active_orders})
+
+
+class OrderWorkspaceView(ReplicaReadMixin, views.APIView):
+    """
+    Everything the order detail page needs in one request.
+
+    Sections are loaded with select_related/Prefetch, so the query count is
+    fixed regardless of how many records the order has:
+
+        ?include=order,materials    only build these sections (default: all)
+        ?fields=id,status,...       keep only these fields in every section
+                                    (see apps.core.serializers.SparseFieldsMixin)
+        ?history_page=2&history_page_size=20
+        ?logs_page=1&logs_page_size=20
+
+    Status history and fabrication logs grow without bound, so they are
+    returned as paginated sections instead of nested lists.
+    """
+    permission_classes = [IsAuthenticated]
+
+    SECTIONS = [
+        'order', 'drawings', 'materials', 'fabrication', 'fabrication_logs',
+        'production', 'surface_treatments', 'inspections', 'dispatch', 'status_history',
+    ]
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    @query_budget(16)
+    def get(self, request, pk):
+        include = self.get_sections(request)
+        if include is None:
+            return Response(
+                {'detail': f'include must be a comma separated subset of: {", ".join(self.SECTIONS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            order = self.get_queryset(include).get(pk=pk)
+        except Order.DoesNotExist:
+            return Response(
+                {'detail': 'Order not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        context = {'request': request}
+        dispatch = self.get_one_to_one(order, 'dispatch')
+        builders = {
+            'order': lambda: WorkspaceOrderSerializer(order, context=context),
+            'drawings': lambda: DrawingListSerializer(order.drawings.all(), many=True, context=context),
+            'materials': lambda: OrderMaterialSerializer(order.materials.all(), many=True, context=context),
+            'fabrication': lambda: WorkspaceFabricationSerializer(
+                order.fabrication_processes.all(), many=True, context=context
+            ),
+            'production': lambda: ProductionRecordSerializer(
+                order.production_records.all(), many=True, context=context
+            ),
+            'surface_treatments': lambda: OrderSurfaceTreatmentSerializer(
+                order.surface_treatments.all(), many=True, context=context
+            ),
+            'inspections': lambda: OrderInspectionSerializer(
+                order.inspections.all(), many=True, context=context, expand=['checklist_items']
+            ),
+            'dispatch': lambda: (
+                OrderDispatchSerializer(dispatch, context=context, expand=['documents']) if dispatch else None
+            ),
+        }
+
+        data = {}
+        for section, build in builders.items():
+            if section not in include:
+                continue
+            serializer = build()
+            data[section] = serializer.data if serializer is not None else None
 
+        if 'production' in include:
+            summary = self.get_one_to_one(order, 'production_summary')
+            data['production_summary'] = (
+                ProductionSummarySerializer(summary, context=context).data if summary else None
+            )
+        if 'status_history' in include:
+            data['status_history'] = self.paginate(
+                request, 'history',
+                OrderStatusHistory.objects.filter(order=order).select_related('changed_by'),
+                OrderStatusHistorySerializer,
+            )
+        if 'fabrication_logs' in include:
+            data['fabrication_logs'] = self.paginate(
+                request, 'logs',
+                FabricationLog.objects.filter(order_fabrication__order=order).select_related('logged_by'),
+                FabricationLogSerializer,
+            )
+        return Response(data)
+
+    def get_sections(self, request):
+        requested = self.parse_list(request.query_params.get('include'))
+        if not requested:
+            return set(self.SECTIONS)
+        if not requested <= set(self.SECTIONS):
+            return None
+        return requested
+
+    def get_queryset(self, include):
+        queryset = Order.objects.select_related('customer', 'created_by', 'assigned_to')
+        prefetches = []
+        if 'dispatch' in include or 'inspections' in include:
+            queryset = queryset.select_related(
+                'dispatch', 'dispatch__packing_standard', 'dispatch__packed_by', 'dispatch__dispatched_by'
+            )
+        if 'dispatch' in include:
+            prefetches.append(Prefetch(
+                'dispatch__documents',
+                DispatchDocument.objects.select_related('uploaded_by')
+            ))
+        if 'production' in include:
+            queryset = queryset.select_related('production_summary')
+            prefetches.append(Prefetch(
+                'production_records',
+                ProductionRecord.objects.select_related('recorded_by', 'verified_by')
+            ))
+        if 'drawings' in include:
+            prefetches.append(Prefetch(
+                'drawings',
+                Drawing.objects.filter(is_latest=True).select_related('created_by')
+            ))
+        if 'materials' in include:
+            prefetches.append(Prefetch(
+                'materials',
+                OrderMaterial.objects.select_related('material', 'created_by', 'issued_by')
+            ))
+        if 'fabrication' in include:
+            prefetches.append(Prefetch(
+                'fabrication_processes',
+                OrderFabrication.objects.select_related('process', 'operator')
+            ))
+        if 'surface_treatments' in include:
+            prefetches.append(Prefetch(
+                'surface_treatments',
+                OrderSurfaceTreatment.objects.select_related('treatment_type', 'created_by')
+            ))
+        if 'inspections' in include or 'dispatch' in include:
+            # Dispatch.can_dispatch reads the order's prefetched inspections
+            prefetches.append(Prefetch(
+                'inspections',
+                OrderInspection.objects.select_related(
+                    'inspection_type', 'inspected_by', 'qa_approved_by'
+                ).prefetch_related('checklist_items')
+            ))
+        return queryset.prefetch_related(*prefetches)
+
+    def paginate(self, request, prefix, queryset, serializer_class):
+        page = self.parse_positive_int(request.query_params.get(f'{prefix}_page'), 1)
+        page_size = min(
+            self.parse_positive_int(request.query_params.get(f'{prefix}_page_size'), self.DEFAULT_PAGE_SIZE),
+            self.MAX_PAGE_SIZE
+        )
+        count = queryset.count()
+        offset = (page - 1) * page_size
+        serializer = serializer_class(
+            queryset[offset:offset + page_size], many=True, context={'request': request}
+        )
+        return {
+            'count': count,
+            'page': page,
+            'page_size': page_size,
+            'has_next': offset + page_size < count,
+            'results': serializer.data if count > offset else [],
+        }
 
-class DelayedOrdersView(views.APIView):
+    @staticmethod
+    def get_one_to_one(order, name):
+        try:
+            return getattr(order, name)
+        except ObjectDoesNotExist:
+            return None
+
+    @staticmethod
+    def parse_list(value):
+        return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+    @staticmethod
+    def parse_positive_int(value, default):
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            return default
+        return number if number > 0 else default
+
+
+class DelayedOrdersView(ReplicaReadMixin, views.APIView):
     """Get delayed orders with details."""
     permission_classes = [IsAuthenticated]
 
@@ -187,51 +380,47 @@ class DelayedOrdersView(views.APIView):
         })
 
 
-class ProductionAnalyticsView(views.APIView):
+class ProductionAnalyticsView(ReplicaReadMixin, AsyncAPIView):
     """Production yield and rejection analysis."""
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         days = int(request.query_params.get('days', 30))
         start_date = timezone.now().date() - timedelta(days=days)
-        
-        # Daily production trends
-        daily_production = ProductionRecord.objects.filter(
-            production_date__gte=start_date
-        ).values('production_date').annotate(
-            total_produced=Sum('produced_quantity'),
-            total_ok=Sum('ok_quantity'),
-            total_rework=Sum('rework_quantity'),
-            total_rejection=Sum('rejection_quantity'),
-            avg_yield=Avg('total_yield_percentage')
-        ).order_by('production_date')
-        
-        # Overall statistics
-        overall = ProductionRecord.objects.filter(
-            production_date__gte=start_date
-        ).aggregate(
-            total_produced=Sum('produced_quantity'),
-            total_ok=Sum('ok_quantity'),
-            total_rework=Sum('rework_quantity'),
-            total_rejection=Sum('rejection_quantity'),
-            avg_yield=Avg('total_yield_percentage'),
-            avg_ok_percentage=Avg('ok_percentage'),
-            avg_rejection_percentage=Avg('rejection_percentage')
+        records = ProductionRecord.objects.filter(production_date__gte=start_date)
+        
+        daily_production, overall, rejection_by_order = await gather(
+            # Daily production trends
+            lambda: list(records.values('production_date').annotate(
+                total_produced=Sum('produced_quantity'),
+                total_ok=Sum('ok_quantity'),
+                total_rework=Sum('rework_quantity'),
+                total_rejection=Sum('rejection_quantity'),
+                avg_yield=Avg('total_yield_percentage')
+            ).order_by('production_date')),
+            # Overall statistics
+            lambda: records.aggregate(
+                total_produced=Sum('produced_quantity'),
+                total_ok=Sum('ok_quantity'),
+                total_rework=Sum('rework_quantity'),
+                total_rejection=Sum('rejection_quantity'),
+                avg_yield=Avg('total_yield_percentage'),
+                avg_ok_percentage=Avg('ok_percentage'),
+                avg_rejection_percentage=Avg('rejection_percentage')
+            ),
+            # Top rejection reasons (if tracked)
+            lambda: list(records.filter(
+                rejection_quantity__gt=0
+            ).values(
+                'order__quote_number', 'order__project_name'
+            ).annotate(
+                total_rejection=Sum('rejection_quantity')
+            ).order_by('-total_rejection')[:10]),
         )
         
-        # Top rejection reasons (if tracked)
-        rejection_by_order = ProductionRecord.objects.filter(
-            production_date__gte=start_date,
-            rejection_quantity__gt=0
-        ).values(
-            'order__quote_number', 'order__project_name'
-        ).annotate(
-            total_rejection=Sum('rejection_quantity')
-        ).order_by('-total_rejection')[:10]
-        
         return Response({
             'period_days': days,
-            'daily_trends': list(daily_production),
+            'daily_trends': daily_production,
             'overall_statistics': {
                 'total_produced': overall['total_produced'] or 0,
                 'total_ok': overall['total_ok'] or 0,
@@ -241,11 +430,11 @@ class ProductionAnalyticsView(views.APIView):
                 'avg_ok_percentage': round(overall['avg_ok_percentage'] or 0, 2),
                 'avg_rejection_percentage': round(overall['avg_rejection_percentage'] or 0, 2),
             },
-            'top_rejections_by_order': list(rejection_by_order)
+            'top_rejections_by_order': rejection_by_order
         })
 
 
-class DepartmentPerformanceView(views.APIView):
+class DepartmentPerformanceView(ReplicaReadMixin, views.APIView):
     """Department-wise performance metrics."""
     permission_classes = [IsAuthenticated]
 
@@ -253,68 +442,67 @@ class DepartmentPerformanceView(views.APIView):
         today = timezone.now().date()
         thirty_days_ago = today - timedelta(days=30)
         
-        # Fabrication Performance
-        fabrication_stats = OrderFabrication.objects.filter(
-            created_at__date__gte=thirty_days_ago
-        ).values('process__name').annotate(
-            total_orders=Count('id'),
-            completed=Count('id', filter=Q(status='completed')),
-            in_progress=Count('id', filter=Q(status='in_progress')),
-            avg_completion=Avg(
-                F('completed_quantity') * 100.0 / F('planned_quantity'),
-                filter=Q(planned_quantity__gt=0)
-            )
-        )
-        
-        # Inspection Performance
-        inspection_stats = OrderInspection.objects.filter(
-            created_at__date__gte=thirty_days_ago
-        ).aggregate(
-            total_inspections=Count('id'),
-            passed=Count('id', filter=Q(result='pass')),
-            failed=Count('id', filter=Q(result='fail')),
-            pending_approval=Count('id', filter=Q(is_qa_approved=False)),
-            avg_pass_rate=Avg(
-                F('passed_quantity') * 100.0 / F('inspected_quantity'),
-                filter=Q(inspected_quantity__gt=0)
-            )
-        )
-        
-        # Logistics Performance
-        dispatch_stats = OrderDispatch.objects.filter(
-            created_at__date__gte=thirty_days_ago
-        ).aggregate(
-            total_dispatches=Count('id'),
-            dispatched=Count('id', filter=Q(status='dispatched')),
-            delivered=Count('id', filter=Q(status='delivered')),
-            pending=Count('id', filter=Q(status__in=['pending', 'packing', 'packed', 'ready'])),
-            delayed=Count(
-                'id',
-                filter=Q(planned_dispatch_date__lt=today) & ~Q(status__in=['dispatched', 'in_transit', 'delivered'])
-            )
+        results = fan_out(
+            # Fabrication Performance
+            fabrication=lambda: list(OrderFabrication.objects.filter(
+                created_at__date__gte=thirty_days_ago
+            ).values('process__name').annotate(
+                total_orders=Count('id'),
+                completed=Count('id', filter=Q(status='completed')),
+                in_progress=Count('id', filter=Q(status='in_progress')),
+                avg_completion=Avg(
+                    F('completed_quantity') * 100.0 / F('planned_quantity'),
+                    filter=Q(planned_quantity__gt=0)
+                )
+            )),
+            # Inspection Performance
+            inspection=lambda: OrderInspection.objects.filter(
+                created_at__date__gte=thirty_days_ago
+            ).aggregate(
+                total_inspections=Count('id'),
+                passed=Count('id', filter=Q(result='pass')),
+                failed=Count('id', filter=Q(result='fail')),
+                pending_approval=Count('id', filter=Q(is_qa_approved=False)),
+                avg_pass_rate=Avg(
+                    F('passed_quantity') * 100.0 / F('inspected_quantity'),
+                    filter=Q(inspected_quantity__gt=0)
+                )
+            ),
+            # Logistics Performance
+            logistics=lambda: OrderDispatch.objects.filter(
+                created_at__date__gte=thirty_days_ago
+            ).aggregate(
+                total_dispatches=Count('id'),
+                dispatched=Count('id', filter=Q(status='dispatched')),
+                delivered=Count('id', filter=Q(status='delivered')),
+                pending=Count('id', filter=Q(status__in=['pending', 'packing', 'packed', 'ready'])),
+                delayed=Count(
+                    'id',
+                    filter=Q(planned_dispatch_date__lt=today) & ~Q(status__in=['dispatched', 'in_transit', 'delivered'])
+                )
+            ),
         )
         
         return Response({
-            'fabrication': list(fabrication_stats),
-            'inspection': inspection_stats,
-            'logistics': dispatch_stats
+            'fabrication': results['fabrication'],
+            'inspection': results['inspection'],
+            'logistics': results['logistics']
         })
 
 
-class CustomerSummaryView(views.APIView):
+class CustomerSummaryView(ReplicaReadMixin, AsyncAPIView):
     """Customer-wise order summary."""
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        # Top customers by order value
-        top_customers_value = Customer.objects.annotate(
-            total_orders=Count('orders'),
-            total_value=Sum('orders__total_amount'),
-            active_orders=Count(
-                'orders',
-                filter=~Q(orders__status__in=['completed', 'cancelled'])
-            )
-        ).filter(total_orders__gt=0).order_by('-total_value')[:10]
+    async def get(self, request):
+        top_customers_value, type_distribution = await gather(
+            # Top customers by order value, read off the stored counters
+            lambda: list(Customer.objects.filter(total_orders__gt=0).order_by('-lifetime_value')[:10]),
+            # Customer type distribution
+            lambda: list(Customer.objects.filter(is_active=True).values(
+                'customer_type'
+            ).annotate(count=Count('id'))),
+        )
         
         result = []
         for customer in top_customers_value:
@@ -322,22 +510,17 @@ class CustomerSummaryView(views.APIView):
                 'id': str(customer.id),
                 'name': customer.company_name,
                 'total_orders': customer.total_orders,
-                'total_value': float(customer.total_value or 0),
+                'total_value': float(customer.lifetime_value),
                 'active_orders': customer.active_orders,
             })
         
-        # Customer type distribution
-        type_distribution = Customer.objects.filter(is_active=True).values(
-            'customer_type'
-        ).annotate(count=Count('id'))
-        
         return Response({
             'top_customers': result,
-            'type_distribution': list(type_distribution)
+            'type_distribution': type_distribution
         })
 
 
-class MonthlyTrendsView(views.APIView):
+class MonthlyTrendsView(ReplicaReadMixin, views.APIView):
     """Monthly trends for orders and revenue."""
     permission_classes = [IsAuthenticated]
 
@@ -348,48 +531,48 @@ class MonthlyTrendsView(views.APIView):
         today = timezone.now().date()
         start_date = today - timedelta(days=months * 30)
         
-        # Monthly order trends
-        monthly_orders = Order.objects.filter(
-            created_at__date__gte=start_date
-        ).annotate(
-            month=TruncMonth('created_at')
-        ).values('month').annotate(
-            total_orders=Count('id'),
-            total_value=Sum('total_amount'),
-            completed=Count('id', filter=Q(status='completed')),
-            cancelled=Count('id', filter=Q(status='cancelled'))
-        ).order_by('month')
-        
-        # Monthly production
-        monthly_production = ProductionRecord.objects.filter(
-            production_date__gte=start_date
-        ).annotate(
-            month=TruncMonth('production_date')
-        ).values('month').annotate(
-            total_produced=Sum('produced_quantity'),
-            total_ok=Sum('ok_quantity'),
-            total_rejection=Sum('rejection_quantity'),
-            avg_yield=Avg('total_yield_percentage')
-        ).order_by('month')
-        
-        # Monthly dispatch
-        monthly_dispatch = OrderDispatch.objects.filter(
-            created_at__date__gte=start_date
-        ).annotate(
-            month=TruncMonth('created_at')
-        ).values('month').annotate(
-            total_dispatched=Count('id', filter=Q(status='dispatched')),
-            total_delivered=Count('id', filter=Q(status='delivered'))
-        ).order_by('month')
+        results = fan_out(
+            # Monthly order trends
+            orders=lambda: list(Order.objects.filter(
+                created_at__date__gte=start_date
+            ).annotate(
+                month=TruncMonth('created_at')
+            ).values('month').annotate(
+                total_orders=Count('id'),
+                total_value=Sum('total_amount'),
+                completed=Count('id', filter=Q(status='completed')),
+                cancelled=Count('id', filter=Q(status='cancelled'))
+            ).order_by('month')),
+            # Monthly production
+            production=lambda: list(ProductionRecord.objects.filter(
+                production_date__gte=start_date
+            ).annotate(
+                month=TruncMonth('production_date')
+            ).values('month').annotate(
+                total_produced=Sum('produced_quantity'),
+                total_ok=Sum('ok_quantity'),
+                total_rejection=Sum('rejection_quantity'),
+                avg_yield=Avg('total_yield_percentage')
+            ).order_by('month')),
+            # Monthly dispatch
+            dispatch=lambda: list(OrderDispatch.objects.filter(
+                created_at__date__gte=start_date
+            ).annotate(
+                month=TruncMonth('created_at')
+            ).values('month').annotate(
+                total_dispatched=Count('id', filter=Q(status='dispatched')),
+                total_delivered=Count('id', filter=Q(status='delivered'))
+            ).order_by('month')),
+        )
         
         return Response({
-            'orders': list(monthly_orders),
-            'production': list(monthly_production),
-            'dispatch': list(monthly_dispatch)
+            'orders': results['orders'],
+            'production': results['production'],
+            'dispatch': results['dispatch']
         })
 
 
-class WeeklyProductionView(views.APIView):
+class WeeklyProductionView(ReplicaReadMixin, views.APIView):
     """Weekly production summary."""
     permission_classes = [IsAuthenticated]
 
@@ -416,50 +599,49 @@ class WeeklyProductionView(views.APIView):
         })
 
 
-class RealTimeStatusView(views.APIView):
+class RealTimeStatusView(ReplicaReadMixin, views.APIView):
     """Real-time status of ongoing activities."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         today = timezone.now().date()
         
-        # Today's production
-        today_production = ProductionRecord.objects.filter(
-            production_date=today
-        ).aggregate(
-            total_produced=Sum('produced_quantity'),
-            total_ok=Sum('ok_quantity'),
-            total_rejection=Sum('rejection_quantity')
+        results = fan_out(
+            # Today's production
+            today_production=lambda: ProductionRecord.objects.filter(
+                production_date=today
+            ).aggregate(
+                total_produced=Sum('produced_quantity'),
+                total_ok=Sum('ok_quantity'),
+                total_rejection=Sum('rejection_quantity')
+            ),
+            # In-progress fabrications
+            active_fabrications=lambda: list(OrderFabrication.objects.filter(
+                status='in_progress'
+            ).select_related('order', 'process').values(
+                'order__quote_number', 'process__name', 'completed_quantity', 'planned_quantity'
+            )[:10]),
+            # Pending inspections
+            pending_inspections=lambda: list(OrderInspection.objects.filter(
+                result='pending'
+            ).select_related('order', 'inspection_type').values(
+                'order__quote_number', 'inspection_type__name'
+            )[:10]),
+            # Ready for dispatch
+            ready_dispatch=lambda: list(OrderDispatch.objects.filter(
+                status__in=['packed', 'ready']
+            ).select_related('order').values(
+                'order__quote_number', 'order__project_name', 'planned_dispatch_date'
+            )[:10]),
+            # Pending QA approvals
+            pending_qa=lambda: list(OrderInspection.objects.filter(
+                is_qa_approved=False,
+                result__in=['pass', 'conditional']
+            ).select_related('order').values(
+                'order__quote_number', 'inspection_type__name', 'inspected_at'
+            )[:10]),
         )
-        
-        # In-progress fabrications
-        active_fabrications = OrderFabrication.objects.filter(
-            status='in_progress'
-        ).select_related('order', 'process').values(
-            'order__quote_number', 'process__name', 'completed_quantity', 'planned_quantity'
-        )[:10]
-        
-        # Pending inspections
-        pending_inspections = OrderInspection.objects.filter(
-            result='pending'
-        ).select_related('order', 'inspection_type').values(
-            'order__quote_number', 'inspection_type__name'
-        )[:10]
-        
-        # Ready for dispatch
-        ready_dispatch = OrderDispatch.objects.filter(
-            status__in=['packed', 'ready']
-        ).select_related('order').values(
-            'order__quote_number', 'order__project_name', 'planned_dispatch_date'
-        )[:10]
-        
-        # Pending QA approvals
-        pending_qa = OrderInspection.objects.filter(
-            is_qa_approved=False,
-            result__in=['pass', 'conditional']
-        ).select_related('order').values(
-            'order__quote_number', 'inspection_type__name', 'inspected_at'
-        )[:10]
+        today_production = results['today_production']
         
         return Response({
             'today_production': {
@@ -467,8 +649,8 @@ class RealTimeStatusView(views.APIView):
                 'total_ok': today_production['total_ok'] or 0,
                 'total_rejection': today_production['total_rejection'] or 0,
             },
-            'active_fabrications': list(active_fabrications),
-            'pending_inspections': list(pending_inspections),
-            'ready_for_dispatch': list(ready_dispatch),
-            'pending_qa_approvals': list(pending_qa)
+            'active_fabrications': results['active_fabrications'],
+            'pending_inspections': results['pending_inspections'],
+            'ready_for_dispatch': results['ready_dispatch'],
+            'pending_qa_approvals': results['pending_qa']
         })
\ No newline at end of file
@@ -3,10 +3,12 @@ Serializers for Engineering app.
 """
 
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import Drawing, DrawingComment
+from apps.core.serializers import SparseFieldsMixin
 
 
-class DrawingCommentSerializer(serializers.ModelSerializer):
+class DrawingCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for drawing comments."""
 
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -17,7 +19,7 @@ class DrawingCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
 
-class DrawingListSerializer(serializers.ModelSerializer):
+class DrawingListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for drawing list view."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -34,6 +36,7 @@ class DrawingListSerializer(serializers.ModelSerializer):
             'is_latest', 'status', 'status_display', 'file_url', 'file_size',
             'file_type', 'created_by_name', 'created_at'
         ]
+        field_dependencies = {'file_url': ['file']}
 
     def get_file_url(self, obj):
         request = self.context.get('request')
@@ -42,7 +45,7 @@ class DrawingListSerializer(serializers.ModelSerializer):
         return None
 
 
-class DrawingDetailSerializer(serializers.ModelSerializer):
+class DrawingDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for drawing detail view."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -62,6 +65,13 @@ class DrawingDetailSerializer(serializers.ModelSerializer):
             'id', 'file_size', 'file_type', 'created_by', 'approved_by',
             'approved_at', 'created_at', 'updated_at'
         ]
+        expandable_fields = {
+            'comments': Prefetch('comments', queryset=DrawingComment.objects.select_related('user')),
+        }
+        field_dependencies = {
+            'file_url': ['file'],
+            'revision_count': ['order', 'drawing_number'],
+        }
 
     def get_file_url(self, obj):
         request = self.context.get('request')
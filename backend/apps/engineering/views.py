@@ -19,9 +19,10 @@ from .serializers import (
     DrawingCommentSerializer
 )
 from apps.accounts.permissions import IsEngineering, IsAdmin
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class DrawingViewSet(viewsets.ModelViewSet):
+class DrawingViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing drawings."""
     
     queryset = Drawing.objects.all()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-19 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fabrication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fabricationlog',
+            index=models.Index(fields=['order_fabrication', 'created_at'], name='fabrication_order_f_0079a2_idx'),
+        ),
+    ]
@@ -167,6 +167,9 @@ class FabricationLog(models.Model):
         verbose_name = _('Fabrication Log')
         verbose_name_plural = _('Fabrication Logs')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['order_fabrication', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.order_fabrication} - {self.new_status}"
\ No newline at end of file
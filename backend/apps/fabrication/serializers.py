@@ -3,10 +3,15 @@ Serializers for Fabrication app.
 """
 
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import FabricationProcess, OrderFabrication, FabricationLog
+from apps.core.serializers import SparseFieldsMixin
 
+# Nested logs are capped; the full history is served by FabricationLogViewSet
+RECENT_LOGS_LIMIT = 10
 
-class FabricationProcessSerializer(serializers.ModelSerializer):
+
+class FabricationProcessSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for FabricationProcess model."""
 
     category_display = serializers.CharField(source='get_category_display', read_only=True)
@@ -17,7 +22,7 @@ class FabricationProcessSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class FabricationLogSerializer(serializers.ModelSerializer):
+class FabricationLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for FabricationLog model."""
 
     logged_by_name = serializers.CharField(source='logged_by.get_full_name', read_only=True)
@@ -30,7 +35,7 @@ class FabricationLogSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'logged_by', 'created_at']
 
 
-class OrderFabricationSerializer(serializers.ModelSerializer):
+class OrderFabricationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderFabrication model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -41,7 +46,7 @@ class OrderFabricationSerializer(serializers.ModelSerializer):
     completion_percentage = serializers.FloatField(read_only=True)
     is_delayed = serializers.BooleanField(read_only=True)
     operator_name = serializers.CharField(source='operator.get_full_name', read_only=True)
-    logs = FabricationLogSerializer(many=True, read_only=True)
+    logs = serializers.SerializerMethodField()
 
     class Meta:
         model = OrderFabrication
@@ -50,6 +55,25 @@ class OrderFabricationSerializer(serializers.ModelSerializer):
             'id', 'started_at', 'completed_at', 'created_by',
             'updated_by', 'created_at', 'updated_at'
         ]
+        expandable_fields = {
+            # Windowed prefetch: one query returns the latest logs of every fabrication
+            'logs': Prefetch(
+                'logs',
+                queryset=FabricationLog.objects.select_related('logged_by')[:RECENT_LOGS_LIMIT],
+                to_attr='recent_logs'
+            ),
+        }
+        field_dependencies = {
+            'completion_percentage': ['planned_quantity', 'completed_quantity'],
+            'is_delayed': ['planned_end_date', 'status'],
+        }
+
+    def get_logs(self, obj):
+        """The most recent RECENT_LOGS_LIMIT log entries, newest first."""
+        logs = getattr(obj, 'recent_logs', None)
+        if logs is None:
+            logs = obj.logs.select_related('logged_by')[:RECENT_LOGS_LIMIT]
+        return FabricationLogSerializer(logs, many=True, context=self.context).data
 
 
 class OrderFabricationCreateSerializer(serializers.ModelSerializer):
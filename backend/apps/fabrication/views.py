@@ -18,10 +18,11 @@ from .serializers import (
     BulkFabricationCreateSerializer
 )
 from apps.accounts.permissions import IsProduction
+from apps.core.serializers import SparseQuerysetMixin
 from apps.crm.models import Order
 
 
-class FabricationProcessViewSet(viewsets.ModelViewSet):
+class FabricationProcessViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing fabrication processes."""
     
     queryset = FabricationProcess.objects.all()
@@ -34,16 +35,17 @@ class FabricationProcessViewSet(viewsets.ModelViewSet):
     ordering = ['sequence_order']
 
 
-class OrderFabricationViewSet(viewsets.ModelViewSet):
+class OrderFabricationViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing order fabrications."""
     
-    queryset = OrderFabrication.objects.all()
+    queryset = OrderFabrication.objects.select_related('order', 'process', 'operator')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['order', 'process', 'status', 'operator']
     search_fields = ['order__quote_number', 'process__name', 'machine']
     ordering_fields = ['process__sequence_order', 'created_at', 'status']
     ordering = ['process__sequence_order']
+    query_budgets = {'by_order': 3, 'in_progress': 3, 'delayed': 3}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -169,9 +171,10 @@ class OrderFabricationViewSet(viewsets.ModelViewSet):
         
         fabrications = OrderFabrication.objects.filter(
             order_id=order_id
-        ).select_related('process', 'operator')
+        ).select_related('order', 'process', 'operator')
+        fabrications = self.sparse_queryset(fabrications, OrderFabricationSerializer)
         
-        serializer = OrderFabricationSerializer(fabrications, many=True)
+        serializer = OrderFabricationSerializer(fabrications, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'])
@@ -218,8 +221,9 @@ class OrderFabricationViewSet(viewsets.ModelViewSet):
         fabrications = OrderFabrication.objects.filter(
             status=OrderFabrication.Status.IN_PROGRESS
         ).select_related('order', 'process', 'operator')
+        fabrications = self.sparse_queryset(fabrications, OrderFabricationSerializer)
         
-        serializer = OrderFabricationSerializer(fabrications, many=True)
+        serializer = OrderFabricationSerializer(fabrications, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -230,16 +234,17 @@ class OrderFabricationViewSet(viewsets.ModelViewSet):
             planned_end_date__lt=today
         ).exclude(
             status__in=[OrderFabrication.Status.COMPLETED, OrderFabrication.Status.SKIPPED]
-        ).select_related('order', 'process')
+        ).select_related('order', 'process', 'operator')
+        fabrications = self.sparse_queryset(fabrications, OrderFabricationSerializer)
         
-        serializer = OrderFabricationSerializer(fabrications, many=True)
+        serializer = OrderFabricationSerializer(fabrications, many=True, context={'request': request})
         return Response(serializer.data)
 
 
-class FabricationLogViewSet(viewsets.ReadOnlyModelViewSet):
+class FabricationLogViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing fabrication logs."""
     
-    queryset = FabricationLog.objects.all()
+    queryset = FabricationLog.objects.select_related('logged_by')
     serializer_class = FabricationLogSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
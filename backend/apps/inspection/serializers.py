@@ -4,9 +4,10 @@ Serializers for Inspection app.
 
 from rest_framework import serializers
 from .models import InspectionType, OrderInspection, InspectionChecklist
+from apps.core.serializers import SparseFieldsMixin
 
 
-class InspectionTypeSerializer(serializers.ModelSerializer):
+class InspectionTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for InspectionType model."""
 
     stage_display = serializers.CharField(source='get_stage_display', read_only=True)
@@ -17,7 +18,7 @@ class InspectionTypeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class InspectionChecklistSerializer(serializers.ModelSerializer):
+class InspectionChecklistSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for InspectionChecklist model."""
 
     class Meta:
@@ -26,7 +27,7 @@ class InspectionChecklistSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class OrderInspectionSerializer(serializers.ModelSerializer):
+class OrderInspectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderInspection model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -46,6 +47,11 @@ class OrderInspectionSerializer(serializers.ModelSerializer):
             'id', 'is_qa_approved', 'qa_approved_by', 'qa_approved_at',
             'inspected_by', 'created_at', 'updated_at'
         ]
+        expandable_fields = {'checklist_items': 'checklist_items'}
+        field_dependencies = {
+            'pass_rate': ['inspected_quantity', 'passed_quantity'],
+            'can_dispatch': ['inspection_type', 'is_qa_approved', 'result'],
+        }
 
 
 class OrderInspectionCreateSerializer(serializers.ModelSerializer):
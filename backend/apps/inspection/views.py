@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Avg, Sum,Count
 from .models import InspectionType, OrderInspection, InspectionChecklist
 from .serializers import (
@@ -19,9 +20,10 @@ from .serializers import (
     QAApprovalSerializer
 )
 from apps.accounts.permissions import IsQuality
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class InspectionTypeViewSet(viewsets.ModelViewSet):
+class InspectionTypeViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing inspection types."""
     
     queryset = InspectionType.objects.all()
@@ -34,16 +36,19 @@ class InspectionTypeViewSet(viewsets.ModelViewSet):
     ordering = ['stage', 'name']
 
 
-class OrderInspectionViewSet(viewsets.ModelViewSet):
+class OrderInspectionViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing order inspections."""
     
-    queryset = OrderInspection.objects.all()
+    queryset = OrderInspection.objects.select_related(
+        'order', 'inspection_type', 'inspected_by', 'qa_approved_by'
+    )
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['order', 'inspection_type', 'result', 'is_qa_approved', 'inspected_by']
     search_fields = ['order__quote_number', 'inspection_type__name']
     ordering_fields = ['inspection_date', 'created_at', 'result']
     ordering = ['-inspection_date', '-created_at']
+    query_budgets = {'pending_approval': 4, 'failed_inspections': 4}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -58,6 +63,7 @@ class OrderInspectionViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def qa_approve(self, request, pk=None):
         """QA approval for inspection."""
         inspection = self.get_object()
@@ -104,9 +110,12 @@ class OrderInspectionViewSet(viewsets.ModelViewSet):
         inspections = OrderInspection.objects.filter(
             is_qa_approved=False,
             result__in=[OrderInspection.Result.PASS, OrderInspection.Result.CONDITIONAL]
-        ).select_related('order', 'inspection_type')
+        ).select_related(
+            'order', 'inspection_type', 'inspected_by', 'qa_approved_by'
+        )
+        inspections = self.sparse_queryset(inspections, OrderInspectionSerializer)
         
-        serializer = OrderInspectionSerializer(inspections, many=True)
+        serializer = OrderInspectionSerializer(inspections, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -114,9 +123,12 @@ class OrderInspectionViewSet(viewsets.ModelViewSet):
         """Get failed inspections."""
         inspections = OrderInspection.objects.filter(
             result__in=[OrderInspection.Result.FAIL, OrderInspection.Result.REWORK]
-        ).select_related('order', 'inspection_type')
+        ).select_related(
+            'order', 'inspection_type', 'inspected_by', 'qa_approved_by'
+        )
+        inspections = self.sparse_queryset(inspections, OrderInspectionSerializer)
         
-        serializer = OrderInspectionSerializer(inspections, many=True)
+        serializer = OrderInspectionSerializer(inspections, many=True, context={'request': request})
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -175,9 +175,17 @@ class OrderDispatch(models.Model):
         """Check if order can be dispatched (QA approved)."""
         from apps.inspection.models import OrderInspection, InspectionType
         
-        pdi_inspection = self.order.inspections.filter(
-            inspection_type__stage=InspectionType.Stage.PDI
-        ).first()
+        prefetched = getattr(self.order, '_prefetched_objects_cache', {}).get('inspections')
+        if prefetched is not None:
+            # Use inspections prefetched by list views instead of a query per row
+            pdi_inspection = next(
+                (i for i in prefetched if i.inspection_type.stage == InspectionType.Stage.PDI),
+                None
+            )
+        else:
+            pdi_inspection = self.order.inspections.filter(
+                inspection_type__stage=InspectionType.Stage.PDI
+            ).first()
         
         if pdi_inspection:
             return pdi_inspection.is_qa_approved and pdi_inspection.result == OrderInspection.Result.PASS
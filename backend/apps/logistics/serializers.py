@@ -3,10 +3,12 @@ Serializers for Logistics app.
 """
 
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import PackingStandard, OrderDispatch, DispatchDocument
+from apps.core.serializers import SparseFieldsMixin
 
 
-class PackingStandardSerializer(serializers.ModelSerializer):
+class PackingStandardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for PackingStandard model."""
 
     class Meta:
@@ -15,7 +17,7 @@ class PackingStandardSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class DispatchDocumentSerializer(serializers.ModelSerializer):
+class DispatchDocumentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for DispatchDocument model."""
 
     document_type_display = serializers.CharField(source='get_document_type_display', read_only=True)
@@ -26,6 +28,7 @@ class DispatchDocumentSerializer(serializers.ModelSerializer):
         model = DispatchDocument
         fields = '__all__'
         read_only_fields = ['id', 'uploaded_by', 'created_at']
+        field_dependencies = {'file_url': ['file']}
 
     def get_file_url(self, obj):
         request = self.context.get('request')
@@ -34,7 +37,7 @@ class DispatchDocumentSerializer(serializers.ModelSerializer):
         return None
 
 
-class OrderDispatchSerializer(serializers.ModelSerializer):
+class OrderDispatchSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderDispatch model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -57,6 +60,13 @@ class OrderDispatchSerializer(serializers.ModelSerializer):
             'id', 'dispatched_at', 'delivered_at', 'packed_by',
             'dispatched_by', 'created_by', 'created_at', 'updated_at'
         ]
+        expandable_fields = {
+            'documents': Prefetch('documents', queryset=DispatchDocument.objects.select_related('uploaded_by')),
+        }
+        field_dependencies = {
+            'can_dispatch': ['order', 'status'],
+            'is_delayed': ['planned_dispatch_date', 'status'],
+        }
 
 
 class OrderDispatchCreateSerializer(serializers.ModelSerializer):
@@ -8,6 +8,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from .models import PackingStandard, OrderDispatch, DispatchDocument
 from .serializers import (
@@ -19,10 +21,12 @@ from .serializers import (
     DispatchActionSerializer
 )
 from apps.accounts.permissions import IsLogistics
+from apps.core.serializers import SparseQuerysetMixin
 from apps.crm.models import Order
+from apps.inspection.models import OrderInspection
 
 
-class PackingStandardViewSet(viewsets.ModelViewSet):
+class PackingStandardViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing packing standards."""
     
     queryset = PackingStandard.objects.all()
@@ -34,7 +38,7 @@ class PackingStandardViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class OrderDispatchViewSet(viewsets.ModelViewSet):
+class OrderDispatchViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing order dispatches."""
     
     queryset = OrderDispatch.objects.all()
@@ -47,6 +51,7 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ['planned_dispatch_date', 'actual_dispatch_date', 'created_at', 'status']
     ordering = ['-created_at']
+    query_budgets = {'pending_dispatch': 5, 'in_transit': 5, 'delayed': 5}
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -55,8 +60,22 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
             return OrderDispatchUpdateSerializer
         return OrderDispatchSerializer
 
+    def with_serializer_relations(self, queryset):
+        """Load everything OrderDispatchSerializer touches in a fixed number of queries."""
+        return queryset.select_related(
+            'order', 'order__customer', 'packing_standard', 'packed_by', 'dispatched_by'
+        ).prefetch_related(
+            Prefetch(
+                'order__inspections',
+                queryset=OrderInspection.objects.select_related('inspection_type')
+            )
+        )
+
+    def get_queryset(self):
+        return self.with_serializer_relations(OrderDispatch.objects.all())
+
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy', 'start_packing', 'mark_packed', 'dispatch', 'mark_delivered']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'start_packing', 'mark_packed', 'dispatch_order', 'mark_delivered']:
             return [IsAuthenticated(), IsLogistics()]
         return [IsAuthenticated()]
 
@@ -121,8 +140,9 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
         
         return Response(OrderDispatchSerializer(dispatch, context={'request': request}).data)
 
-    @action(detail=True, methods=['post'])
-    def dispatch(self, request, pk=None):
+    @action(detail=True, methods=['post'], url_path='dispatch')
+    @transaction.atomic
+    def dispatch_order(self, request, pk=None):
         """Dispatch the order."""
         dispatch = self.get_object()
         
@@ -176,6 +196,7 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
         return Response(OrderDispatchSerializer(dispatch, context={'request': request}).data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def mark_delivered(self, request, pk=None):
         """Mark order as delivered."""
         dispatch = self.get_object()
@@ -229,7 +250,8 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
                 OrderDispatch.DispatchStatus.PACKED,
                 OrderDispatch.DispatchStatus.READY
             ]
-        ).select_related('order', 'packing_standard')
+        )
+        dispatches = self.sparse_queryset(self.with_serializer_relations(dispatches), OrderDispatchSerializer)
         
         serializer = OrderDispatchSerializer(dispatches, many=True, context={'request': request})
         return Response(serializer.data)
@@ -242,7 +264,8 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
                 OrderDispatch.DispatchStatus.DISPATCHED,
                 OrderDispatch.DispatchStatus.IN_TRANSIT
             ]
-        ).select_related('order')
+        )
+        dispatches = self.sparse_queryset(self.with_serializer_relations(dispatches), OrderDispatchSerializer)
         
         serializer = OrderDispatchSerializer(dispatches, many=True, context={'request': request})
         return Response(serializer.data)
@@ -259,7 +282,8 @@ class OrderDispatchViewSet(viewsets.ModelViewSet):
                 OrderDispatch.DispatchStatus.IN_TRANSIT,
                 OrderDispatch.DispatchStatus.DELIVERED
             ]
-        ).select_related('order')
+        )
+        dispatches = self.sparse_queryset(self.with_serializer_relations(dispatches), OrderDispatchSerializer)
         
         serializer = OrderDispatchSerializer(dispatches, many=True, context={'request': request})
         return Response(serializer.data)
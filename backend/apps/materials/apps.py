@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class MaterialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.materials'
-    verbose_name = 'Materials Management'
\ No newline at end of file
+    verbose_name = 'Materials Management'
+
+    def ready(self):
+        import apps.materials.signals  # noqa
\ No newline at end of file
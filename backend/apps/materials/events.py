@@ -0,0 +1,23 @@
+"""
+Change events for Materials app (see apps.core.events).
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from apps.core.events import Event, register
+
+
+@register
+@dataclass(frozen=True)
+class StockMoved(Event):
+    """Stock of a material changed (receipt, issue, return, adjustment or scrap)."""
+
+    event_type = 'materials.StockMoved'
+
+    material_id: str
+    order_id: Optional[str]
+    transaction_type: str
+    quantity: str
+    stock_before: str
+    stock_after: str
@@ -5,9 +5,10 @@ Serializers for Materials app.
 from rest_framework import serializers
 from decimal import Decimal
 from .models import MaterialType, Material, OrderMaterial, MaterialTransaction
+from apps.core.serializers import SparseFieldsMixin
 
 
-class MaterialTypeSerializer(serializers.ModelSerializer):
+class MaterialTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for MaterialType model."""
 
     material_count = serializers.SerializerMethodField()
@@ -15,12 +16,13 @@ class MaterialTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = MaterialType
         fields = ['id', 'name', 'description', 'is_active', 'material_count', 'created_at']
+        field_dependencies = {'material_count': []}
 
     def get_material_count(self, obj):
         return obj.materials.count()
 
 
-class MaterialListSerializer(serializers.ModelSerializer):
+class MaterialListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for material list view."""
 
     material_type_name = serializers.CharField(source='material_type.name', read_only=True)
@@ -36,9 +38,13 @@ class MaterialListSerializer(serializers.ModelSerializer):
             'unit_price', 'stock_quantity', 'minimum_stock', 'is_low_stock',
             'is_active'
         ]
+        field_dependencies = {
+            'is_low_stock': ['stock_quantity', 'minimum_stock'],
+            'dimensions': ['thickness', 'width', 'length'],
+        }
 
 
-class MaterialDetailSerializer(serializers.ModelSerializer):
+class MaterialDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for material detail view."""
 
     material_type_name = serializers.CharField(source='material_type.name', read_only=True)
@@ -50,6 +56,7 @@ class MaterialDetailSerializer(serializers.ModelSerializer):
         model = Material
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_dependencies = MaterialListSerializer.Meta.field_dependencies
 
 
 class MaterialCreateUpdateSerializer(serializers.ModelSerializer):
@@ -60,7 +67,7 @@ class MaterialCreateUpdateSerializer(serializers.ModelSerializer):
         exclude = ['created_at', 'updated_at']
 
 
-class OrderMaterialSerializer(serializers.ModelSerializer):
+class OrderMaterialSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderMaterial model."""
 
     material_code = serializers.CharField(source='material.code', read_only=True)
@@ -80,6 +87,10 @@ class OrderMaterialSerializer(serializers.ModelSerializer):
             'id', 'issued_quantity', 'consumed_quantity', 'returned_quantity',
             'status', 'created_by', 'issued_by', 'issued_at', 'created_at', 'updated_at'
         ]
+        field_dependencies = {
+            'pending_quantity': ['required_quantity', 'issued_quantity'],
+            'utilization_percentage': ['consumed_quantity', 'issued_quantity'],
+        }
 
 
 class OrderMaterialCreateSerializer(serializers.ModelSerializer):
@@ -105,7 +116,7 @@ class MaterialIssueSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
 
 
-class MaterialTransactionSerializer(serializers.ModelSerializer):
+class MaterialTransactionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for MaterialTransaction model."""
 
     material_code = serializers.CharField(source='material.code', read_only=True)
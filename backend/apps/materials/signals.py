@@ -0,0 +1,23 @@
+"""
+Signals for Materials app.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.core.events import publish
+from .events import StockMoved
+from .models import MaterialTransaction
+
+
+@receiver(post_save, sender=MaterialTransaction)
+def publish_stock_moved(sender, instance, created, **kwargs):
+    """Publish StockMoved for every new stock ledger entry."""
+    if created:
+        publish(StockMoved(
+            material_id=str(instance.material_id),
+            order_id=str(instance.order_id) if instance.order_id else None,
+            transaction_type=instance.transaction_type,
+            quantity=str(instance.quantity),
+            stock_before=str(instance.stock_before),
+            stock_after=str(instance.stock_after),
+        ))
@@ -7,6 +7,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import Sum, F
 from django.utils import timezone
 from .models import MaterialType, Material, OrderMaterial, MaterialTransaction
@@ -22,9 +23,11 @@ from .serializers import (
     StockAdjustmentSerializer
 )
 from apps.accounts.permissions import IsAdmin
+from apps.core.readers import CompiledReadMixin
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class MaterialTypeViewSet(viewsets.ModelViewSet):
+class MaterialTypeViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing material types."""
     
     queryset = MaterialType.objects.all()
@@ -36,16 +39,17 @@ class MaterialTypeViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class MaterialViewSet(viewsets.ModelViewSet):
+class MaterialViewSet(CompiledReadMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing materials."""
     
-    queryset = Material.objects.all()
+    queryset = Material.objects.select_related('material_type')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['material_type', 'grade', 'unit', 'is_active']
     search_fields = ['code', 'name', 'description', 'grade']
     ordering_fields = ['code', 'name', 'stock_quantity', 'created_at']
     ordering = ['code']
+    query_budgets = {'low_stock': 3}
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -60,11 +64,12 @@ class MaterialViewSet(viewsets.ModelViewSet):
         materials = Material.objects.filter(
             stock_quantity__lte=F('minimum_stock'),
             is_active=True
-        )
+        ).select_related('material_type')
         serializer = MaterialListSerializer(materials, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def adjust_stock(self, request, pk=None):
         """Adjust material stock."""
         material = self.get_object()
@@ -114,10 +119,10 @@ class MaterialViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class OrderMaterialViewSet(viewsets.ModelViewSet):
+class OrderMaterialViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing order materials."""
     
-    queryset = OrderMaterial.objects.all()
+    queryset = OrderMaterial.objects.select_related('order', 'material', 'created_by', 'issued_by')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['order', 'material', 'status']
@@ -131,6 +136,7 @@ class OrderMaterialViewSet(viewsets.ModelViewSet):
         return OrderMaterialSerializer
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def issue(self, request, pk=None):
         """Issue material for an order."""
         order_material = self.get_object()
@@ -186,10 +192,10 @@ class OrderMaterialViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class MaterialTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+class MaterialTransactionViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing material transactions."""
     
-    queryset = MaterialTransaction.objects.all()
+    queryset = MaterialTransaction.objects.select_related('material', 'created_by')
     serializer_class = MaterialTransactionSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
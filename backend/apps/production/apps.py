@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ProductionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.production'
-    verbose_name = 'Production Management'
\ No newline at end of file
+    verbose_name = 'Production Management'
+
+    def ready(self):
+        import apps.production.signals  # noqa
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Change events for Production app (see apps.core.events).
+"""
+
+from dataclasses import dataclass
+
+from apps.core.events import Event, register
+
+
+@register
+@dataclass(frozen=True)
+class ProductionRecorded(Event):
+    """A production record was entered for an order."""
+
+    event_type = 'production.ProductionRecorded'
+
+    record_id: str
+    order_id: str
+    production_date: str
+    shift: str
+    produced_quantity: int
+    ok_quantity: int
+    rework_quantity: int
+    rejection_quantity: int
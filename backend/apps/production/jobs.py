@@ -0,0 +1,17 @@
+"""
+Background jobs for Production app.
+"""
+
+from apps.core.jobs import job
+from apps.crm.models import Order
+from .models import ProductionSummary
+
+
+@job('production.update_summary', priority=10)
+def update_production_summary(order_id):
+    """Recompute an order's production summary from its records."""
+    order = Order.objects.filter(pk=order_id).first()
+    if order is None:
+        return
+    summary, created = ProductionSummary.objects.get_or_create(order=order)
+    summary.update_from_records()
@@ -95,6 +95,11 @@ class ProductionRecord(models.Model):
         return f"{self.order.quote_number} - {self.production_date} ({self.shift})"
 
     def save(self, *args, **kwargs):
+        self.calculate_quantities()
+        super().save(*args, **kwargs)
+
+    def calculate_quantities(self):
+        """Derive produced quantity and percentages from the entered quantities."""
         # Calculate produced quantity
         self.produced_quantity = self.ok_quantity + self.rework_quantity + self.rejection_quantity
         
@@ -111,8 +116,6 @@ class ProductionRecord(models.Model):
             self.rework_percentage = Decimal('0.00')
             self.rejection_percentage = Decimal('0.00')
             self.total_yield_percentage = Decimal('0.00')
-        
-        super().save(*args, **kwargs)
 
 
 class ProductionSummary(models.Model):
@@ -4,9 +4,10 @@ Serializers for Production app.
 
 from rest_framework import serializers
 from .models import ProductionRecord, ProductionSummary
+from apps.core.serializers import SparseFieldsMixin
 
 
-class ProductionRecordSerializer(serializers.ModelSerializer):
+class ProductionRecordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProductionRecord model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -23,6 +24,14 @@ class ProductionRecordSerializer(serializers.ModelSerializer):
             'rejection_percentage', 'total_yield_percentage', 'recorded_by',
             'verified_by', 'verified_at', 'created_at', 'updated_at'
         ]
+        field_dependencies = {
+            'recorded_by_name': [
+                'recorded_by', 'recorded_by__first_name', 'recorded_by__last_name', 'recorded_by__email'
+            ],
+            'verified_by_name': [
+                'verified_by', 'verified_by__first_name', 'verified_by__last_name', 'verified_by__email'
+            ],
+        }
 
 
 class ProductionRecordCreateSerializer(serializers.ModelSerializer):
@@ -52,7 +61,7 @@ class ProductionRecordUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProductionSummarySerializer(serializers.ModelSerializer):
+class ProductionSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProductionSummary model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
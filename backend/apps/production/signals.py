@@ -0,0 +1,25 @@
+"""
+Signals for Production app.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.core.events import publish
+from .events import ProductionRecorded
+from .models import ProductionRecord
+
+
+@receiver(post_save, sender=ProductionRecord)
+def publish_production_recorded(sender, instance, created, **kwargs):
+    """Publish ProductionRecorded for new records."""
+    if created:
+        publish(ProductionRecorded(
+            record_id=str(instance.pk),
+            order_id=str(instance.order_id),
+            production_date=str(instance.production_date),
+            shift=instance.shift,
+            produced_quantity=instance.produced_quantity,
+            ok_quantity=instance.ok_quantity,
+            rework_quantity=instance.rework_quantity,
+            rejection_quantity=instance.rejection_quantity,
+        ))
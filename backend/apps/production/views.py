@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Sum, Avg
 from .models import ProductionRecord, ProductionSummary
 from .serializers import (
@@ -17,12 +18,15 @@ from .serializers import (
     ProductionSummarySerializer
 )
 from apps.accounts.permissions import IsProduction
+from apps.core.jobs import enqueue
+from apps.core.readers import CompiledReadMixin
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class ProductionRecordViewSet(viewsets.ModelViewSet):
+class ProductionRecordViewSet(CompiledReadMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing production records."""
     
-    queryset = ProductionRecord.objects.all()
+    queryset = ProductionRecord.objects.select_related('order', 'recorded_by', 'verified_by')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['order', 'production_date', 'shift', 'recorded_by']
@@ -42,24 +46,22 @@ class ProductionRecordViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsProduction()]
         return [IsAuthenticated()]
 
+    @transaction.atomic
     def perform_create(self, serializer):
         record = serializer.save()
         # Update or create production summary
-        summary, created = ProductionSummary.objects.get_or_create(order=record.order)
-        summary.update_from_records()
+        enqueue('production.update_summary', order_id=str(record.order_id))
 
     def perform_update(self, serializer):
         record = serializer.save()
         # Update production summary
-        if hasattr(record.order, 'production_summary'):
-            record.order.production_summary.update_from_records()
+        enqueue('production.update_summary', order_id=str(record.order_id))
 
     def perform_destroy(self, instance):
-        order = instance.order
+        order_id = instance.order_id
         instance.delete()
         # Update production summary
-        if hasattr(order, 'production_summary'):
-            order.production_summary.update_from_records()
+        enqueue('production.update_summary', order_id=str(order_id))
 
     @action(detail=True, methods=['post'])
     def verify(self, request, pk=None):
@@ -130,10 +132,10 @@ class ProductionRecordViewSet(viewsets.ModelViewSet):
         return Response(list(analysis))
 
 
-class ProductionSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductionSummaryViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing production summaries."""
     
-    queryset = ProductionSummary.objects.all()
+    queryset = ProductionSummary.objects.select_related('order')
     serializer_class = ProductionSummarySerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
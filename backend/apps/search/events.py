@@ -0,0 +1,31 @@
+"""
+Change events for Search app (see apps.core.events).
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from apps.core.events import Event, register, subscribe
+
+from . import index
+
+
+@register
+@dataclass(frozen=True)
+class DocumentChanged(Event):
+    """An indexed object (see index.ENTITIES) was saved or deleted."""
+
+    event_type = 'search.DocumentChanged'
+
+    entity: str
+    object_id: str
+
+
+@subscribe(DocumentChanged, batch=True)
+def update_search_index(events):
+    """Reindex the objects of a delivery batch, once each."""
+    changed = defaultdict(set)
+    for event in events:
+        changed[event.entity].add(event.object_id)
+    for entity, object_ids in changed.items():
+        index.reindex(entity, object_ids)
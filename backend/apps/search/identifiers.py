@@ -0,0 +1,157 @@
+"""
+Identifier lookup for Search app - typeahead over quote numbers, material
+codes, process codes and drawing numbers.
+
+Each identifier is kept in ``Identifier`` and, normalized to lowercase
+letters and digits ("Q-2024-0012" becomes "q20240012"), as every suffix of it
+in ``IdentifierSuffix``. Any part of an identifier is the start of one of its
+suffixes, so looking up what a user has typed so far is one index range scan
+per kind:
+
+    WHERE kind = 'order' AND suffix >= 'q20240' AND suffix < 'q20241'
+    ORDER BY suffix LIMIT 20
+
+That reads only the rows it returns, however large the tables, instead of a
+LIKE '%...%' scan of the source table. Identifiers are stored in the saving
+transaction, so a new quote number can be looked up straight away.
+"""
+
+import string
+
+from django.apps import apps as django_apps
+from django.db import transaction
+
+from .index import WORD_RE, batched, prefix_range
+from .models import Identifier, IdentifierSuffix
+
+MAX_LENGTH = 100
+MIN_QUERY_LENGTH = 2
+
+
+class IdentifierKind:
+    """An identifier field of a model, with the label shown next to it."""
+
+    def __init__(self, name, label, field, hint):
+        self.name = name
+        self.label = label
+        self.field = field
+        self.hint = hint
+        self.columns = frozenset([field]) | frozenset(
+            name for _, name, _, _ in string.Formatter().parse(hint) if name
+        )
+
+    @property
+    def model(self):
+        return django_apps.get_model(self.label)
+
+    def render(self, instance):
+        """(value, label) of an instance."""
+        values = {name: getattr(instance, name) for name in self.columns}
+        label = self.hint.format_map({name: '' if value is None else value for name, value in values.items()})
+        return (values[self.field] or '')[:MAX_LENGTH], label.strip(' -')[:255]
+
+
+KINDS = {kind.name: kind for kind in [
+    IdentifierKind('order', 'crm.Order', 'quote_number', '{project_name}'),
+    IdentifierKind('material', 'materials.Material', 'code', '{name}'),
+    IdentifierKind('process', 'fabrication.FabricationProcess', 'code', '{name}'),
+    IdentifierKind('drawing', 'engineering.Drawing', 'drawing_number', 'rev {revision} - {title}'),
+]}
+
+KINDS_BY_LABEL = {kind.label.lower(): kind for kind in KINDS.values()}
+
+
+def kind_for(model):
+    """The IdentifierKind of a model (or instance), else None."""
+    return KINDS_BY_LABEL.get(model._meta.label_lower)
+
+
+def normalize(value):
+    return ''.join(WORD_RE.findall(str(value).lower()))[:MAX_LENGTH]
+
+
+def suffixes(value):
+    """(position, suffix) of a normalized value; single characters only as the whole value."""
+    normalized = normalize(value)
+    return [
+        (position, normalized[position:])
+        for position in range(len(normalized))
+        if position == 0 or len(normalized) - position >= MIN_QUERY_LENGTH
+    ]
+
+
+def update(kind_name, instances):
+    """Store the identifiers of saved objects whose value or label changed; return how many."""
+    kind = KINDS[kind_name]
+    wanted = {str(instance.pk): kind.render(instance) for instance in instances}
+    stale = []
+    for identifier in Identifier.objects.filter(kind=kind.name, object_id__in=wanted):
+        object_id = str(identifier.object_id)
+        if (identifier.value, identifier.label) == wanted[object_id]:
+            del wanted[object_id]
+        else:
+            stale.append(identifier.pk)
+    if not wanted:
+        return 0
+
+    with transaction.atomic():
+        Identifier.objects.filter(pk__in=stale).delete()
+        Identifier.objects.bulk_create([
+            Identifier(kind=kind.name, object_id=object_id, value=value, label=label)
+            for object_id, (value, label) in wanted.items() if normalize(value)
+        ])
+        created = Identifier.objects.filter(kind=kind.name, object_id__in=wanted).values_list('id', 'value')
+        IdentifierSuffix.objects.bulk_create([
+            IdentifierSuffix(identifier_id=identifier_id, kind=kind.name, suffix=suffix, position=position)
+            for identifier_id, value in created
+            for position, suffix in suffixes(value)
+        ], batch_size=2000)
+    return len(wanted)
+
+
+def remove(kind_name, object_ids):
+    """Drop the identifiers of deleted objects."""
+    Identifier.objects.filter(kind=kind_name, object_id__in=[str(object_id) for object_id in object_ids]).delete()
+
+
+def rebuild(kind_name, batch_size=1000):
+    """Bring a kind's identifiers in line with its table; return how many changed."""
+    kind = KINDS[kind_name]
+    changed = 0
+    gone = Identifier.objects.filter(kind=kind.name).exclude(object_id__in=kind.model.objects.values('pk'))
+    for batch in batched(gone.values_list('object_id', flat=True), batch_size):
+        remove(kind.name, batch)
+        changed += len(batch)
+
+    objects = kind.model.objects.only('pk', *kind.columns).order_by('pk')
+    last = None
+    while True:
+        batch = list((objects if last is None else objects.filter(pk__gt=last))[:batch_size])
+        if not batch:
+            return changed
+        changed += update(kind.name, batch)
+        last = batch[-1].pk
+
+
+def lookup(query, kinds=None, limit=10):
+    """
+    Identifiers containing ``query`` (ignoring case and punctuation), best
+    first: those starting with it, then shorter ones, then alphabetically.
+    """
+    needle = normalize(query)
+    if len(needle) < MIN_QUERY_LENGTH:
+        return []
+    positions = {}
+    for kind in kinds if kinds is not None else KINDS:
+        # One range scan per kind, read in index order
+        rows = IdentifierSuffix.objects.filter(
+            kind=kind, **{f'suffix__{lookup}': value for lookup, value in prefix_range(needle).items()}
+        ).order_by('suffix').values_list('identifier_id', 'position')[:limit * 2]
+        for identifier_id, position in rows:
+            positions[identifier_id] = min(position, positions.get(identifier_id, position))
+    identifiers = Identifier.objects.in_bulk(list(positions))
+    ranked = sorted(
+        identifiers.values(),
+        key=lambda identifier: (positions[identifier.pk] > 0, len(identifier.value), identifier.value, identifier.kind),
+    )
+    return ranked[:limit]
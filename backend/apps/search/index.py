@@ -0,0 +1,346 @@
+"""
+Search index for Search app - an inverted index over orders, customers,
+materials and drawings.
+
+Every indexed object has a ``SearchDocument`` holding the title and subtitle
+shown in results. Its text fields are split into terms (lowercase letters and
+digits; "Q-2024-0012" gives "q", "2024" and "0012", and identifier fields also
+get the compact "q20240012"). Each term has a ``SearchPosting`` to the
+document, weighted by the most important field it occurs in.
+
+A query matches the documents that contain every query word, either as a
+whole term, as the start of a term, or (for words of four characters or more)
+with one typo, two for words of eight or more:
+
+    search('acme flnage', types=['customer', 'order'])
+
+Hits are ranked by the sum over the query words of
+field weight x match quality x inverse document frequency.
+
+The index follows model changes through ``search.DocumentChanged`` events
+(events.py). ``manage.py rebuild_search_index`` fills it for existing data.
+"""
+
+import hashlib
+import math
+import re
+import string
+import unicodedata
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from apps.accounts.permissions import IsSales
+
+from .models import SearchDocument, SearchPosting, SearchTerm
+
+WORD_RE = re.compile(r'[0-9a-z]+')
+MAX_TERM_LENGTH = 64
+MAX_QUERY_WORDS = 8
+# Query words this long or longer also match terms they start
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 64
+# Query words this long or longer that start no term match terms within a typo or two
+MIN_FUZZY_LENGTH = 4
+MAX_FUZZY_CANDIDATES = 2000
+FUZZY_QUALITY = 0.5
+# Later words filter postings by the documents still in the running
+MAX_CANDIDATE_FILTER = 1000
+IN_BATCH_SIZE = 500
+
+
+class Entity:
+    """How one model is indexed: weighted text fields and the hit title."""
+
+    def __init__(self, name, label, fields, identifiers=(), title='', subtitle='', permission_classes=()):
+        self.name = name
+        self.label = label
+        self.fields = fields
+        self.identifiers = frozenset(identifiers)
+        self.title = title
+        self.subtitle = subtitle
+        self.permission_classes = permission_classes
+        # Fields whose change needs a reindex
+        self.columns = frozenset(fields) | frozenset(
+            name for template in (title, subtitle) for _, name, _, _ in string.Formatter().parse(template) if name
+        )
+
+    @property
+    def model(self):
+        return django_apps.get_model(self.label)
+
+    def allowed(self, request, view):
+        return all(permission().has_permission(request, view) for permission in self.permission_classes)
+
+    def render(self, instance):
+        values = _Values(instance)
+        return self.title.format_map(values)[:255], self.subtitle.format_map(values).strip(' ,-')[:255]
+
+    def terms(self, instance):
+        """{term: weight} of an instance."""
+        terms = {}
+        for name, weight in self.fields.items():
+            value = getattr(instance, name)
+            if value is None or value == '':
+                continue
+            found = words(value)
+            if name in self.identifiers and len(found) > 1:
+                found.append(''.join(found)[:MAX_TERM_LENGTH])
+            for term in found:
+                if terms.get(term, 0) < weight:
+                    terms[term] = weight
+        return terms
+
+
+class _Values(dict):
+    # format_map() source reading instance attributes, None as ''
+    def __init__(self, instance):
+        super().__init__()
+        self.instance = instance
+
+    def __missing__(self, name):
+        value = getattr(self.instance, name)
+        return '' if value is None else value
+
+
+ENTITIES = {entity.name: entity for entity in [
+    Entity(
+        'order', 'crm.Order',
+        fields={
+            'quote_number': 3, 'po_number': 3, 'work_order_number': 3, 'invoice_number': 2,
+            'project_name': 2, 'description': 1,
+        },
+        identifiers=['quote_number', 'po_number', 'work_order_number', 'invoice_number'],
+        title='{quote_number}', subtitle='{project_name}',
+    ),
+    Entity(
+        'customer', 'crm.Customer',
+        fields={
+            'company_name': 3, 'gst_number': 3, 'name': 2, 'email': 2, 'phone': 2,
+            'contact_person': 1, 'city': 1,
+        },
+        identifiers=['gst_number', 'phone'],
+        title='{company_name}', subtitle='{name}, {city}',
+        permission_classes=[IsSales],
+    ),
+    Entity(
+        'material', 'materials.Material',
+        fields={'code': 3, 'name': 2, 'grade': 2, 'description': 1},
+        identifiers=['code'],
+        title='{code}', subtitle='{name}',
+    ),
+    Entity(
+        'drawing', 'engineering.Drawing',
+        fields={'drawing_number': 3, 'title': 2, 'description': 1},
+        identifiers=['drawing_number'],
+        title='{drawing_number} rev {revision}', subtitle='{title}',
+    ),
+]}
+
+ENTITIES_BY_LABEL = {entity.label.lower(): entity for entity in ENTITIES.values()}
+
+
+def entity_for(model):
+    """The Entity of an indexed model (or instance), else None."""
+    return ENTITIES_BY_LABEL.get(model._meta.label_lower)
+
+
+def words(text):
+    """Lowercase ASCII letter/digit runs of ``text``, accents removed."""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return [word[:MAX_TERM_LENGTH] for word in WORD_RE.findall(text.lower())]
+
+
+def prefix_range(prefix):
+    """
+    Lookup kwargs for the terms starting with ``prefix`` as an index range.
+    Terms use only 0-9 and a-z, which sort in that order under binary and
+    case-insensitive collations alike, unlike LIKE 'prefix%' which SQLite
+    cannot serve from an index.
+    """
+    stem = prefix.rstrip('z')
+    if not stem:
+        return {'gte': prefix}
+    last = stem[-1]
+    following = 'a' if last == '9' else chr(ord(last) + 1)
+    return {'gte': prefix, 'lt': stem[:-1] + following}
+
+
+def batched(items, size=IN_BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# -- indexing --------------------------------------------------------------
+
+def term_ids(terms):
+    """{term: id} for ``terms``, adding the ones not seen before."""
+    ids = {}
+    for chunk in batched(set(terms)):
+        ids.update(SearchTerm.objects.filter(term__in=chunk).values_list('term', 'id'))
+        missing = [term for term in chunk if term not in ids]
+        if missing:
+            SearchTerm.objects.bulk_create(
+                [SearchTerm(term=term, length=len(term)) for term in missing], ignore_conflicts=True
+            )
+            ids.update(SearchTerm.objects.filter(term__in=missing).values_list('term', 'id'))
+    return ids
+
+
+def signature(title, subtitle, terms):
+    digest = hashlib.sha1(f'{title}\n{subtitle}\n'.encode('utf-8'))
+    for term, weight in sorted(terms.items()):
+        digest.update(f'{term}:{weight} '.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def reindex(entity_name, object_ids):
+    """
+    Bring the documents of ``object_ids`` in line with the database and
+    return how many changed. Deleted objects lose their document; objects
+    whose title and terms are unchanged are left alone.
+    """
+    entity = ENTITIES[entity_name]
+    object_ids = {str(object_id) for object_id in object_ids}
+    instances = {str(instance.pk): instance for instance in entity.model.objects.filter(pk__in=object_ids)}
+    existing = {
+        str(document.object_id): document
+        for document in SearchDocument.objects.filter(entity=entity.name, object_id__in=object_ids)
+    }
+
+    now = timezone.now()
+    created, updated, pending = [], [], {}
+    for object_id, instance in instances.items():
+        title, subtitle = entity.render(instance)
+        terms = entity.terms(instance)
+        digest = signature(title, subtitle, terms)
+        document = existing.pop(object_id, None)
+        if document is None:
+            document = SearchDocument(entity=entity.name, object_id=instance.pk)
+            created.append(document)
+        elif document.signature == digest:
+            continue
+        else:
+            updated.append(document)
+        document.title, document.subtitle, document.signature, document.updated_at = title, subtitle, digest, now
+        pending[object_id] = terms
+
+    if not (pending or existing):
+        return 0
+    with transaction.atomic():
+        # Objects that are gone
+        SearchDocument.objects.filter(pk__in=[document.pk for document in existing.values()]).delete()
+        SearchPosting.objects.filter(document__in=[document.pk for document in updated]).delete()
+        SearchDocument.objects.bulk_update(updated, ['title', 'subtitle', 'signature', 'updated_at'])
+        # A concurrent reindex of the same object may have created it first
+        SearchDocument.objects.bulk_create(created, ignore_conflicts=True)
+
+        ids = term_ids(term for terms in pending.values() for term in terms)
+        document_ids = SearchDocument.objects.filter(
+            entity=entity.name, object_id__in=pending
+        ).values_list('object_id', 'id')
+        SearchPosting.objects.bulk_create([
+            SearchPosting(term_id=ids[term], document_id=document_id, weight=weight)
+            for object_id, document_id in document_ids
+            for term, weight in pending[str(object_id)].items()
+        ], batch_size=1000, ignore_conflicts=True)
+    return len(pending) + len(existing)
+
+
+# -- searching -------------------------------------------------------------
+
+def edit_distance(a, b, limit):
+    """Edit distance of ``a`` and ``b`` counting adjacent swaps as one; limit + 1 once above ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def match_terms(word):
+    """{term id: match quality} of the indexed terms a query word matches."""
+    if len(word) >= MIN_PREFIX_LENGTH:
+        candidates = SearchTerm.objects.filter(
+            **{f'term__{lookup}': value for lookup, value in prefix_range(word).items()}
+        ).order_by('length', 'term')[:MAX_PREFIX_TERMS]
+    else:
+        candidates = SearchTerm.objects.filter(term=word)
+    matches = {}
+    for term_id, term in candidates.values_list('id', 'term'):
+        # Exact 1.0; a prefix scores more the more of the term it covers
+        matches[term_id] = 1.0 if term == word else 0.5 + 0.4 * len(word) / len(term)
+
+    # Near misses only when nothing starts with the word; numbers must match as typed
+    if not matches and len(word) >= MIN_FUZZY_LENGTH and not word.isdigit():
+        limit = 1 if len(word) < 8 else 2
+        candidates = SearchTerm.objects.filter(
+            length__in=range(len(word) - limit, len(word) + limit + 1),
+            **{f'term__{lookup}': value for lookup, value in prefix_range(word[0]).items()}
+        ).values_list('id', 'term')[:MAX_FUZZY_CANDIDATES]
+        for term_id, term in candidates:
+            if edit_distance(word, term, limit) <= limit:
+                matches[term_id] = FUZZY_QUALITY
+    return matches
+
+
+def search(query, types=None, limit=20):
+    """Ranked hits for ``query``: [(score, SearchDocument)], best first."""
+    query_words = list(dict.fromkeys(words(query)))[:MAX_QUERY_WORDS]
+    if not query_words:
+        return []
+    matches = [match_terms(word) for word in query_words]
+    if not all(matches):
+        return []
+
+    frequency = dict(
+        SearchPosting.objects.filter(term_id__in={term_id for match in matches for term_id in match})
+        .values('term_id').annotate(documents=Count('id')).values_list('term_id', 'documents')
+    )
+    # The highest document id stands in for the document count: an index
+    # lookup instead of counting the table
+    total = SearchDocument.objects.aggregate(top=Max('id'))['top'] or 1
+    idf = {term_id: math.log(1 + total / documents) for term_id, documents in frequency.items()}
+
+    # Rarest word first, so later words only look at the documents left
+    scores = None
+    for match in sorted(matches, key=lambda match: sum(frequency.get(term_id, 0) for term_id in match)):
+        postings = SearchPosting.objects.filter(term_id__in=match)
+        if scores is not None and len(scores) <= MAX_CANDIDATE_FILTER:
+            postings = postings.filter(document_id__in=list(scores))
+        best = {}
+        for document_id, term_id, weight in postings.values_list('document_id', 'term_id', 'weight'):
+            score = weight * match[term_id] * idf.get(term_id, 0)
+            if score > best.get(document_id, 0):
+                best[document_id] = score
+        if scores is None:
+            scores = best
+        else:
+            scores = {document_id: score + best[document_id] for document_id, score in scores.items() if document_id in best}
+        if not scores:
+            return []
+
+    # Types are checked on the documents of the best hits rather than joined
+    # into the postings queries, which would make those far slower
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    hits, start, size = [], 0, limit * 2
+    while start < len(ranked) and len(hits) < limit:
+        chunk = ranked[start:start + size]
+        documents = SearchDocument.objects.in_bulk([document_id for document_id, _ in chunk])
+        for document_id, score in chunk:
+            document = documents.get(document_id)
+            if document is not None and (types is None or document.entity in types):
+                hits.append((score, document))
+        start, size = start + size, size * 2
+    return hits[:limit]
@@ -0,0 +1,64 @@
+"""
+Rebuild the global search index (apps.search.index) and the identifier
+lookup (apps.search.identifiers) from the database.
+
+Saves and deletes keep both current; run this once after installing the
+search app, after bulk loads that bypass model signals (``generate_data``),
+or to repair the index. Unchanged entries are skipped, so re-running is cheap.
+
+Examples:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --entity order --entity process
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.search import identifiers, index
+from apps.search.models import SearchDocument, SearchTerm
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the global search index and identifier lookup.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity', action='append', choices=sorted(index.ENTITIES.keys() | identifiers.KINDS.keys()),
+            help='Only rebuild this entity type or identifier kind (repeatable; default all)'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Objects per reindex batch')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        for name in options['entity'] or list(index.ENTITIES):
+            if name not in index.ENTITIES:
+                continue
+            entity = index.ENTITIES[name]
+            changed = 0
+            # Documents of objects that no longer exist
+            stale = SearchDocument.objects.filter(entity=name).exclude(
+                object_id__in=entity.model.objects.values('pk')
+            ).values_list('object_id', flat=True)
+            ids = list(stale)
+            for batch in index.batched(ids, options['batch_size']):
+                changed += index.reindex(name, batch)
+
+            last = None
+            while True:
+                objects = entity.model.objects.order_by('pk')
+                if last is not None:
+                    objects = objects.filter(pk__gt=last)
+                batch = list(objects.values_list('pk', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                changed += index.reindex(name, batch)
+                last = batch[-1]
+            self.stdout.write(f'{name}: {changed} documents updated')
+
+        for name in options['entity'] or list(identifiers.KINDS):
+            if name in identifiers.KINDS:
+                changed = identifiers.rebuild(name, options['batch_size'])
+                self.stdout.write(f'{name}: {changed} identifiers updated')
+
+        unused = SearchTerm.objects.filter(postings__isnull=True).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt; {unused} unused terms removed.'))
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, default='', max_length=255)),
+                ('signature', models.CharField(max_length=40)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'unique_together': {('entity', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True)),
+                ('length', models.PositiveSmallIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Search Term',
+                'verbose_name_plural': 'Search Terms',
+                'indexes': [models.Index(fields=['length', 'term'], name='search_sear_length_c9b6c7_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.PositiveSmallIntegerField()),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='search.searchdocument')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='search.searchterm')),
+            ],
+            options={
+                'verbose_name': 'Search Posting',
+                'verbose_name_plural': 'Search Postings',
+                'unique_together': {('term', 'document')},
+            },
+        ),
+    ]
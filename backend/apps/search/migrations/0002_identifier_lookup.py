@@ -0,0 +1,44 @@
+# Generated by Django 4.2.9 on 2026-10-19 03:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Identifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('value', models.CharField(max_length=100)),
+                ('label', models.CharField(blank=True, default='', max_length=255)),
+            ],
+            options={
+                'verbose_name': 'Identifier',
+                'verbose_name_plural': 'Identifiers',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IdentifierSuffix',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('suffix', models.CharField(max_length=100)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('identifier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suffixes', to='search.identifier')),
+            ],
+            options={
+                'verbose_name': 'Identifier Suffix',
+                'verbose_name_plural': 'Identifier Suffixes',
+                'indexes': [models.Index(fields=['kind', 'suffix'], name='search_iden_kind_1bd4b0_idx')],
+            },
+        ),
+    ]
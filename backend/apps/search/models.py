@@ -0,0 +1,96 @@
+"""
+Models for Search app - inverted index over orders, customers, materials and drawings.
+"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SearchDocument(models.Model):
+    """One indexed object, with what a search hit shows for it."""
+
+    entity = models.CharField(max_length=20)
+    object_id = models.UUIDField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default='')
+    # Digest of title, subtitle and terms; unchanged objects are not reindexed
+    signature = models.CharField(max_length=40)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _('Search Document')
+        verbose_name_plural = _('Search Documents')
+        unique_together = ['entity', 'object_id']
+
+    def __str__(self):
+        return f"{self.entity}: {self.title}"
+
+
+class SearchTerm(models.Model):
+    """Vocabulary of the index; postings refer to terms by id."""
+
+    term = models.CharField(max_length=64, unique=True)
+    length = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = _('Search Term')
+        verbose_name_plural = _('Search Terms')
+        indexes = [
+            # Typo-tolerant lookups scan terms of similar length by first letter
+            models.Index(fields=['length', 'term']),
+        ]
+
+    def __str__(self):
+        return self.term
+
+
+class SearchPosting(models.Model):
+    """A term occurring in a document, with the weight of its best field."""
+
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name='postings')
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='postings')
+    weight = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = _('Search Posting')
+        verbose_name_plural = _('Search Postings')
+        unique_together = ['term', 'document']
+
+    def __str__(self):
+        return f"{self.term_id} -> {self.document_id}"
+
+
+class Identifier(models.Model):
+    """A looked-up identifier (quote number, code...) of one object, normalized."""
+
+    kind = models.CharField(max_length=20)
+    object_id = models.UUIDField()
+    value = models.CharField(max_length=100)
+    label = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        verbose_name = _('Identifier')
+        verbose_name_plural = _('Identifiers')
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+
+class IdentifierSuffix(models.Model):
+    """One suffix of a normalized identifier; substrings are looked up as suffix prefixes."""
+
+    identifier = models.ForeignKey(Identifier, on_delete=models.CASCADE, related_name='suffixes')
+    kind = models.CharField(max_length=20)
+    suffix = models.CharField(max_length=100)
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        verbose_name = _('Identifier Suffix')
+        verbose_name_plural = _('Identifier Suffixes')
+        indexes = [
+            models.Index(fields=['kind', 'suffix']),
+        ]
+
+    def __str__(self):
+        return self.suffix
@@ -0,0 +1,45 @@
+"""
+Signals for Search app - Keep the search index and identifier lookup current.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from apps.core.events import publish
+from . import identifiers
+from .events import DocumentChanged
+from .index import ENTITIES, entity_for
+
+
+def index_saved_object(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Queue a reindex of an object whose text or title may have changed."""
+    entity = entity_for(sender)
+    if raw or (update_fields is not None and entity.columns.isdisjoint(update_fields)):
+        return
+    publish(DocumentChanged(entity=entity.name, object_id=str(instance.pk)))
+
+
+def index_deleted_object(sender, instance, **kwargs):
+    """Queue the removal of a deleted object's document."""
+    publish(DocumentChanged(entity=entity_for(sender).name, object_id=str(instance.pk)))
+
+
+def store_identifier(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Store the identifier of a saved object, in the saving transaction."""
+    kind = identifiers.kind_for(sender)
+    if raw or (update_fields is not None and kind.columns.isdisjoint(update_fields)):
+        return
+    identifiers.update(kind.name, [instance])
+
+
+def remove_identifier(sender, instance, **kwargs):
+    identifiers.remove(identifiers.kind_for(sender).name, [instance.pk])
+
+
+# Connected per model: a receiver for every sender would also stop Django
+# from deleting cascaded rows in bulk
+for entity in ENTITIES.values():
+    post_save.connect(index_saved_object, sender=entity.model, dispatch_uid=f'search-save-{entity.name}')
+    post_delete.connect(index_deleted_object, sender=entity.model, dispatch_uid=f'search-delete-{entity.name}')
+
+for kind in identifiers.KINDS.values():
+    post_save.connect(store_identifier, sender=kind.model, dispatch_uid=f'identifier-save-{kind.name}')
+    post_delete.connect(remove_identifier, sender=kind.model, dispatch_uid=f'identifier-delete-{kind.name}')
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+URL patterns for Search app.
+"""
+
+from django.urls import path
+from .views import SearchView, IdentifierLookupView
+
+urlpatterns = [
+    path('', SearchView.as_view(), name='search'),
+    path('identifiers/', IdentifierLookupView.as_view(), name='identifier-lookup'),
+]
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Views for Search app - Global search and identifier typeahead.
+"""
+
+from rest_framework import views
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from apps.core.routers import ReplicaReadMixin
+from . import identifiers, index
+
+
+class SearchView(ReplicaReadMixin, views.APIView):
+    """
+    Ranked search hits across entity types.
+
+    ``?q=`` is the query, ``?types=order,customer`` limits the entity types
+    (default all the user may see) and ``?limit=`` sets the number of hits
+    (default 20, at most 100). Query words match whole words, word prefixes
+    and, for longer words, near misses.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'detail': 'Invalid limit.'}, status=400)
+
+        types = [name for name, entity in index.ENTITIES.items() if entity.allowed(request, self)]
+        requested = request.query_params.get('types')
+        if requested:
+            names = {name.strip() for name in requested.split(',') if name.strip()}
+            unknown = names - index.ENTITIES.keys()
+            if unknown:
+                return Response({'detail': f"Unknown types: {', '.join(sorted(unknown))}."}, status=400)
+            types = [name for name in types if name in names]
+
+        hits = index.search(query, types=types, limit=limit) if types else []
+        return Response({
+            'query': query,
+            'results': [
+                {
+                    'type': document.entity,
+                    'id': document.object_id,
+                    'title': document.title,
+                    'subtitle': document.subtitle,
+                    'score': round(score, 3),
+                }
+                for score, document in hits
+            ],
+        })
+
+
+class IdentifierLookupView(ReplicaReadMixin, views.APIView):
+    """
+    Typeahead for quote numbers, material codes, process codes and drawing
+    numbers.
+
+    ``?q=`` is what was typed so far, matched anywhere in the identifier,
+    ignoring case and punctuation. ``?kinds=order,material`` limits the
+    kinds (order, material, process, drawing) and ``?limit=`` the number of
+    results (default 10, at most 50). Identifiers starting with ``q`` come
+    first.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response({'detail': 'Invalid limit.'}, status=400)
+
+        kinds = None
+        requested = request.query_params.get('kinds')
+        if requested:
+            kinds = [name.strip() for name in requested.split(',') if name.strip()]
+            unknown = set(kinds) - identifiers.KINDS.keys()
+            if unknown:
+                return Response({'detail': f"Unknown kinds: {', '.join(sorted(unknown))}."}, status=400)
+
+        query = request.query_params.get('q', '')
+        return Response({
+            'query': query,
+            'results': [
+                {
+                    'type': identifier.kind,
+                    'id': identifier.object_id,
+                    'value': identifier.value,
+                    'label': identifier.label,
+                }
+                for identifier in identifiers.lookup(query, kinds=kinds, limit=limit)
+            ],
+        })
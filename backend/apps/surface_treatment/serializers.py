@@ -4,9 +4,10 @@ Serializers for Surface Treatment app.
 
 from rest_framework import serializers
 from .models import TreatmentType, OrderSurfaceTreatment
+from apps.core.serializers import SparseFieldsMixin
 
 
-class TreatmentTypeSerializer(serializers.ModelSerializer):
+class TreatmentTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for TreatmentType model."""
 
     class Meta:
@@ -15,7 +16,7 @@ class TreatmentTypeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class OrderSurfaceTreatmentSerializer(serializers.ModelSerializer):
+class OrderSurfaceTreatmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for OrderSurfaceTreatment model."""
 
     order_quote_number = serializers.CharField(source='order.quote_number', read_only=True)
@@ -33,6 +34,10 @@ class OrderSurfaceTreatmentSerializer(serializers.ModelSerializer):
             'id', 'started_at', 'completed_at', 'created_by',
             'updated_by', 'created_at', 'updated_at'
         ]
+        field_dependencies = {
+            'completion_percentage': ['planned_quantity', 'completed_quantity'],
+            'pass_percentage': ['completed_quantity', 'rejected_quantity'],
+        }
 
 
 class OrderSurfaceTreatmentCreateSerializer(serializers.ModelSerializer):
@@ -16,9 +16,10 @@ from .serializers import (
     OrderSurfaceTreatmentUpdateSerializer
 )
 from apps.accounts.permissions import IsProduction
+from apps.core.serializers import SparseQuerysetMixin
 
 
-class TreatmentTypeViewSet(viewsets.ModelViewSet):
+class TreatmentTypeViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing treatment types."""
     
     queryset = TreatmentType.objects.all()
@@ -30,10 +31,10 @@ class TreatmentTypeViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class OrderSurfaceTreatmentViewSet(viewsets.ModelViewSet):
+class OrderSurfaceTreatmentViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for managing order surface treatments."""
     
-    queryset = OrderSurfaceTreatment.objects.all()
+    queryset = OrderSurfaceTreatment.objects.select_related('order', 'treatment_type', 'created_by')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['order', 'treatment_type', 'status', 'is_outsourced']
@@ -0,0 +1,14 @@
+"""
+API benchmark suite for Manufacturing ERP.
+
+Boots the Django app in-process against a generated data set, replays the hot
+endpoints and records latency percentiles, query counts and response sizes as
+JSON that can be compared between commits.
+
+Usage (from the backend directory):
+    python -m benchmarks run --orders 20000 --output bench-head.json
+    python -m benchmarks compare bench-base.json bench-head.json
+    python -m benchmarks render --rows 10000 --output render-head.json
+    python -m benchmarks readpath --orders 2000 --output readpath-head.json
+    python -m benchmarks load --server-threads 16 --clients 32 --output load-head.json
+"""
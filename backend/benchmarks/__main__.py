@@ -0,0 +1,191 @@
+"""
+Command line entry point: python -m benchmarks {run,compare,render,readpath,load,list}.
+"""
+
+import argparse
+import sys
+
+from .compare import compare, format_table, load_results
+from .scenarios import SCENARIOS, select
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Manufacturing ERP API benchmarks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run the benchmark scenarios and write JSON results.')
+    run.add_argument('--output', '-o', default='benchmark-results.json', help='Results file')
+    run.add_argument('--settings', default=None, help='Django settings module (default: config.settings)')
+    run.add_argument('--orders', type=int, default=5000, help='Orders to generate')
+    run.add_argument('--records-per-order', type=int, default=20, help='Average child records per order')
+    run.add_argument('--audit-rows', type=int, default=None, help='Audit rows to generate')
+    run.add_argument('--seed', type=int, default=42, help='Data set seed')
+    run.add_argument('--iterations', type=int, default=20, help='Measured requests per scenario')
+    run.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per scenario')
+    run.add_argument('--only', nargs='*', help='Scenario name prefixes to run')
+    run.add_argument('--group', nargs='*', choices=['dashboard', 'action', 'list'], help='Scenario groups to run')
+    run.add_argument('--keepdb', action='store_true', help='Keep and reuse the generated test database')
+    run.add_argument(
+        '--use-existing-db', action='store_true',
+        help='Benchmark the configured database instead of a generated test database'
+    )
+    run.add_argument('--baseline', help='Compare against this results file after the run')
+
+    check = subparsers.add_parser('compare', help='Fail when results regress against a baseline.')
+    check.add_argument('baseline', help='Baseline results file')
+    check.add_argument('current', help='Current results file')
+
+    for sub in (run, check):
+        sub.add_argument('--max-latency-regression', type=float, default=0.25,
+                         help='Allowed fractional latency growth (default 0.25)')
+        sub.add_argument('--min-latency-delta', type=float, default=2.0,
+                         help='Ignore latency growth below this many milliseconds')
+        sub.add_argument('--max-query-increase', type=int, default=0,
+                         help='Allowed growth in query count per scenario')
+        sub.add_argument('--metric', default='p95_ms', choices=['p50_ms', 'p95_ms', 'mean_ms'],
+                         help='Latency metric to compare')
+
+    render = subparsers.add_parser('render', help='Benchmark JSON rendering/parsing of large list payloads.')
+    render.add_argument('--output', '-o', default='render-results.json', help='Results file')
+    render.add_argument('--settings', default=None, help='Django settings module (default: config.settings)')
+    render.add_argument('--rows', type=int, default=10000, help='Rows per list payload')
+    render.add_argument('--iterations', type=int, default=10, help='Timed runs per renderer')
+    render.add_argument('--seed', type=int, default=42, help='Data set seed')
+
+    readpath = subparsers.add_parser('readpath', help='Check parity and throughput of the compiled read path.')
+    readpath.add_argument('--output', '-o', default='readpath-results.json', help='Results file')
+    readpath.add_argument('--settings', default=None, help='Django settings module (default: config.settings)')
+    readpath.add_argument('--orders', type=int, default=2000, help='Orders to generate')
+    readpath.add_argument('--records-per-order', type=int, default=10, help='Average child records per order')
+    readpath.add_argument('--seed', type=int, default=42, help='Data set seed')
+    readpath.add_argument('--rows', type=int, default=2000, help='Rows serialized per case')
+    readpath.add_argument('--iterations', type=int, default=10, help='Timed runs per path')
+    readpath.add_argument('--keepdb', action='store_true', help='Keep and reuse the generated test database')
+
+    load = subparsers.add_parser('load', help='Load test database connection modes on the configured database.')
+    load.add_argument('--output', '-o', default='load-results.json', help='Results file')
+    load.add_argument('--settings', default=None, help='Django settings module (default: config.settings)')
+    load.add_argument('--modes', nargs='*', choices=['per-request', 'persistent', 'pooled'],
+                      default=['per-request', 'persistent', 'pooled'], help='Connection modes to compare')
+    load.add_argument('--paths', nargs='*', help='Endpoints to request (default: a list/dashboard mix)')
+    load.add_argument('--server-threads', type=int, default=16, help='Server worker threads')
+    load.add_argument('--clients', type=int, default=32, help='Concurrent clients')
+    load.add_argument('--requests', type=int, default=2000, help='Measured requests per mode')
+    load.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE / pool max lifetime in seconds')
+    load.add_argument('--pool-size', type=int, default=4, help='Pool size for the pooled mode')
+
+    subparsers.add_parser('list', help='List the benchmark scenarios.')
+    return parser
+
+
+def check_regressions(baseline, current, args):
+    rows, failures = compare(
+        baseline, current,
+        max_latency_regression=args.max_latency_regression,
+        min_latency_delta_ms=args.min_latency_delta,
+        max_query_increase=args.max_query_increase,
+        metric=args.metric,
+    )
+    print(format_table(rows, args.metric))
+    if failures:
+        print(f'\n{len(failures)} scenario(s) regressed.', file=sys.stderr)
+        return 1
+    print('\nNo regressions.')
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'list':
+        for scenario in SCENARIOS:
+            print(f'{scenario.name:40} {scenario.group:10} {scenario.path} {scenario.params or ""}')
+        return 0
+
+    if args.command == 'compare':
+        return check_regressions(load_results(args.baseline), load_results(args.current), args)
+
+    from .runner import BenchmarkRunner, setup_django, write_results
+
+    if args.command == 'render':
+        from .rendering import run_rendering
+
+        setup_django(args.settings)
+        report = run_rendering(rows=args.rows, iterations=args.iterations, seed=args.seed, stdout=sys.stdout)
+        write_results(report, args.output)
+        print(f'Results written to {args.output}')
+        return 0
+
+    if args.command == 'readpath':
+        from .readpath import run_readpath
+
+        setup_django(args.settings)
+        runner = BenchmarkRunner(
+            orders=args.orders,
+            records_per_order=args.records_per_order,
+            audit_rows=0,
+            seed=args.seed,
+            keepdb=args.keepdb,
+            stdout=sys.stdout,
+        )
+        report, mismatches = run_readpath(runner, rows=args.rows, iterations=args.iterations, stdout=sys.stdout)
+        write_results(report, args.output)
+        print(f'Results written to {args.output}')
+        if mismatches:
+            print(f'\n{len(mismatches)} case(s) differ from the serializer output.', file=sys.stderr)
+            return 1
+        return 0
+
+    if args.command == 'load':
+        from .load import run_load
+
+        setup_django(args.settings)
+        report = run_load(
+            modes=args.modes,
+            paths=args.paths,
+            server_threads=args.server_threads,
+            clients=args.clients,
+            requests=args.requests,
+            max_age=args.max_age,
+            pool_size=args.pool_size,
+            stdout=sys.stdout,
+        )
+        write_results(report, args.output)
+        print(f'Results written to {args.output}')
+        return 1 if any(result['errors'] for result in report['results'].values()) else 0
+
+    setup_django(args.settings)
+    scenarios = select(args.only, args.group)
+    if not scenarios:
+        print('No scenarios selected.', file=sys.stderr)
+        return 2
+    runner = BenchmarkRunner(
+        orders=args.orders,
+        records_per_order=args.records_per_order,
+        audit_rows=args.audit_rows,
+        seed=args.seed,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        use_existing_db=args.use_existing_db,
+        keepdb=args.keepdb,
+        stdout=sys.stdout,
+    )
+    report = runner.run(scenarios)
+    write_results(report, args.output)
+    print(f'Results written to {args.output}')
+
+    if args.baseline:
+        return check_regressions(load_results(args.baseline), report, args)
+    mismatched = [
+        name for name, result in report['results'].items()
+        if result['expected_queries'] is not None and result['queries'] != result['expected_queries']
+    ]
+    if mismatched:
+        print(f'\n{len(mismatched)} scenario(s) ran an unexpected number of queries: {", ".join(mismatched)}',
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
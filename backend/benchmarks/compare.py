@@ -0,0 +1,65 @@
+"""
+Regression check between two benchmark result files.
+"""
+
+import json
+
+
+def load_results(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def compare(baseline, current, max_latency_regression=0.25, min_latency_delta_ms=2.0,
+            max_query_increase=0, metric='p95_ms'):
+    """
+    Compare two reports and return (rows, failures).
+
+    A scenario regresses when its latency metric grows by more than
+    ``max_latency_regression`` (a fraction) *and* by more than
+    ``min_latency_delta_ms`` - the absolute floor keeps sub-millisecond noise on
+    fast endpoints from failing the check - or when its query count grows by
+    more than ``max_query_increase``. Non-2xx responses, and scenarios whose
+    query count differs from the one they declare, always fail.
+    """
+    rows = []
+    failures = []
+    base_results = baseline.get('results', {})
+    for name, result in sorted(current.get('results', {}).items()):
+        base = base_results.get(name)
+        row = {
+            'name': name,
+            'current_ms': result[metric],
+            'current_queries': result['queries'],
+            'baseline_ms': base[metric] if base else None,
+            'baseline_queries': base['queries'] if base else None,
+            'problems': [],
+        }
+        if not 200 <= result['status'] < 300:
+            row['problems'].append(f'status {result["status"]}')
+        expected = result.get('expected_queries')
+        if expected is not None and result['queries'] != expected:
+            row['problems'].append(f'queries {result["queries"]} != expected {expected}')
+        if base:
+            delta = result[metric] - base[metric]
+            if base[metric] and delta > min_latency_delta_ms and delta / base[metric] > max_latency_regression:
+                row['problems'].append(f'{metric} +{delta / base[metric]:.0%}')
+            if result['queries'] - base['queries'] > max_query_increase:
+                row['problems'].append(f'queries {base["queries"]} -> {result["queries"]}')
+        rows.append(row)
+        if row['problems']:
+            failures.append(row)
+    return rows, failures
+
+
+def format_table(rows, metric='p95_ms'):
+    lines = [f'{"scenario":40} {"base " + metric:>14} {metric:>10} {"queries":>11}  result']
+    for row in rows:
+        base_ms = f'{row["baseline_ms"]:.2f}' if row['baseline_ms'] is not None else '-'
+        base_queries = row['baseline_queries'] if row['baseline_queries'] is not None else '-'
+        lines.append(
+            f'{row["name"]:40} {base_ms:>14} {row["current_ms"]:>10.2f} '
+            f'{str(base_queries) + "->" + str(row["current_queries"]):>11}  '
+            f'{", ".join(row["problems"]) or "ok"}'
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,283 @@
+"""
+Connection load test - database connection reuse under concurrent requests.
+
+Serves the app from an in-process WSGI server with a fixed number of worker
+threads (like gunicorn's gthread worker), drives it with concurrent HTTP
+clients and repeats the run for each connection mode:
+
+    per-request  CONN_MAX_AGE = 0, a new connection for every request
+    persistent   CONN_MAX_AGE > 0 with health checks, one connection per thread
+    pooled       OPTIONS['pool'], a bounded pool shared by the worker's threads
+
+For each mode it records latency percentiles, throughput and connections
+opened; on MySQL it also samples ``Threads_connected`` for the peak number of
+open server connections. It runs against the configured database, which
+should already hold data (``generate_data``).
+"""
+
+import http.client
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .runner import git_revision, percentile
+
+MODES = ('per-request', 'persistent', 'pooled')
+
+DEFAULT_PATHS = [
+    '/api/v1/crm/orders/',
+    '/api/v1/materials/materials/',
+    '/api/v1/production/records/',
+    '/api/v1/dashboards/real-time-status/',
+]
+
+
+def build_server(threads):
+    from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer, get_internal_wsgi_application
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    class FixedThreadWSGIServer(WSGIServer):
+        """Handle requests on a fixed set of threads so thread-local connections are reused."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.requests = queue.Queue()
+            self.workers = [threading.Thread(target=self.work, daemon=True) for _ in range(threads)]
+            for worker in self.workers:
+                worker.start()
+
+        def process_request(self, request, client_address):
+            self.requests.put((request, client_address))
+
+        def work(self):
+            from django.db import connections
+
+            try:
+                while True:
+                    item = self.requests.get()
+                    if item is None:
+                        return
+                    request, client_address = item
+                    try:
+                        self.finish_request(request, client_address)
+                    except Exception:
+                        self.handle_error(request, client_address)
+                    finally:
+                        self.shutdown_request(request)
+            finally:
+                # Persistent connections belong to this thread
+                connections.close_all()
+
+        def server_close(self):
+            super().server_close()
+            for _ in self.workers:
+                self.requests.put(None)
+            for worker in self.workers:
+                worker.join()
+
+    server = FixedThreadWSGIServer(('127.0.0.1', 0), QuietHandler)
+    server.request_queue_size = 128
+    server.set_app(get_internal_wsgi_application())
+    return server
+
+
+def configure_mode(mode, max_age, pool_size):
+    from django.db import connections
+
+    settings_dict = connections.settings['default']
+    options = settings_dict['OPTIONS']
+    options.pop('pool', None)
+    settings_dict['CONN_HEALTH_CHECKS'] = True
+    if mode == 'per-request':
+        settings_dict['CONN_MAX_AGE'] = 0
+    elif mode == 'persistent':
+        settings_dict['CONN_MAX_AGE'] = max_age
+    else:
+        settings_dict['CONN_MAX_AGE'] = 0
+        options['pool'] = {'max_size': pool_size, 'timeout': 30, 'max_lifetime': max_age}
+
+
+class ConnectionSampler:
+    """Counts physical connects; on MySQL also polls Threads_connected."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.opened = 0
+        self.peak = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def connection_created(self, sender, connection, **kwargs):
+        if connection.alias == 'default' and not getattr(connection, '_pool_reused', False):
+            with self.lock:
+                self.opened += 1
+
+    def threads_connected(self, cursor):
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+        return int(cursor.fetchone()[1])
+
+    def poll(self):
+        from django.db import connections
+        from django.db.utils import load_backend
+
+        # A connection of our own, outside the app's pool and counters
+        settings_dict = connections.settings['default']
+        options = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+        connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(
+            {**settings_dict, 'OPTIONS': options}, alias='load-sampler'
+        )
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.wait(self.interval):
+                    current = self.threads_connected(cursor) - 1
+                    self.peak = current if self.peak is None else max(self.peak, current)
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        from django.db import connection
+        from django.db.backends.signals import connection_created
+
+        connection_created.connect(self.connection_created)
+        if connection.vendor == 'mysql':
+            self.thread = threading.Thread(target=self.poll, daemon=True)
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        from django.db.backends.signals import connection_created
+
+        connection_created.disconnect(self.connection_created)
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+def auth_header():
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from apps.accounts.models import User
+
+    user = User.objects.filter(is_superuser=True, is_active=True).order_by('date_joined').first()
+    if user is None:
+        raise RuntimeError('No active superuser found; run seed data or generate_data first.')
+    return f'Bearer {RefreshToken.for_user(user).access_token}'
+
+
+def drive(port, paths, clients, requests, authorization):
+    """Issue ``requests`` GETs from ``clients`` threads; return per-request (ms, status)."""
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    samples = []
+
+    def client():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            # One HTTP connection per request, so no client holds on to a server thread
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            started = time.perf_counter()
+            try:
+                connection.request('GET', paths[index % len(paths)], headers={
+                    'Authorization': authorization, 'Connection': 'close',
+                })
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                status = 0
+            finally:
+                connection.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                samples.append((elapsed, status))
+
+    with ThreadPoolExecutor(clients) as executor:
+        for _ in range(clients):
+            executor.submit(client)
+    return samples
+
+
+def run_mode(mode, paths, server_threads, clients, requests, max_age, pool_size, authorization):
+    from django.db import connections
+    from apps.core.backends.pool import pools
+
+    configure_mode(mode, max_age, pool_size)
+    pools.clear()
+    server = build_server(server_threads)
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    try:
+        # Warm up every server thread once, outside the measurement
+        drive(server.server_port, paths, clients, server_threads * 2, authorization)
+        with ConnectionSampler() as sampler:
+            started = time.perf_counter()
+            samples = drive(server.server_port, paths, clients, requests, authorization)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+        for pool in list(pools.values()):
+            pool.close_all()
+        connections.close_all()
+
+    durations = [duration for duration, _ in samples]
+    result = {
+        'requests': len(samples),
+        'errors': sum(1 for _, status in samples if status == 0 or status >= 500),
+        'throughput_rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(percentile(durations, 0.95), 3),
+        'p99_ms': round(percentile(durations, 0.99), 3),
+        'connections_opened': sampler.opened,
+        'peak_connections': sampler.peak,
+    }
+    if mode == 'pooled':
+        result['pool'] = [pool.stats() for pool in pools.values()]
+    return result
+
+
+def run_load(modes=MODES, paths=None, server_threads=16, clients=32, requests=2000,
+             max_age=60, pool_size=4, stdout=None):
+    import django
+    from django.db import connection
+
+    log = (lambda message: stdout.write(message + '\n')) if stdout else (lambda message: None)
+    paths = paths or DEFAULT_PATHS
+    authorization = auth_header()
+    connection.close()
+
+    results = {}
+    for mode in modes:
+        result = run_mode(mode, paths, server_threads, clients, requests, max_age, pool_size, authorization)
+        results[mode] = result
+        peak = '-' if result['peak_connections'] is None else result['peak_connections']
+        log(
+            f'{mode:12} {result["throughput_rps"]:8.1f} req/s  p50={result["p50_ms"]:8.2f}ms '
+            f'p95={result["p95_ms"]:8.2f}ms p99={result["p99_ms"]:8.2f}ms  '
+            f'opened={result["connections_opened"]} peak={peak} errors={result["errors"]}'
+        )
+
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'paths': paths,
+            'server_threads': server_threads,
+            'clients': clients,
+            'requests': requests,
+            'max_age': max_age,
+            'pool_size': pool_size,
+        },
+        'results': results,
+    }
@@ -0,0 +1,114 @@
+"""
+Compiled read path benchmark - parity and throughput of CompiledReader.
+
+For each compiled list/retrieve serializer, renders the same rows of a
+generated data set through the regular serializer and through the compiled
+``values()`` path, checks that the JSON is byte-identical and times both
+(query and serialization included, rendering excluded). Any mismatch makes
+the command exit non-zero, so it doubles as the parity check.
+"""
+
+from datetime import datetime, timezone
+
+from .rendering import timed
+from .runner import git_revision
+
+# (name, viewset path, action, query string)
+CASES = [
+    ('orders.list', 'apps.crm.views.OrderViewSet', 'list', ''),
+    ('orders.list.sparse', 'apps.crm.views.OrderViewSet', 'list',
+     'fields=id,quote_number,customer_name,status_display,priority_display,is_delayed,days_remaining'),
+    ('materials.list', 'apps.materials.views.MaterialViewSet', 'list', ''),
+    ('materials.retrieve', 'apps.materials.views.MaterialViewSet', 'retrieve', ''),
+    ('production.records.list', 'apps.production.views.ProductionRecordViewSet', 'list', ''),
+    ('production.records.list.sparse', 'apps.production.views.ProductionRecordViewSet', 'list',
+     'fields=id,order_quote_number,shift_display,recorded_by_name,verified_by_name,ok_quantity'),
+]
+
+
+def build_view(viewset_path, action, query, user):
+    from django.utils.module_loading import import_string
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    request = APIRequestFactory().get(f'/?{query}')
+    force_authenticate(request, user)
+    view = import_string(viewset_path)(action_map={'get': action}, args=(), kwargs={}, format_kwarg=None)
+    view.request = view.initialize_request(request)
+    return view
+
+
+def first_difference(regular, compiled):
+    for index, (expected, actual) in enumerate(zip(regular, compiled)):
+        if expected != actual:
+            fields = sorted(
+                name for name in set(expected) | set(actual) if expected.get(name, KeyError) != actual.get(name, KeyError)
+            )
+            return f'row {index}: {", ".join(fields)}'
+    return f'{len(regular)} rows vs {len(compiled)} rows'
+
+
+def run_readpath(runner, rows=2000, iterations=10, stdout=None):
+    import django
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+    from apps.accounts.models import User
+
+    log = (lambda message: stdout.write(message + '\n')) if stdout else (lambda message: None)
+    renderer = JSONRenderer()
+    results = {}
+    mismatches = []
+
+    runner.setup_database()
+    try:
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('date_joined').first()
+        for name, viewset_path, action, query in CASES:
+            view = build_view(viewset_path, action, query, user)
+            reader = view.get_compiled_reader()
+            if reader is None:
+                mismatches.append(name)
+                log(f'{name:32} not compilable')
+                continue
+            queryset = view.filter_queryset(view.get_queryset())
+
+            regular, regular_timing = timed(
+                lambda: view.get_serializer(queryset[:rows], many=True).data, iterations
+            )
+            compiled, compiled_timing = timed(
+                lambda: reader.to_representation(reader.values(queryset)[:rows]), iterations
+            )
+
+            identical = renderer.render(regular) == renderer.render(compiled)
+            if not identical:
+                mismatches.append(name)
+            count = len(compiled)
+            for timing in (regular_timing, compiled_timing):
+                timing['rows_per_second'] = round(count / timing['p50_ms'] * 1000) if timing['p50_ms'] else None
+            compiled_timing['speedup'] = (
+                round(regular_timing['p50_ms'] / compiled_timing['p50_ms'], 2) if compiled_timing['p50_ms'] else None
+            )
+            results[name] = {
+                'rows': count,
+                'identical': identical,
+                'serializer': regular_timing,
+                'compiled': compiled_timing,
+            }
+            log(
+                f'{name:32} {count:6} rows  serializer p50={regular_timing["p50_ms"]:9.2f}ms  '
+                f'compiled p50={compiled_timing["p50_ms"]:9.2f}ms  x{compiled_timing["speedup"]}  '
+                + ('identical' if identical else 'MISMATCH ' + first_difference(regular, compiled))
+            )
+
+        return {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'rows': rows,
+                'iterations': iterations,
+                'seed': runner.seed,
+            },
+            'results': results,
+        }, mismatches
+    finally:
+        runner.teardown_database()
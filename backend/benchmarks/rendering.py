@@ -0,0 +1,148 @@
+"""
+Renderer/parser benchmark - JSON encoding and decoding of large list payloads.
+
+Builds in-memory orders and material transactions (no database needed) and
+times DRF's JSONRenderer/JSONParser against the project's FastJSON classes on
+two payload shapes: serializer output and raw ``values()``-style rows, which
+still carry UUID, Decimal and date objects.
+"""
+
+import io
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from .runner import git_revision, percentile
+
+
+def build_orders(rows, rng):
+    from apps.accounts.models import User
+    from apps.crm.models import Customer, Order
+
+    customers = [
+        Customer(id=uuid.UUID(int=rng.getrandbits(128), version=4), name=f'Customer {i}',
+                 company_name=f'Company {i} Pvt Ltd', email=f'c{i}@example.com', city='Pune')
+        for i in range(50)
+    ]
+    user = User(first_name='Asha', last_name='Rao', email='asha@example.com')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    orders = []
+    for i in range(rows):
+        quantity = rng.randint(1, 500)
+        unit_price = Decimal(rng.randint(100, 99999)) / 100
+        created_at = start + timedelta(minutes=rng.randint(0, 500000))
+        orders.append(Order(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4),
+            quote_number=f'Q-{i:08d}', po_number=f'PO-{i:08d}', work_order_number=f'WO-{i:08d}',
+            customer=rng.choice(customers), project_name=f'Project {i}', ordered_quantity=quantity,
+            status=rng.choice(Order.Status.values), status_percentage=rng.randint(0, 100),
+            priority=rng.choice(Order.Priority.values), created_by=user, assigned_to=user,
+            expected_delivery_date=created_at.date() + timedelta(days=rng.randint(5, 90)),
+            unit_price=unit_price, total_amount=unit_price * quantity, created_at=created_at,
+        ))
+    return orders
+
+
+def build_transactions(rows, rng):
+    from apps.accounts.models import User
+    from apps.materials.models import Material, MaterialTransaction
+
+    materials = [
+        Material(id=uuid.UUID(int=rng.getrandbits(128), version=4), code=f'MAT-{i:05d}', name=f'Sheet {i}')
+        for i in range(200)
+    ]
+    user = User(first_name='Ravi', last_name='Iyer', email='ravi@example.com')
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    transactions = []
+    for i in range(rows):
+        before = Decimal(rng.randint(0, 10_000_000)) / 1000
+        quantity = Decimal(rng.randint(1, 100_000)) / 1000
+        transactions.append(MaterialTransaction(
+            id=uuid.UUID(int=rng.getrandbits(128), version=4), material=rng.choice(materials),
+            transaction_type=rng.choice(MaterialTransaction.TransactionType.values),
+            quantity=quantity, stock_before=before, stock_after=before + quantity,
+            reference_number=f'REF-{i:08d}', created_by=user,
+            created_at=start + timedelta(minutes=rng.randint(0, 500000)),
+        ))
+    return transactions
+
+
+def values_rows(instances):
+    """What ``queryset.values()`` returns for the same rows."""
+    fields = [field.attname for field in instances[0]._meta.concrete_fields]
+    return [{name: getattr(instance, name) for name in fields} for instance in instances]
+
+
+def timed(function, iterations):
+    durations = []
+    result = None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = function()
+        durations.append((time.perf_counter() - started) * 1000)
+    return result, {
+        'p50_ms': round(statistics.median(durations), 3),
+        'p95_ms': round(percentile(durations, 0.95), 3),
+        'mean_ms': round(statistics.fmean(durations), 3),
+    }
+
+
+def run_rendering(rows=10000, iterations=10, seed=42, stdout=None):
+    import django
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from apps.core.parsers import FastJSONParser
+    from apps.core.renderers import FastJSONRenderer, orjson
+    from apps.crm.serializers import OrderListSerializer
+    from apps.materials.serializers import MaterialTransactionSerializer
+
+    log = (lambda message: stdout.write(message + '\n')) if stdout else (lambda message: None)
+    rng = random.Random(seed)
+    datasets = {
+        'orders': (build_orders(rows, rng), OrderListSerializer),
+        'transactions': (build_transactions(rows, rng), MaterialTransactionSerializer),
+    }
+
+    results = {}
+    for dataset, (instances, serializer_class) in datasets.items():
+        payloads = {
+            'serialized': serializer_class(instances, many=True).data,
+            'values': values_rows(instances),
+        }
+        for shape, payload in payloads.items():
+            prefix = f'{dataset}.{shape}'
+            baseline = None
+            for label, renderer, parser in (
+                ('json', JSONRenderer(), JSONParser()),
+                ('fast', FastJSONRenderer(), FastJSONParser()),
+            ):
+                body, render = timed(lambda: renderer.render(payload), iterations)
+                _, parse = timed(lambda: parser.parse(io.BytesIO(body), parser_context={}), iterations)
+                render['bytes'] = len(body)
+                if baseline is None:
+                    baseline = (render['p50_ms'], parse['p50_ms'])
+                else:
+                    render['speedup'] = round(baseline[0] / render['p50_ms'], 2) if render['p50_ms'] else None
+                    parse['speedup'] = round(baseline[1] / parse['p50_ms'], 2) if parse['p50_ms'] else None
+                results[f'{prefix}.render.{label}'] = render
+                results[f'{prefix}.parse.{label}'] = parse
+                log(
+                    f'{prefix + "." + label:32} render p50={render["p50_ms"]:9.2f}ms '
+                    f'parse p50={parse["p50_ms"]:9.2f}ms  {render["bytes"]} bytes'
+                )
+
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'django': django.get_version(),
+            'json_backend': f'orjson {orjson.__version__}' if orjson else 'json (stdlib)',
+            'rows': rows,
+            'iterations': iterations,
+            'seed': seed,
+        },
+        'results': results,
+    }
@@ -0,0 +1,222 @@
+"""
+Benchmark runner - boots Django, prepares the data set and replays scenarios.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+
+def setup_django(settings_module=None):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module or 'config.settings')
+    import django
+    django.setup()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class BenchmarkRunner:
+    """
+    Replays scenarios with an authenticated in-process API client.
+
+    By default a throwaway test database is created and filled with
+    ``generate_data``; ``use_existing_db`` benchmarks the configured database
+    as-is (for example a copy already loaded with a production-scale data set).
+    """
+
+    def __init__(self, orders=5000, records_per_order=20, audit_rows=None, seed=42,
+                 iterations=20, warmup=3, use_existing_db=False, keepdb=False, stdout=None):
+        self.orders = orders
+        self.records_per_order = records_per_order
+        self.audit_rows = audit_rows
+        self.seed = seed
+        self.iterations = iterations
+        self.warmup = warmup
+        self.use_existing_db = use_existing_db
+        self.keepdb = keepdb
+        self.log = (lambda message: stdout.write(message + '\n')) if stdout else (lambda message: None)
+        self._old_config = None
+        self._test_environment = False
+
+    # -- database --------------------------------------------------------
+
+    def setup_database(self):
+        from django.core.management import call_command
+        from django.test.utils import setup_test_environment, setup_databases
+
+        # Also for an existing database: it allows the test client's 'testserver' host
+        setup_test_environment()
+        self._test_environment = True
+        if self.use_existing_db:
+            return
+        self._old_config = setup_databases(verbosity=0, interactive=False, keepdb=self.keepdb)
+
+        from apps.crm.models import Order
+        if Order.objects.filter(quote_number__startswith='SYN-').exists():
+            self.log('Reusing generated data set in the kept test database.')
+            return
+        self.log(f'Generating data set: {self.orders} orders x {self.records_per_order} records...')
+        options = {'orders': self.orders, 'records_per_order': self.records_per_order, 'seed': self.seed}
+        if self.audit_rows is not None:
+            options['audit_rows'] = self.audit_rows
+        call_command('generate_data', verbosity=0, **options)
+
+    def teardown_database(self):
+        from django.test.utils import teardown_databases, teardown_test_environment
+
+        if self._old_config is not None:
+            teardown_databases(self._old_config, verbosity=0, keepdb=self.keepdb)
+            self._old_config = None
+        if self._test_environment:
+            teardown_test_environment()
+            self._test_environment = False
+
+    # -- measurement -----------------------------------------------------
+
+    def build_client(self):
+        from rest_framework.test import APIClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from apps.accounts.models import User
+
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('date_joined').first()
+        if user is None:
+            raise RuntimeError('No active superuser found; run seed data or generate_data first.')
+        client = APIClient()
+        # Record server errors as 500 results instead of aborting the run
+        client.raise_request_exception = False
+        # A real JWT so the measured query count includes authentication
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def path_arguments(self):
+        from django.db.models import Count
+        from apps.crm.models import Order
+
+        busiest = Order.objects.annotate(
+            history_count=Count('status_history')
+        ).order_by('-history_count').values_list('pk', flat=True).first()
+        return {'order_id': busiest}
+
+    def request(self, client, path, params):
+        """
+        Send one request; return (response, queries).
+
+        Queries are counted through the request instrumentation, which also
+        sees those that ``fan_out`` and async views (``gather``) run on pool
+        threads: ``run_query`` adds them to the request's sample.
+        """
+        from apps.core.instrumentation import RequestSample, count_queries, current_sample
+
+        sample = RequestSample(time.perf_counter())
+        # Used when the instrumentation middleware is disabled
+        token = current_sample.set(sample)
+        try:
+            with count_queries(sample):
+                response = client.get(path, params)
+        finally:
+            current_sample.reset(token)
+        measured = getattr(response.wsgi_request, '_instrumentation', None) or sample
+        return response, measured.query_count
+
+    def measure(self, client, scenario, arguments):
+        path = scenario.path.format(**arguments)
+        for _ in range(self.warmup):
+            client.get(path, scenario.params)
+
+        durations = []
+        query_counts = []
+        sizes = []
+        status_code = None
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            response, queries = self.request(client, path, scenario.params)
+            durations.append((time.perf_counter() - started) * 1000)
+            query_counts.append(queries)
+            sizes.append(len(response.content))
+            status_code = response.status_code
+
+        return {
+            'path': path,
+            'params': scenario.params,
+            'group': scenario.group,
+            'status': status_code,
+            'iterations': self.iterations,
+            'p50_ms': round(statistics.median(durations), 3),
+            'p95_ms': round(percentile(durations, 0.95), 3),
+            'max_ms': round(max(durations), 3),
+            'mean_ms': round(statistics.fmean(durations), 3),
+            'queries': max(query_counts),
+            'expected_queries': scenario.queries,
+            'response_bytes': max(sizes),
+        }
+
+    def run(self, scenarios):
+        from django.db import connection
+
+        self.setup_database()
+        try:
+            client = self.build_client()
+            arguments = self.path_arguments()
+            results = {}
+            for scenario in scenarios:
+                result = self.measure(client, scenario, arguments)
+                results[scenario.name] = result
+                self.log(
+                    f'{scenario.name:40} {result["status"]} p50={result["p50_ms"]:8.2f}ms '
+                    f'p95={result["p95_ms"]:8.2f}ms queries={result["queries"]}'
+                )
+                if scenario.queries is not None and result['queries'] != scenario.queries:
+                    self.log(f'{scenario.name:40} expected {scenario.queries} queries, counted {result["queries"]}')
+            return {
+                'meta': self.describe(connection),
+                'results': results,
+            }
+        finally:
+            self.teardown_database()
+
+    def describe(self, connection):
+        import django
+        from apps.crm.models import Order
+        from apps.audit.models import AuditLog
+
+        return {
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'dataset': {
+                'orders': Order.objects.count(),
+                'audit_logs': AuditLog.objects.count(),
+                'records_per_order': None if self.use_existing_db else self.records_per_order,
+                'seed': None if self.use_existing_db else self.seed,
+            },
+            'iterations': self.iterations,
+            'warmup': self.warmup,
+        }
+
+
+def write_results(report, path):
+    with open(path, 'w') as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write('\n')
@@ -0,0 +1,73 @@
+"""
+Benchmark scenarios - the hot endpoints and the requests replayed against them.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A single GET request replayed by the runner.
+    ``{order_id}`` in the path is replaced with the busiest order in the data set.
+    ``queries``, when set, is the exact query count the request must run,
+    including authentication and queries run on fan-out threads.
+    """
+
+    name: str
+    path: str
+    params: dict = field(default_factory=dict)
+    group: str = 'list'
+    queries: int = None
+
+
+DASHBOARDS = [
+    Scenario('dashboard.overview', '/api/v1/dashboards/overview/', group='dashboard', queries=10),
+    Scenario('dashboard.order_tracking', '/api/v1/dashboards/order-tracking/', group='dashboard', queries=2),
+    Scenario('dashboard.order_workspace', '/api/v1/dashboards/order-workspace/{order_id}/', group='dashboard'),
+    Scenario('dashboard.delayed_orders', '/api/v1/dashboards/delayed-orders/', group='dashboard'),
+    Scenario('dashboard.production_analytics', '/api/v1/dashboards/production-analytics/', {'days': 30}, group='dashboard', queries=4),
+    Scenario('dashboard.department_performance', '/api/v1/dashboards/department-performance/', group='dashboard', queries=4),
+    Scenario('dashboard.customer_summary', '/api/v1/dashboards/customer-summary/', group='dashboard', queries=3),
+    Scenario('dashboard.monthly_trends', '/api/v1/dashboards/monthly-trends/', {'months': 12}, group='dashboard', queries=4),
+    Scenario('dashboard.weekly_production', '/api/v1/dashboards/weekly-production/', {'weeks': 8}, group='dashboard'),
+    Scenario('dashboard.real_time_status', '/api/v1/dashboards/real-time-status/', group='dashboard', queries=6),
+]
+
+ACTIONS = [
+    Scenario('crm.orders.delayed', '/api/v1/crm/orders/delayed/', group='action'),
+    Scenario('fabrication.delayed', '/api/v1/fabrication/order-fabrications/delayed/', group='action'),
+    Scenario('logistics.pending_dispatch', '/api/v1/logistics/dispatches/pending_dispatch/', group='action'),
+    Scenario('logistics.delayed', '/api/v1/logistics/dispatches/delayed/', group='action'),
+    Scenario('inspection.pending_approval', '/api/v1/inspection/order-inspections/pending_approval/', group='action'),
+    Scenario('materials.low_stock', '/api/v1/materials/materials/low_stock/', group='action'),
+]
+
+LISTS = [
+    Scenario('crm.orders.list', '/api/v1/crm/orders/'),
+    Scenario('crm.orders.search', '/api/v1/crm/orders/', {'search': 'Frame'}),
+    Scenario('crm.orders.ordering', '/api/v1/crm/orders/', {'ordering': '-expected_delivery_date'}),
+    Scenario('crm.orders.filter', '/api/v1/crm/orders/', {'status': 'in_production', 'ordering': 'priority'}),
+    Scenario('crm.customers.list', '/api/v1/crm/customers/'),
+    Scenario('crm.customers.search', '/api/v1/crm/customers/', {'search': 'Industries', 'ordering': 'company_name'}),
+    Scenario('fabrication.list', '/api/v1/fabrication/order-fabrications/', {'ordering': '-created_at'}),
+    Scenario('fabrication.search', '/api/v1/fabrication/order-fabrications/', {'search': 'SYN-Q-0001'}),
+    Scenario('production.records.search', '/api/v1/production/records/', {'search': 'SYN-Q-0001', 'ordering': '-production_date'}),
+    Scenario('materials.list', '/api/v1/materials/materials/', {'ordering': 'stock_quantity'}),
+    Scenario('inspection.list', '/api/v1/inspection/order-inspections/', {'ordering': '-inspection_date'}),
+    Scenario('logistics.list', '/api/v1/logistics/dispatches/', {'ordering': '-planned_dispatch_date'}),
+    Scenario('audit.logs.list', '/api/v1/audit/logs/'),
+    Scenario('audit.logs.search', '/api/v1/audit/logs/', {'search': 'SYN-Q-0001', 'ordering': '-created_at'}),
+]
+
+SCENARIOS = DASHBOARDS + ACTIONS + LISTS
+
+
+def select(names=None, groups=None):
+    """Scenarios matching any of the given name prefixes and groups."""
+    chosen = SCENARIOS
+    if groups:
+        chosen = [s for s in chosen if s.group in groups]
+    if names:
+        chosen = [s for s in chosen if any(s.name.startswith(prefix) for prefix in names)]
+    return chosen
@@ -46,15 +46,20 @@ INSTALLED_APPS = [
     'apps.logistics',
     'apps.dashboards',
     'apps.audit',
+    'apps.search',
+    'apps.core',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.audit.middleware.AuditMiddleware',
+    'apps.core.middleware.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,20 +85,95 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database - MySQL Configuration
+# Connection reuse: per-thread persistent connections kept for DB_CONN_MAX_AGE
+# seconds, or with DB_POOL_SIZE > 0 a pool of that many connections per worker
+# process shared by its threads and returned after each request
+# (apps.core.backends.pool).
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=0, cast=int)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'apps.core.backends.mysql',
         'NAME': config('DB_NAME', default='manufacturing_erp'),
         'USER': config('DB_USER', default='root'),
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='3306'),
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else DB_CONN_MAX_AGE,
+        # Ping reused connections before the first query of a request
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
         'OPTIONS': {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
         },
     }
 }
+if DB_POOL_SIZE:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'max_size': DB_POOL_SIZE,
+        # Seconds a request waits for a free connection before failing
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        # Reconnect pooled connections older than this (keep below MySQL's wait_timeout)
+        'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=int),
+    }
+
+# Optional read replica for dashboard, audit and export reads (apps.core.routers).
+# Unset DB_REPLICA_HOST keeps every query on the primary.
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+REPLICA_DATABASE = 'replica'
+if DB_REPLICA_HOST:
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # Tests read the primary's test database through this alias
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=15, cast=int)
+# Cache holding those pins; must be shared (Redis/Memcached) across worker processes
+REPLICA_PIN_CACHE = 'default'
+
+# Threads per process that run independent dashboard queries concurrently
+# (apps.core.fanout); each may hold a connection. 0 runs them in order.
+QUERY_FANOUT_WORKERS = config('QUERY_FANOUT_WORKERS', default=4, cast=int)
+
+# Background jobs (apps.core.jobs), run by `manage.py run_jobs` workers.
+# Inline mode runs them in the web process after commit instead (no worker needed).
+JOBS_RUN_INLINE = config('JOBS_RUN_INLINE', default=DEBUG, cast=bool)
+# Days finished jobs (and their idempotency keys) are kept; 0 keeps them forever
+JOBS_RETENTION_DAYS = config('JOBS_RETENTION_DAYS', default=14, cast=int)
+# Seconds after which a running job whose worker died is claimed again
+JOB_LOCK_TIMEOUT = config('JOB_LOCK_TIMEOUT', default=600, cast=int)
+
+# Order progress roll-up (apps.crm.progress): stage changes within ORDER_PROGRESS_DEBOUNCE
+# seconds share one refresh job, which recomputes ORDER_PROGRESS_BATCH_SIZE orders per batch.
+# ORDER_PROGRESS_WEIGHTS may override the relative stage weights.
+ORDER_PROGRESS_DEBOUNCE = config('ORDER_PROGRESS_DEBOUNCE', default=10, cast=int)
+ORDER_PROGRESS_BATCH_SIZE = config('ORDER_PROGRESS_BATCH_SIZE', default=200, cast=int)
+
+# Change events (apps.core.events): delivered by a per-process dispatcher thread
+# after commit, in batches; it also polls for leftovers every OUTBOX_POLL_INTERVAL seconds.
+OUTBOX_DISPATCH_INLINE = config('OUTBOX_DISPATCH_INLINE', default=False, cast=bool)
+OUTBOX_BATCH_SIZE = config('OUTBOX_BATCH_SIZE', default=100, cast=int)
+OUTBOX_POLL_INTERVAL = config('OUTBOX_POLL_INTERVAL', default=30, cast=int)
+# Failed deliveries are retried after OUTBOX_RETRY_DELAY seconds, doubling each time
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+OUTBOX_RETRY_DELAY = config('OUTBOX_RETRY_DELAY', default=30, cast=int)
+
+# Audit log archival (apps.audit.archive): `manage.py archive_audit_logs` moves
+# months older than AUDIT_RETENTION_MONTHS into compressed files under AUDIT_ARCHIVE_DIR.
+AUDIT_ARCHIVE_DIR = Path(config('AUDIT_ARCHIVE_DIR', default=str(BASE_DIR / 'audit_archive')))
+AUDIT_RETENTION_MONTHS = config('AUDIT_RETENTION_MONTHS', default=6, cast=int)
+# Encoded audit payloads (apps.audit.payloads) longer than this are zlib-compressed
+AUDIT_PAYLOAD_COMPRESS_BYTES = config('AUDIT_PAYLOAD_COMPRESS_BYTES', default=512, cast=int)
+# Audit entries written per hash-chained flush (apps.audit.writer); a request flushes when done
+AUDIT_FLUSH_SIZE = config('AUDIT_FLUSH_SIZE', default=100, cast=int)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -150,10 +230,16 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed when installed, standard json otherwise
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # Simple JWT Configuration
@@ -179,6 +265,16 @@ CORS_ALLOWED_ORIGINS = config(
 )
 CORS_ALLOW_CREDENTIALS = True
 
+# Request Instrumentation
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=DEBUG, cast=bool)
+# Raise instead of logging when an action exceeds its declared query budget
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+# Bearer token for Prometheus scrapes of /metrics (admins only when unset)
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+# Seconds between writes of each process's buffered business metric increments
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=int)
+
 # File Upload Configuration
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
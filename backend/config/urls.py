@@ -9,6 +9,7 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from apps.core.views import MetricsView
 
 # API Documentation Schema
 schema_view = get_schema_view(
@@ -32,6 +33,9 @@ urlpatterns = [
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     
+    # Prometheus scrape endpoint
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    
     # API Endpoints
     path('api/v1/accounts/', include('apps.accounts.urls')),
     path('api/v1/crm/', include('apps.crm.urls')),
@@ -44,6 +48,8 @@ urlpatterns = [
     path('api/v1/logistics/', include('apps.logistics.urls')),
     path('api/v1/dashboards/', include('apps.dashboards.urls')),
     path('api/v1/audit/', include('apps.audit.urls')),
+    path('api/v1/search/', include('apps.search.urls')),
+    path('api/v1/system/', include('apps.core.urls')),
 ]
 
 # Serve media files in development
@@ -6,4 +6,9 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Server processes deliver change events on a dispatcher thread (apps.core.events)
+from apps.core.events import dispatcher  # noqa: E402
+
+dispatcher.enable()
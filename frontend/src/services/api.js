@@ -153,6 +153,7 @@ export const logisticsService = {
 export const dashboardService = {
   getOverview: () => api.get('/dashboards/overview/'),
   getOrderTracking: (orderId) => api.get('/dashboards/order-tracking/', { params: { order_id: orderId } }),
+  getOrderWorkspace: (orderId, params) => api.get(`/dashboards/order-workspace/${orderId}/`, { params }),
   getDelayedOrders: () => api.get('/dashboards/delayed-orders/'),
   getProductionAnalytics: (days) => api.get('/dashboards/production-analytics/', { params: { days } }),
   getDepartmentPerformance: () => api.get('/dashboards/department-performance/'),